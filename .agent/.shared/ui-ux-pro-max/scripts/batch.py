@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Batch - design systems for many projects in parallel
+
+Reads one request per JSONL line and fans the requests out across a process
+pool. Every index and the reasoning rules are loaded once before the pool
+starts; forked workers share them read-only (the data pack is a shared
+mapping, the rest copy-on-write), so a worker starts warm and each request
+only pays for its searches. Results are written as JSONL while requests
+finish, or in input order with --ordered.
+
+Usage:
+    python search.py --batch requests.jsonl [--workers 4] [--ordered] [--batch-output results.jsonl]
+    python search.py --batch requests.jsonl --persist [--output-dir out/]
+
+Input lines:
+    {"query": "SaaS dashboard", "project_name": "Tenant A", "pages": ["dashboard", "settings"]}
+    project_name and pages are optional; pages may also be a comma-separated string.
+
+Output lines (one per input line, tagged with its line number):
+    {"line": 1, "query": ..., "project_name": ..., "design_system": {...}, "pages": {"dashboard": "<markdown>"}}
+    With --persist the files are written instead and listed under "files", with
+    the "written" / "unchanged" counts (unchanged files are not rewritten).
+    A request that fails yields {"line": n, "error": "..."} and the batch goes on.
+"""
+
+import gc
+import json
+import multiprocessing
+import os
+import time
+
+from core import get_global_index, json_default, set_result_cache
+from design_system import DesignSystemGenerator, page_overrides, persist_design_system
+
+# ============ CONFIGURATION ============
+CHUNK_SIZE = 1  # requests per task: a request takes milliseconds, results stream as each finishes
+
+# Worker state: the preloaded generator and the options of the running batch
+_GENERATOR = None
+_OPTIONS = {}
+
+
+# ============ WORKER ============
+def preload():
+    """Fit every domain and stack index and load the reasoning rules"""
+    global _GENERATOR
+    get_global_index()
+    _GENERATOR = DesignSystemGenerator()
+
+
+def _init_worker(options, preloaded):
+    global _OPTIONS
+    _OPTIONS = options
+    if not preloaded:
+        preload()
+    # Each process opens its own cache connection; SQLite handles must not cross a fork
+    if options["cache"]:
+        from result_cache import ResultCache
+        set_result_cache(ResultCache())
+    else:
+        set_result_cache(None)
+
+
+def _page_list(pages):
+    if not pages:
+        return []
+    if isinstance(pages, str):
+        pages = pages.split(",")
+    return [str(page).strip() for page in pages if str(page).strip()]
+
+
+def generate_request(line_no, text):
+    """Output record for one input line"""
+    try:
+        request = json.loads(text)
+        if not isinstance(request, dict) or not isinstance(request.get("query"), str) or not request["query"].strip():
+            raise ValueError("expected an object with a non-empty \"query\"")
+        query = request["query"]
+        pages = _page_list(request.get("pages"))
+
+        design_system = _GENERATOR.generate(query, request.get("project_name"))
+        result = {"line": line_no, "query": query, "project_name": design_system["project_name"],
+                  "design_system": design_system}
+        if _OPTIONS.get("persist"):
+            persisted = persist_design_system(design_system, None, _OPTIONS.get("output_dir"), query, pages)
+            result["files"] = persisted["created_files"]
+            result["written"] = len(persisted["written"])
+            result["unchanged"] = len(persisted["unchanged"])
+        elif pages:
+            result["pages"] = page_overrides(design_system, pages, query)
+    except Exception as e:  # one bad request must not abort the batch
+        result = {"line": line_no, "error": f"{type(e).__name__}: {e}"}
+    return result
+
+
+def _generate_task(task):
+    """(JSON line, failed) for one (line number, text) task; serialized here so only text crosses processes"""
+    result = generate_request(*task)
+    return json.dumps(result, ensure_ascii=False, default=json_default), "error" in result
+
+
+# ============ BATCH ============
+def read_requests(f):
+    """(line number, text) of every non-blank line"""
+    for line_no, text in enumerate(f, 1):
+        if text.strip():
+            yield line_no, text
+
+
+def _pool_context():
+    """Fork where available, so workers inherit the preloaded indexes instead of rebuilding them"""
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def run_batch(f, out, workers=None, ordered=False, persist=False, output_dir=None, cache=True):
+    """Generate a design system per request line of f, writing one JSON line per request to out
+
+    Returns a summary: requests, errors, workers, seconds and requests per second.
+    """
+    workers = max(1, workers or os.cpu_count() or 1)
+    options = {"persist": persist, "output_dir": output_dir, "cache": cache}
+    started = time.perf_counter()
+    requests = errors = 0
+
+    if workers == 1:
+        _init_worker(options, preloaded=False)
+        lines = (_generate_task(task) for task in read_requests(f))
+        pool = None
+    else:
+        context = _pool_context()
+        preloaded = context.get_start_method() == "fork"
+        if preloaded:
+            preload()
+            gc.freeze()  # keep the preloaded objects out of collections so their pages stay shared
+        pool = context.Pool(workers, initializer=_init_worker, initargs=(options, preloaded))
+        run = pool.imap if ordered else pool.imap_unordered
+        lines = run(_generate_task, read_requests(f), CHUNK_SIZE)
+
+    completed = False
+    try:
+        for line, failed in lines:
+            out.write(line + "\n")
+            out.flush()
+            requests += 1
+            errors += failed
+        completed = True
+    finally:
+        if pool is not None:
+            if completed:
+                pool.close()
+            else:
+                pool.terminate()
+            pool.join()
+            gc.unfreeze()
+
+    seconds = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "errors": errors,
+        "workers": workers,
+        "seconds": round(seconds, 3),
+        "per_second": round(requests / seconds, 1) if seconds else 0.0
+    }
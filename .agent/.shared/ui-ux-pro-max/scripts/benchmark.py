@@ -0,0 +1,671 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Benchmarks - performance measurements for the search engine
+
+Usage:
+    python benchmark.py suite [--sizes 10000,100000,1000000] [--output bench.json]
+    python benchmark.py compare <before.json> <after.json>
+    python benchmark.py tokenizer [--rows 1000000] [--json]
+    python benchmark.py fuzzy [--samples 2000] [--json]
+    python benchmark.py engines [--json]
+    python benchmark.py reasoning [--sizes 100,1000,10000] [--json]
+    python benchmark.py batch [--workers 1,2,4,8] [--requests 400] [--json]
+
+The suite benchmarks three corpus sets: the real data directory, synthetic
+corpora of the requested sizes and a query set mined from ui-reasoning.csv
+categories. Each corpus runs in its own child process so that peak RSS is
+attributable to it. Reported per corpus: load and fit time, p50/p95 query
+latency, batch throughput, peak RSS and index size.
+
+Synthetic corpora are generated from the bundled CSV schemas: every column
+is filled with words sampled from that column's own vocabulary, so row
+shape and term distribution resemble the real data at any size.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from core import BM25, CSV_CONFIG, STACK_CONFIG, _STACK_COLS, DATA_DIR, NUMPY_AVAILABLE, TrigramIndex, _load_csv
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Windows
+
+# Fix Windows console encoding for Unicode output
+try:
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+except AttributeError:
+    pass  # Python < 3.7
+
+REASONING_FILE = "ui-reasoning.csv"
+DEFAULT_SIZES = [10000, 100000, 1000000]
+TOP_K = 3
+
+# Accented pt-BR words mixed into synthetic rows to exercise accent folding
+PT_WORDS = ["calibração", "balança", "certificação", "manutenção", "inspeção", "técnico",
+            "orçamento", "serviço", "medição", "análise", "padrão", "precisão"]
+
+
+# ============ CORPORA ============
+def bundled_sources():
+    """(name, rows, search_cols) for every bundled domain and stack CSV"""
+    sources = []
+    for domain, config in CSV_CONFIG.items():
+        filepath = DATA_DIR / config["file"]
+        if filepath.exists():
+            sources.append((domain, _load_csv(filepath), config["search_cols"]))
+    for stack, config in STACK_CONFIG.items():
+        filepath = DATA_DIR / config["file"]
+        if filepath.exists():
+            sources.append((f"stack:{stack}", _load_csv(filepath), _STACK_COLS["search_cols"]))
+    return sources
+
+
+def documents(rows, search_cols):
+    """Index documents for rows, joined the way core builds them"""
+    return [" ".join(str(row.get(col, "")) for col in search_cols) for row in rows]
+
+
+def synthetic_rows(template_rows, count, seed=0, columns=None):
+    """Generate count rows shaped like template_rows
+
+    Each column gets as many words as a random template row has there,
+    sampled from the words seen in that column across the template.
+    Pass columns to generate only those (e.g. the search columns).
+    """
+    rng = random.Random(seed)
+    columns = columns or list(template_rows[0].keys())
+    vocab = {col: [w for row in template_rows for w in str(row.get(col) or "").split()] or ["-"] for col in columns}
+    lengths = {col: [len(str(row.get(col) or "").split()) for row in template_rows] for col in columns}
+
+    rows = []
+    for _ in range(count):
+        row = {}
+        for col in columns:
+            words = rng.choices(vocab[col], k=rng.choice(lengths[col]))
+            if rng.random() < 0.05:
+                words.append(rng.choice(PT_WORDS))
+            row[col] = " ".join(words)
+        rows.append(row)
+    return rows
+
+
+def mined_queries():
+    """Query set mined from ui-reasoning.csv: each category, alone and with its top style"""
+    queries = []
+    for row in _load_csv(DATA_DIR / REASONING_FILE):
+        category = row.get("UI_Category", "").strip()
+        if not category:
+            continue
+        queries.append(category)
+        style = row.get("Style_Priority", "").split("+")[0].strip()
+        if style:
+            queries.append(f"{category} {style}")
+    return queries
+
+
+# ============ MEASUREMENT HELPERS ============
+def _rss_bytes():
+    """Current resident set size, where the platform exposes it"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _peak_rss_bytes():
+    """Peak resident set size of this process"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+def _index_stats(indexes):
+    """Structure sizes of fitted indexes (terms, postings, documents)"""
+    return {
+        "docs": sum(bm25.N for bm25 in indexes),
+        "terms": sum(len(bm25.idf) for bm25 in indexes),
+        "postings": sum(len(bm25.postings[term][0]) for bm25 in indexes for term in bm25.postings)
+    }
+
+
+def _bench_indexes(indexes, queries):
+    """Per-query latency on every index, plus batched throughput"""
+    latencies = []
+    for query in queries:
+        for bm25 in indexes:
+            started = time.perf_counter()
+            bm25.score(query, top_k=TOP_K)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    for bm25 in indexes:
+        bm25.score_many(queries[:1], top_k=TOP_K)  # builds the NumPy matrix outside the timing
+    started = time.perf_counter()
+    for bm25 in indexes:
+        bm25.score_many(queries, top_k=TOP_K)
+    batch_seconds = time.perf_counter() - started
+
+    return {
+        "queries": len(queries) * len(indexes),
+        "p50_ms": round(_percentile(latencies, 50), 4),
+        "p95_ms": round(_percentile(latencies, 95), 4),
+        "max_ms": round(max(latencies), 4),
+        "batch_qps": round(len(queries) * len(indexes) / batch_seconds) if batch_seconds else None
+    }
+
+
+def run_corpus(corpus, seed=0):
+    """Benchmark one corpus in this process ("real" or a synthetic row count)"""
+    rss_start = _rss_bytes()
+    started = time.perf_counter()
+    sources = bundled_sources()
+    if corpus == "real":
+        corpora = [(rows, search_cols) for _, rows, search_cols in sources]
+    else:
+        # One mixed index: each schema contributes its share of the rows
+        count = int(corpus)
+        per_source = max(1, count // len(sources))
+        docs = []
+        for i, (_, source_rows, search_cols) in enumerate(sources):
+            generated = synthetic_rows(source_rows, per_source, seed + i, search_cols)
+            docs.extend(documents(generated, search_cols))
+        corpora = [(docs, None)]
+    load_seconds = time.perf_counter() - started
+
+    queries = mined_queries()
+    rss_before_fit = _rss_bytes()
+    started = time.perf_counter()
+    indexes = []
+    for rows, search_cols in corpora:
+        bm25 = BM25()
+        bm25.fit(documents(rows, search_cols) if search_cols else rows)
+        indexes.append(bm25)
+    fit_seconds = time.perf_counter() - started
+    rss_after_fit = _rss_bytes()
+
+    report = {
+        "corpus": corpus,
+        "indexes": len(indexes),
+        "load_seconds": round(load_seconds, 4),
+        "fit_seconds": round(fit_seconds, 4),
+        "query_set": len(queries)
+    }
+    report.update(_index_stats(indexes))
+    report.update(_bench_indexes(indexes, queries))
+    report["index_rss_mb"] = round((rss_after_fit - rss_before_fit) / 2 ** 20, 2) if rss_after_fit else None
+    report["peak_rss_mb"] = round(_peak_rss_bytes() / 2 ** 20, 2) if resource else None
+    report["start_rss_mb"] = round(rss_start / 2 ** 20, 2) if rss_start else None
+    if corpus == "real":
+        from datapack import PACK_FILE
+        report["pack_bytes"] = PACK_FILE.stat().st_size if PACK_FILE.exists() else None
+    return report
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def bench_suite(sizes=DEFAULT_SIZES, seed=0):
+    """Run every corpus in a child process and collect a comparable JSON report"""
+    report = {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": NUMPY_AVAILABLE,
+        "corpora": []
+    }
+    for corpus in ["real"] + [str(size) for size in sizes]:
+        print(f"Benchmarking corpus {corpus}...", file=sys.stderr)
+        proc = subprocess.run([sys.executable, __file__, "corpus", corpus, "--seed", str(seed)],
+                              capture_output=True, text=True)
+        if proc.returncode != 0:
+            report["corpora"].append({"corpus": corpus, "error": proc.stderr.strip()[-500:]})
+            continue
+        report["corpora"].append(json.loads(proc.stdout))
+    return report
+
+
+def _print_suite(report):
+    print(f"commit {report['commit']} | python {report['python']} | numpy {report['numpy']}")
+    print(f"{'corpus':<10} {'docs':>9} {'terms':>9} {'fit s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'batch q/s':>10} {'index MB':>9} {'peak MB':>8}")
+    for row in report["corpora"]:
+        if "error" in row:
+            print(f"{row['corpus']:<10} error: {row['error']}")
+            continue
+        print(f"{row['corpus']:<10} {row['docs']:>9} {row['terms']:>9} {row['fit_seconds']:>8.3f} "
+              f"{row['p50_ms']:>8.4f} {row['p95_ms']:>8.4f} {row['batch_qps'] or 0:>10} "
+              f"{row['index_rss_mb'] or 0:>9} {row['peak_rss_mb'] or 0:>8}")
+
+
+def compare_reports(before, after):
+    """Relative change of each numeric metric between two suite reports"""
+    metrics = ["fit_seconds", "p50_ms", "p95_ms", "batch_qps", "index_rss_mb", "peak_rss_mb"]
+    before_rows = {row["corpus"]: row for row in before["corpora"]}
+    lines = [f"{before.get('commit')} -> {after.get('commit')}"]
+    for row in after["corpora"]:
+        old = before_rows.get(row["corpus"])
+        if not old or "error" in row or "error" in old:
+            continue
+        changes = []
+        for metric in metrics:
+            if old.get(metric) and row.get(metric) is not None:
+                changes.append(f"{metric} {(row[metric] - old[metric]) / old[metric]:+.1%}")
+        lines.append(f"{row['corpus']:<10} " + "  ".join(changes))
+    return "\n".join(lines)
+
+
+# ============ TOKENIZER ============
+def _legacy_tokenize(text):
+    """Regex tokenizer used before the translate-table tokenizer, for comparison"""
+    text = re.sub(r'[^\w\s]', ' ', str(text).lower())
+    return [w for w in text.split() if len(w) > 2]
+
+
+def _time_tokenizer(tokenize, docs):
+    started = time.perf_counter()
+    tokens = 0
+    for doc in docs:
+        tokens += len(tokenize(doc))
+    elapsed = time.perf_counter() - started
+    return {
+        "seconds": round(elapsed, 4),
+        "tokens": tokens,
+        "tokens_per_sec": round(tokens / elapsed) if elapsed else None,
+        "docs_per_sec": round(len(docs) / elapsed) if elapsed else None
+    }
+
+
+def bench_tokenizer(rows=1000000, seed=0):
+    """Tokens/second of the legacy and current tokenizers on bundled and synthetic corpora"""
+    sources = bundled_sources()
+    bundled = [doc for _, source_rows, search_cols in sources for doc in documents(source_rows, search_cols)]
+
+    per_source = max(1, rows // len(sources))
+    synthetic = []
+    for i, (_, source_rows, search_cols) in enumerate(sources):
+        synthetic.extend(documents(synthetic_rows(source_rows, per_source, seed + i, search_cols), search_cols))
+
+    plain = BM25(use_numpy=False)
+    stop = BM25(use_numpy=False, stopwords=["en", "pt"])
+    report = {}
+    for name, docs in [("bundled", bundled), (f"synthetic_{len(synthetic)}", synthetic)]:
+        report[name] = {
+            "docs": len(docs),
+            "legacy_regex": _time_tokenizer(_legacy_tokenize, docs),
+            "translate": _time_tokenizer(plain.tokenize, docs),
+            "translate_stopwords": _time_tokenizer(stop.tokenize, docs)
+        }
+    return report
+
+
+def _print_tokenizer(report):
+    print(f"{'corpus':<20} {'tokenizer':<22} {'docs':>9} {'tokens':>11} {'seconds':>9} {'tokens/s':>12}")
+    for corpus, result in report.items():
+        for name, timing in result.items():
+            if name == "docs":
+                continue
+            print(f"{corpus:<20} {name:<22} {result['docs']:>9} {timing['tokens']:>11} "
+                  f"{timing['seconds']:>9.3f} {timing['tokens_per_sec']:>12,}")
+
+
+# ============ FUZZY EXPANSION ============
+# Misspellings people actually type, on top of the generated ones
+FUZZY_EXAMPLES = ["glasmorphism", "dashbord", "tipografia", "acessibility", "animaton", "neumorphsm", "ecomerce"]
+
+
+def _misspell(term, rng):
+    """One random deletion, insertion, substitution or transposition"""
+    i = rng.randrange(len(term))
+    edit = rng.choice(["delete", "insert", "substitute", "transpose"])
+    letter = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    if edit == "delete":
+        return term[:i] + term[i + 1:]
+    if edit == "insert":
+        return term[:i] + letter + term[i:]
+    if edit == "substitute":
+        return term[:i] + letter + term[i + 1:]
+    i = min(i, len(term) - 2)
+    return term[:i] + term[i + 1] + term[i] + term[i + 2:]
+
+
+def bench_fuzzy(samples=2000, seed=0):
+    """Trigram expansion latency and accuracy over the full bundled vocabulary"""
+    vocabulary = set()
+    for _, rows, search_cols in bundled_sources():
+        bm25 = BM25(use_numpy=False)
+        bm25.fit(documents(rows, search_cols))
+        vocabulary.update(bm25.postings)
+
+    started = time.perf_counter()
+    index = TrigramIndex(vocabulary)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    rng = random.Random(seed)
+    candidates = sorted(term for term in vocabulary if len(term) >= 5 and term.isalpha())
+    cases = []
+    while len(cases) < samples:
+        term = rng.choice(candidates)
+        typo = _misspell(term, rng)
+        if typo not in vocabulary:
+            cases.append((typo, term))
+
+    latencies, found, top1 = [], 0, 0
+    for typo, term in cases:
+        started = time.perf_counter()
+        expansion = index.expand(typo)
+        latencies.append((time.perf_counter() - started) * 1000)
+        found += term in expansion
+        top1 += expansion[:1] == [term]
+
+    examples = {}
+    for typo in FUZZY_EXAMPLES:
+        started = time.perf_counter()
+        expansion = index.expand(typo)
+        examples[typo] = {"expansion": expansion, "ms": round((time.perf_counter() - started) * 1000, 4)}
+
+    return {
+        "vocabulary": len(vocabulary),
+        "trigrams": len(index.postings),
+        "build_ms": round(build_ms, 2),
+        "samples": len(cases),
+        "p50_ms": round(_percentile(latencies, 50), 4),
+        "p95_ms": round(_percentile(latencies, 95), 4),
+        "max_ms": round(max(latencies), 4),
+        "recall": round(found / len(cases), 4),
+        "top1": round(top1 / len(cases), 4),
+        "examples": examples
+    }
+
+
+def _print_fuzzy(report):
+    print(f"vocabulary {report['vocabulary']} terms, {report['trigrams']} trigrams, "
+          f"index built in {report['build_ms']} ms")
+    print(f"{report['samples']} single-edit misspellings: p50 {report['p50_ms']} ms, p95 {report['p95_ms']} ms, "
+          f"max {report['max_ms']} ms | recall {report['recall']:.1%}, top-1 {report['top1']:.1%}")
+    for typo, result in report["examples"].items():
+        print(f"  {typo:<14} -> {', '.join(result['expansion']) or '(no match)'}  ({result['ms']} ms)")
+
+
+# ============ RANKING ENGINES ============
+def bench_engines():
+    """Per-query latency of the BM25, LSA and hybrid rankers on the bundled datasets"""
+    from core import _all_sources, get_index
+    from lsa import _load_models, build_models
+
+    # Built into a scratch file: the benchmark must not replace the models search.py uses
+    with tempfile.TemporaryDirectory() as scratch:
+        model_path = Path(scratch) / "bench.lsa.npz"
+        started = time.perf_counter()
+        summary = build_models(model_path)
+        build_seconds = time.perf_counter() - started
+        models = _load_models(model_path)
+
+    queries = mined_queries()
+    latencies = {"bm25": [], "lsa": [], "hybrid": []}
+    overlap, compared = 0, 0
+    for _, file, search_cols, _ in _all_sources():
+        filepath = DATA_DIR / file
+        if not filepath.exists():
+            continue
+        bm25 = get_index(filepath, search_cols)["bm25"]
+        model = models.get((str(filepath.resolve()), tuple(search_cols)))
+        for query in queries:
+            tokens = bm25.tokenize(query)
+            timings = {}
+            for engine, rank in [("bm25", lambda: bm25.score_tokens(tokens, top_k=TOP_K)),
+                                 ("lsa", lambda: model.rank(tokens, top_k=TOP_K)),
+                                 ("hybrid", lambda: model.rank_hybrid(bm25, tokens, top_k=TOP_K))]:
+                started = time.perf_counter()
+                timings[engine] = rank()
+                latencies[engine].append((time.perf_counter() - started) * 1000)
+            if timings["bm25"] and timings["lsa"]:
+                compared += 1
+                overlap += timings["bm25"][0][0] in [idx for idx, _ in timings["lsa"]]
+
+    report = {
+        "build_seconds": round(build_seconds, 3),
+        "model_bytes": summary["bytes"],
+        "queries": len(queries),
+        "lsa_keeps_bm25_top1": round(overlap / compared, 4) if compared else None
+    }
+    for engine, values in latencies.items():
+        report[engine] = {
+            "p50_ms": round(_percentile(values, 50), 4),
+            "p95_ms": round(_percentile(values, 95), 4),
+            "mean_ms": round(sum(values) / len(values), 4)
+        }
+    return report
+
+
+def _print_engines(report):
+    print(f"LSA models built in {report['build_seconds']} s ({report['model_bytes']:,} bytes); "
+          f"{report['queries']} queries per source")
+    print(f"{'engine':<8} {'p50 ms':>9} {'p95 ms':>9} {'mean ms':>9}")
+    for engine in ("bm25", "lsa", "hybrid"):
+        timing = report[engine]
+        print(f"{engine:<8} {timing['p50_ms']:>9.4f} {timing['p95_ms']:>9.4f} {timing['mean_ms']:>9.4f}")
+    if report["lsa_keeps_bm25_top1"] is not None:
+        print(f"BM25 top hit within the LSA top {TOP_K}: {report['lsa_keeps_bm25_top1']:.1%}")
+
+
+# ============ REASONING RULES ============
+def _scan_reasoning_rule(rules, category):
+    """Linear three-pass rule lookup used before ReasoningIndex, for comparison"""
+    category_lower = category.lower()
+    for rule in rules:
+        if rule.get("UI_Category", "").lower() == category_lower:
+            return rule
+    for rule in rules:
+        ui_cat = rule.get("UI_Category", "").lower()
+        if ui_cat in category_lower or category_lower in ui_cat:
+            return rule
+    for rule in rules:
+        ui_cat = rule.get("UI_Category", "").lower()
+        if any(kw in category_lower for kw in ui_cat.replace("/", " ").replace("-", " ").split()):
+            return rule
+    return {}
+
+
+def bench_reasoning(sizes=(100, 1000, 10000)):
+    """Rule lookup latency, linear scan vs ReasoningIndex, as the rule file grows
+
+    Larger rule files repeat the bundled rules with numbered categories; the
+    lookups are the bundled product types, the categories generate() resolves.
+    """
+    from design_system import REASONING_FILE, ReasoningIndex
+
+    base = _load_csv(DATA_DIR / REASONING_FILE)
+    categories = [row["Product Type"] for row in _load_csv(DATA_DIR / CSV_CONFIG["product"]["file"])]
+    report = {"lookups": len(categories), "sizes": {}}
+    for size in sizes:
+        rules = [dict(rule) for rule in base]
+        while len(rules) < size:
+            rule = dict(base[len(rules) % len(base)])
+            rule["UI_Category"] = f"{rule['UI_Category']} {len(rules) // len(base)}"
+            rules.append(rule)
+
+        started = time.perf_counter()
+        index = ReasoningIndex(rules)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        timings = {"scan": [], "index": []}
+        agree = 0
+        for category in categories:
+            started = time.perf_counter()
+            expected = _scan_reasoning_rule(rules, category)
+            timings["scan"].append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            found = index._resolve(category.lower())
+            timings["index"].append((time.perf_counter() - started) * 1000)
+            agree += (rules[found] if found is not None else {}) is expected
+
+        report["sizes"][size] = {
+            "build_ms": round(build_ms, 3),
+            "agreement": round(agree / len(categories), 4),
+            **{name: {"p50_ms": round(_percentile(values, 50), 4),
+                      "p95_ms": round(_percentile(values, 95), 4)} for name, values in timings.items()}
+        }
+    return report
+
+
+def _print_reasoning(report):
+    print(f"{report['lookups']} lookups per rule file")
+    print(f"{'rules':>7} {'scan p50':>10} {'scan p95':>10} {'index p50':>10} {'index p95':>10} {'build ms':>9} {'agree':>7}")
+    for size, result in report["sizes"].items():
+        print(f"{size:>7} {result['scan']['p50_ms']:>10.4f} {result['scan']['p95_ms']:>10.4f} "
+              f"{result['index']['p50_ms']:>10.4f} {result['index']['p95_ms']:>10.4f} "
+              f"{result['build_ms']:>9.1f} {result['agreement']:>7.1%}")
+
+
+# ============ BATCH GENERATION ============
+def bench_batch(workers=(1, 2, 4, 8), requests=400):
+    """Design-system batch throughput per pool size, result cache off
+
+    Requests cycle through the mined queries, each with two page overrides.
+    Timings include starting the pool; indexes are preloaded before the
+    first run, as search.py --batch does once per invocation.
+    """
+    import io
+    from batch import preload, run_batch
+
+    queries = mined_queries()
+    lines = "".join(json.dumps({"query": queries[i % len(queries)], "project_name": f"Tenant {i}",
+                                "pages": ["dashboard", "settings"]}) + "\n" for i in range(requests))
+    started = time.perf_counter()
+    preload()
+    report = {"requests": requests, "cpus": os.cpu_count(), "preload_s": round(time.perf_counter() - started, 3),
+              "workers": {}}
+    for count in workers:
+        summary = run_batch(io.StringIO(lines), io.StringIO(), count, cache=False)
+        report["workers"][count] = {"seconds": summary["seconds"], "per_second": summary["per_second"],
+                                    "errors": summary["errors"]}
+    return report
+
+
+def _print_batch(report):
+    print(f"{report['requests']} requests, {report['cpus']} CPUs, indexes preloaded in {report['preload_s']:.2f}s")
+    base = report["workers"].get(1, {}).get("per_second")
+    print(f"{'workers':>7} {'seconds':>8} {'req/s':>8} {'speedup':>8}")
+    for count, result in report["workers"].items():
+        speedup = f"{result['per_second'] / base:.2f}x" if base else "-"
+        print(f"{count:>7} {result['seconds']:>8.2f} {result['per_second']:>8.1f} {speedup:>8}")
+
+
+# ============ CLI SUPPORT ============
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UI Pro Max search benchmarks")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    suite = sub.add_parser("suite", help="Fit time, query latency, RSS and index size per corpus")
+    suite.add_argument("--sizes", type=str, default=",".join(map(str, DEFAULT_SIZES)),
+                       help="Synthetic corpus sizes in rows (default: 10000,100000,1000000)")
+    suite.add_argument("--seed", type=int, default=0, help="Random seed for synthetic rows")
+    suite.add_argument("--output", "-o", type=str, default=None, help="Write the JSON report to this file")
+    suite.add_argument("--json", action="store_true", help="Print the JSON report instead of a table")
+
+    corpus = sub.add_parser("corpus", help="Benchmark a single corpus in this process (used by suite)")
+    corpus.add_argument("corpus", help="'real' or a synthetic row count")
+    corpus.add_argument("--seed", type=int, default=0, help="Random seed for synthetic rows")
+
+    compare = sub.add_parser("compare", help="Compare two suite JSON reports")
+    compare.add_argument("before", help="Baseline report")
+    compare.add_argument("after", help="New report")
+
+    tok = sub.add_parser("tokenizer", help="Tokenizer throughput (tokens/second)")
+    tok.add_argument("--rows", type=int, default=1000000, help="Synthetic corpus size (default: 1000000)")
+    tok.add_argument("--seed", type=int, default=0, help="Random seed for synthetic rows")
+    tok.add_argument("--json", action="store_true", help="Output as JSON")
+
+    fuzzy = sub.add_parser("fuzzy", help="Trigram fuzzy expansion latency and accuracy")
+    fuzzy.add_argument("--samples", type=int, default=2000, help="Generated misspellings (default: 2000)")
+    fuzzy.add_argument("--seed", type=int, default=0, help="Random seed for misspellings")
+    fuzzy.add_argument("--json", action="store_true", help="Output as JSON")
+
+    engines = sub.add_parser("engines", help="BM25 vs LSA vs hybrid query latency")
+    engines.add_argument("--json", action="store_true", help="Output as JSON")
+
+    reasoning = sub.add_parser("reasoning", help="Reasoning rule lookup: linear scan vs ReasoningIndex")
+    reasoning.add_argument("--sizes", type=str, default="100,1000,10000", help="Rule file sizes (default: 100,1000,10000)")
+    reasoning.add_argument("--json", action="store_true", help="Output as JSON")
+
+    batch = sub.add_parser("batch", help="search.py --batch throughput per worker count")
+    batch.add_argument("--workers", type=str, default="1,2,4,8", help="Pool sizes (default: 1,2,4,8)")
+    batch.add_argument("--requests", type=int, default=400, help="Requests per run (default: 400)")
+    batch.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    if args.bench == "suite":
+        sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+        report = bench_suite(sizes, args.seed)
+        if args.output:
+            Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            _print_suite(report)
+    elif args.bench == "corpus":
+        print(json.dumps(run_corpus(args.corpus, args.seed)))
+    elif args.bench == "compare":
+        before = json.loads(Path(args.before).read_text(encoding="utf-8"))
+        after = json.loads(Path(args.after).read_text(encoding="utf-8"))
+        print(compare_reports(before, after))
+    elif args.bench == "tokenizer":
+        report = bench_tokenizer(args.rows, args.seed)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            _print_tokenizer(report)
+    elif args.bench == "fuzzy":
+        report = bench_fuzzy(args.samples, args.seed)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            _print_fuzzy(report)
+    elif args.bench == "engines":
+        report = bench_engines()
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            _print_engines(report)
+    elif args.bench == "reasoning":
+        report = bench_reasoning([int(size) for size in args.sizes.split(",") if size.strip()])
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            _print_reasoning(report)
+    elif args.bench == "batch":
+        report = bench_batch([int(count) for count in args.workers.split(",") if count.strip()], args.requests)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            _print_batch(report)
@@ -5,14 +5,41 @@ UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 """
 
 import csv
+import hashlib
+import heapq
+import importlib.util
+import os
 import re
+import sys
+import unicodedata
+from array import array
+from bisect import bisect_left
 from pathlib import Path
 from math import log
-from collections import defaultdict
+from collections import Counter, defaultdict
+from collections.abc import Mapping
+from itertools import accumulate, chain
+
+import profiler
+
+# NumPy is optional and only imported on first batched scoring (load_numpy() below);
+# importing it costs more than a whole single-query CLI call
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+_NUMPY = None
+
+
+def load_numpy():
+    """The numpy module, imported on first use (check NUMPY_AVAILABLE first)"""
+    global _NUMPY
+    if _NUMPY is None:
+        import numpy as np
+        _NUMPY = np
+    return _NUMPY
 
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
 MAX_RESULTS = 3
+ENGINES = ["bm25", "lsa", "hybrid"]  # rankers; lsa and hybrid need NumPy (see lsa.py)
 
 CSV_CONFIG = {
     "style": {
@@ -96,126 +123,926 @@ _STACK_COLS = {
 AVAILABLE_STACKS = list(STACK_CONFIG.keys())
 
 
+# ============ TOKENIZER ============
+# Bump when tokenization changes: data packs and cached results depend on it
+TOKENIZER_VERSION = 2
+
+# Optional stopword lists, stored accent-folded (only words longer than 2 chars matter)
+STOPWORDS = {
+    "en": frozenset("""
+        about above after again against all and any are because been before being below between both but
+        can could did does doing down during each few for from further had has have having her here hers
+        herself him himself his how into its itself just more most myself nor not now off once only other
+        our ours ourselves out over own same she should some such than that the their theirs them themselves
+        then there these they this those through too under until very was were what when where which while
+        who whom why will with would you your yours yourself yourselves
+    """.split()),
+    "pt": frozenset("""
+        aos aquela aquelas aquele aqueles aquilo as com como contra das dela delas dele deles depois desta
+        deste disso disto dos ela elas ele eles entre era eram essa essas esse esses esta estas este estes
+        esta estao foi foram isso isto mais mas mesmo muito nao nas nem nos nossa nossas nosso nossos num
+        numa para pela pelas pelo pelos por porque quais qual quando que quem sao seja sem ser seu seus
+        sua suas tambem tem tinha uma umas uns voce voces
+    """.split())
+}
+
+
+class _FoldTable(dict):
+    """str.translate table filled on first sight of each character
+
+    Lowercases, strips accents (NFKD without combining marks), keeps word
+    characters and maps everything else to a space, in one C-level pass.
+    """
+
+    def __missing__(self, code):
+        char = chr(code)
+        if unicodedata.combining(char):
+            value = ""  # loose combining mark: join it to its base letter
+        else:
+            folded = "".join(c for c in unicodedata.normalize("NFKD", char.lower()) if not unicodedata.combining(c))
+            value = "".join(c if c.isalnum() or c == "_" else " " for c in folded) or " "
+        self[code] = value
+        return value
+
+
+_FOLD_TABLE = _FoldTable()
+# Plain dict for pure-ASCII text: str.translate is markedly faster without __missing__
+_ASCII_TABLE = {code: _FOLD_TABLE[code] for code in range(128)}
+
+
+# Tokens are the whitespace-separated runs of the folded text
+_WORD_RE = re.compile(r"\S+")
+
+
+def fold_text(text):
+    """Lowercase, strip accents and replace punctuation with spaces"""
+    text = str(text)
+    return text.translate(_ASCII_TABLE if text.isascii() else _FOLD_TABLE)
+
+
+def _resolve_stopwords(stopwords):
+    """Accept None, language codes ("en", "pt" or a list of them) or a set of words"""
+    if not stopwords:
+        return frozenset()
+    if isinstance(stopwords, str):
+        stopwords = [stopwords]
+    words = set()
+    for item in stopwords:
+        if item in STOPWORDS:
+            words |= STOPWORDS[item]
+        else:
+            words.add(fold_text(item).strip())
+    return frozenset(words)
+
+
+# ============ FUZZY MATCHING ============
+# Misspelled query terms are mapped onto the vocabulary in two steps: trigram
+# overlap (Dice coefficient) shortlists candidates through an inverted index,
+# then a bounded edit distance on the shortlist picks the closest terms.
+FUZZY_MIN_DICE = 0.3
+FUZZY_CANDIDATES = 8
+FUZZY_CHARS_PER_EDIT = 4  # allow one edit per 4 characters
+FUZZY_MIN_LENGTH = 5      # shorter words ("lab", "spa") are one edit away from too many others
+
+
+def _trigrams(term):
+    """Character trigrams of a term, padded so word starts and ends count"""
+    padded = f" {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a, b, limit):
+    """Levenshtein distance, or limit + 1 once it must exceed limit
+
+    Only the diagonal band of width 2 * limit + 1 is computed.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if a == b:
+        return 0
+    over = limit + 1
+    previous = [j if j <= limit else over for j in range(len(b) + 1)]
+    for i, char_a in enumerate(a, 1):
+        current = [over] * (len(b) + 1)
+        current[0] = row_min = i if i <= limit else over
+        for j in range(max(1, i - limit), min(len(b), i + limit) + 1):
+            cost = previous[j - 1] + (char_a != b[j - 1])
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            current[j] = cost
+            if cost < row_min:
+                row_min = cost
+        if row_min > limit:
+            return over
+        previous = current
+    return previous[-1] if previous[-1] <= limit else over
+
+
+class TrigramIndex:
+    """Character-trigram index over a vocabulary for typo-tolerant term lookup"""
+
+    def __init__(self, terms):
+        self.terms = sorted(terms)
+        self.gram_counts = array("I")
+        postings = defaultdict(list)
+        for term_id, term in enumerate(self.terms):
+            grams = _trigrams(term)
+            self.gram_counts.append(len(grams))
+            for gram in grams:
+                postings[gram].append(term_id)
+        self.postings = dict(postings)
+
+    def expand(self, token):
+        """Closest vocabulary terms to a token, or [] when none is close enough
+
+        Tokens shorter than FUZZY_MIN_LENGTH are never corrected.
+        """
+        if len(token) < FUZZY_MIN_LENGTH:
+            return []
+        grams = _trigrams(token)
+        shared = Counter(chain.from_iterable(self.postings.get(gram, ()) for gram in grams))
+
+        # Dice >= t needs at least t * |grams| / (2 - t) shared trigrams
+        min_shared = FUZZY_MIN_DICE * len(grams) / (2 - FUZZY_MIN_DICE)
+        candidates = []
+        for term_id, count in shared.items():
+            if count >= min_shared:
+                dice = 2 * count / (len(grams) + self.gram_counts[term_id])
+                if dice >= FUZZY_MIN_DICE:
+                    candidates.append((dice, -term_id))
+
+        # Only the closest terms are kept, so each match tightens the bound
+        limit = len(token) // FUZZY_CHARS_PER_EDIT
+        matches = []
+        for dice, term_id in heapq.nlargest(FUZZY_CANDIDATES, candidates):
+            term = self.terms[-term_id]
+            distance = _edit_distance(token, term, limit)
+            if distance <= limit:
+                matches.append((distance, -dice, term))
+                limit = distance
+        matches.sort()
+        return [term for distance, _, term in matches if distance == matches[0][0]]
+
+
 # ============ BM25 IMPLEMENTATION ============
 class BM25:
-    """BM25 ranking algorithm for text search"""
+    """BM25 ranking algorithm for text search, backed by an inverted index"""
 
-    def __init__(self, k1=1.5, b=0.75):
+    def __init__(self, k1=1.5, b=0.75, use_numpy=None, stopwords=None, positional=False):
         self.k1 = k1
         self.b = b
-        self.corpus = []
+        self.positional = positional
+        self.stopwords = _resolve_stopwords(stopwords)
+        self.use_numpy = NUMPY_AVAILABLE if use_numpy is None else (use_numpy and NUMPY_AVAILABLE)
+        self.matrix = None
         self.doc_lengths = []
+        self.doc_norms = []
         self.avgdl = 0
         self.idf = {}
-        self.doc_freqs = defaultdict(int)
+        self.postings = {}
+        self.positions = {}
         self.N = 0
+        self.trigrams = None
 
     def tokenize(self, text):
-        """Lowercase, split, remove punctuation, filter short words"""
-        text = re.sub(r'[^\w\s]', ' ', str(text).lower())
-        return [w for w in text.split() if len(w) > 2]
+        """Lowercase, fold accents, remove punctuation, split, filter short words and stopwords"""
+        text = str(text)
+        words = text.translate(_ASCII_TABLE if text.isascii() else _FOLD_TABLE).split()
+        if self.stopwords:
+            stopwords = self.stopwords
+            return [w for w in words if len(w) > 2 and w not in stopwords]
+        return [w for w in words if len(w) > 2]
+
+    def tokenize_spans(self, text):
+        """tokenize() plus the (start, end) character offsets of each token in text"""
+        text = str(text)
+        if text.isascii():
+            folded = text.translate(_ASCII_TABLE)
+            origin = None
+        else:
+            # Folding can drop or expand characters: map folded offsets back to the text
+            pieces = [_FOLD_TABLE[ord(char)] for char in text]
+            folded = "".join(pieces)
+            origin = [i for i, piece in enumerate(pieces) for _ in piece]
+            origin.append(len(text))
+        stopwords = self.stopwords
+        tokens, spans = [], []
+        for match in _WORD_RE.finditer(folded):
+            word = match.group()
+            if len(word) <= 2 or word in stopwords:
+                continue
+            start, end = match.span()
+            if origin is not None:
+                start, end = origin[start], max(origin[end], origin[end - 1] + 1)
+            tokens.append(word)
+            spans.append((start, end))
+        return tokens, spans
 
     def fit(self, documents):
-        """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
-        self.N = len(self.corpus)
+        """Build BM25 index from documents
+
+        Each term maps to a postings pair of parallel lists (doc ids, term
+        frequencies); document-length norms are precomputed per document.
+        A document is a string or a sequence of field strings, which index
+        as if joined by spaces. Positional indexes also keep, per posting,
+        the (field, start, end) character offsets of every occurrence.
+        """
+        postings = defaultdict(lambda: ([], []))
+        positions = defaultdict(lambda: ([0], []))
+        self.doc_lengths = []
+        tokenize = self.tokenize_spans if self.positional else self.tokenize
+        if profiler.ACTIVE is not None:
+            tokenize = profiler.ACTIVE.accumulate("tokenize", tokenize)
+        for idx, doc in enumerate(documents):
+            if self.positional:
+                term_spans = defaultdict(list)
+                length = 0
+                for field, text in enumerate((doc,) if isinstance(doc, str) else doc):
+                    tokens, spans = tokenize(text)
+                    length += len(tokens)
+                    for word, (start, end) in zip(tokens, spans):
+                        term_spans[word].extend((field, start, end))
+                self.doc_lengths.append(length)
+                for word, flat in term_spans.items():
+                    doc_ids, tfs = postings[word]
+                    doc_ids.append(idx)
+                    tfs.append(len(flat) // 3)
+                    ptr, values = positions[word]
+                    values.extend(flat)
+                    ptr.append(len(values))
+                continue
+
+            tokens = tokenize(doc if isinstance(doc, str) else " ".join(doc))
+            self.doc_lengths.append(len(tokens))
+            term_freqs = defaultdict(int)
+            for word in tokens:
+                term_freqs[word] += 1
+            for word, tf in term_freqs.items():
+                doc_ids, tfs = postings[word]
+                doc_ids.append(idx)
+                tfs.append(tf)
+
+        self.N = len(self.doc_lengths)
+        self.postings = dict(postings)
+        self.positions = {word: (array('I', ptr), array('I', values)) for word, (ptr, values) in positions.items()}
+        self.trigrams = None
+        self.idf = {}
+        self.doc_norms = []
+        self.matrix = None
         if self.N == 0:
             return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
         self.avgdl = sum(self.doc_lengths) / self.N
 
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
+        # Length normalization term of the BM25 denominator, per document
+        self.doc_norms = [self.k1 * (1 - self.b + self.b * doc_len / self.avgdl) for doc_len in self.doc_lengths]
 
-        for word, freq in self.doc_freqs.items():
+        for word, (doc_ids, _) in self.postings.items():
+            freq = len(doc_ids)
             self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
 
-    def score(self, query):
-        """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
+    def score(self, query, top_k=None):
+        """Score documents against query, best first
 
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
-            term_freqs = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
+        Only documents containing at least one query term are returned.
+        """
+        return self.score_tokens(self.tokenize(query), top_k)
 
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
+    def score_tokens(self, query_tokens, top_k=None):
+        """Score documents against already tokenized query terms"""
+        scores = {}
+        k1_plus = self.k1 + 1
+        doc_norms = self.doc_norms
 
-            scores.append((idx, score))
+        for token in query_tokens:
+            if token not in self.idf:
+                continue
+            idf = self.idf[token]
+            doc_ids, tfs = self.postings[token]
+            for idx, tf in zip(doc_ids, tfs):
+                scores[idx] = scores.get(idx, 0) + idf * (tf * k1_plus) / (tf + doc_norms[idx])
 
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+        # Highest score first, ties broken by document order
+        if top_k is None:
+            return sorted(scores.items(), key=_rank_key)
+        return heapq.nsmallest(top_k, scores.items(), key=_rank_key)
+
+    def dropped_tokens(self, text):
+        """Words of text that tokenize() filters out: 2 characters or shorter, or stopwords"""
+        return [w for w in fold_text(text).split() if len(w) <= 2 or w in self.stopwords]
+
+    def _posting(self, term, idx):
+        """Position of document idx in a term's postings, or None"""
+        if term not in self.idf:
+            return None
+        doc_ids = self.postings[term][0]
+        j = bisect_left(doc_ids, idx)
+        if j == len(doc_ids) or doc_ids[j] != idx:
+            return None
+        return j
+
+    def explain(self, query_tokens, idx):
+        """Per-term breakdown of document idx's score, read from the postings
+
+        Contributions are summed in score_tokens() order, so "score" matches
+        the ranked score exactly. Terms outside the vocabulary are skipped.
+        """
+        k1_plus = self.k1 + 1
+        norm = self.doc_norms[idx]
+        score = 0
+        terms = []
+        for token in query_tokens:
+            if token not in self.idf:
+                continue
+            idf = self.idf[token]
+            j = self._posting(token, idx)
+            tf = 0 if j is None else self.postings[token][1][j]
+            contribution = idf * (tf * k1_plus) / (tf + norm) if tf else 0.0
+            score += contribution
+            terms.append({"term": token, "idf": idf, "tf": tf, "contribution": contribution})
+        return {"score": score, "doc_length": self.doc_lengths[idx], "norm": norm, "terms": terms}
+
+    def spans(self, term, idx):
+        """(field, start, end) character spans of a term in document idx; empty without positions"""
+        j = self._posting(term, idx) if self.positional else None
+        if j is None:
+            return []
+        ptr, values = self.positions[term]
+        flat = values[ptr[j]:ptr[j + 1]]
+        return list(zip(flat[0::3], flat[1::3], flat[2::3]))
+
+    def fuzzy_tokens(self, query_tokens, known=()):
+        """Replace query terms missing from the vocabulary with their closest terms
+
+        Terms in known (e.g. a wider vocabulary) are taken as correctly spelled
+        and left alone. The trigram index is built from this index's own
+        vocabulary on first use, so fits and cold starts that never see a
+        misspelling do not pay for it.
+        """
+        if self.trigrams is None:
+            self.trigrams = TrigramIndex(self.postings)
+        expanded = []
+        for token in query_tokens:
+            if token in self.idf or token in known:
+                expanded.append(token)
+            else:
+                expanded.extend(self.trigrams.expand(token))
+        return expanded
+
+    def score_many(self, queries, top_k=None):
+        """Score a batch of queries; returns one ranking per query, as score() would"""
+        token_lists = [self.tokenize(query) for query in queries]
+        if self.matrix is None and self.use_numpy and self.N:
+            # Built on the first batch, so single-query callers never import NumPy
+            self.matrix = self._build_matrix()
+        if self.matrix is None:
+            return [self.score_tokens(tokens, top_k) for tokens in token_lists]
+        return self._score_many_numpy(token_lists, top_k)
+
+    def _build_matrix(self):
+        """Sparse doc x term weight matrix in column (per-term) layout
+
+        Each column holds the BM25 contribution of one term for every document
+        that contains it, computed with the same float operations as
+        score_tokens() so both paths produce identical scores.
+        """
+        columns = {}
+        col_ptr = [0]
+        doc_ids, tfs, idfs = [], [], []
+        for word, (word_docs, word_tfs) in self.postings.items():
+            columns[word] = len(columns)
+            doc_ids.extend(word_docs)
+            tfs.extend(word_tfs)
+            idfs.extend([self.idf[word]] * len(word_docs))
+            col_ptr.append(len(doc_ids))
+
+        np = load_numpy()
+        doc_ids = np.array(doc_ids, dtype=np.int64)
+        tfs = np.array(tfs, dtype=np.float64)
+        norms = np.array(self.doc_norms, dtype=np.float64)
+        weights = np.array(idfs, dtype=np.float64) * (tfs * (self.k1 + 1)) / (tfs + norms[doc_ids])
+
+        return {
+            "columns": columns,
+            "col_ptr": np.array(col_ptr, dtype=np.int64),
+            "doc_ids": doc_ids,
+            "weights": weights
+        }
+
+    def _score_many_numpy(self, token_lists, top_k):
+        """Score a batch as one sparse (query x term) . (term x doc) product"""
+        np = load_numpy()
+        columns = self.matrix["columns"]
+        col_ptr = self.matrix["col_ptr"]
+        rankings = []
+
+        # Bound the dense (queries x docs) score block to a few million cells
+        chunk = max(1, 4000000 // self.N)
+        for start in range(0, len(token_lists), chunk):
+            batch = token_lists[start:start + chunk]
+            query_ids, spans = [], []
+            for qi, tokens in enumerate(batch):
+                for token in tokens:
+                    col = columns.get(token)
+                    if col is not None:
+                        query_ids.append(qi)
+                        spans.append((col_ptr[col], col_ptr[col + 1]))
+
+            scores = np.zeros((len(batch), self.N), dtype=np.float64)
+            if spans:
+                entries = np.concatenate([np.arange(lo, hi) for lo, hi in spans])
+                lengths = [hi - lo for lo, hi in spans]
+                cells = np.repeat(np.array(query_ids, dtype=np.int64), lengths) * self.N + self.matrix["doc_ids"][entries]
+                # bincount accumulates in input order, matching score_tokens() summation
+                scores = np.bincount(cells, weights=self.matrix["weights"][entries], minlength=scores.size).reshape(scores.shape)
+
+            for row in scores:
+                matched = np.flatnonzero(row > 0)
+                order = matched[np.argsort(-row[matched], kind="stable")]
+                if top_k is not None:
+                    order = order[:top_k]
+                rankings.append([(int(idx), float(row[idx])) for idx in order])
+
+        return rankings
+
+
+def _rank_key(item):
+    """Sort key for (doc id, score) pairs: highest score first, then document order"""
+    return (-item[1], item[0])
+
+
+# ============ COLUMNAR STORAGE ============
+class Record(Mapping):
+    """Read-only row view over a ColumnStore; results are records, not dict copies
+
+    Behaves like the dict csv.DictReader would give (same keys, values, order
+    and repr); use dict(record) or json_default() where a real dict is needed.
+    """
+
+    __slots__ = ("_fields", "_idx")
+
+    def __init__(self, fields, idx):
+        self._fields = fields  # column name -> column list, shared by all records of a projection
+        self._idx = idx
+
+    def __getitem__(self, key):
+        return self._fields[key][self._idx]
+
+    def get(self, key, default=None):
+        column = self._fields.get(key)
+        return default if column is None else column[self._idx]
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __contains__(self, key):
+        return key in self._fields
+
+    def items(self):
+        idx = self._idx
+        return [(key, column[idx]) for key, column in self._fields.items()]
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+def json_default(value):
+    """json.dumps hook serializing result records as objects"""
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class _InternedColumn:
+    """Low-cardinality column: one code per row into a list of interned values"""
+
+    __slots__ = ("values", "codes")
+
+    def __init__(self, values, codes):
+        self.values = values
+        self.codes = codes
+
+    def __getitem__(self, idx):
+        return self.values[self.codes[idx]]
+
+    def __iter__(self):
+        return map(self.values.__getitem__, self.codes)
+
+
+class _BlobColumn:
+    """Free-text column: cells concatenated as UTF-8, decoded on access"""
+
+    __slots__ = ("blob", "offsets", "nulls")
+
+    def __init__(self, blob, offsets, nulls):
+        self.blob = blob
+        self.offsets = offsets
+        self.nulls = nulls  # row ids whose cell is None (short CSV rows)
+
+    def __getitem__(self, idx):
+        if idx in self.nulls:
+            return None
+        return self.blob[self.offsets[idx]:self.offsets[idx + 1]].decode("utf-8")
+
+    def __iter__(self):
+        for idx in range(len(self.offsets) - 1):
+            yield self[idx]
+
+
+def _compact_column(cells):
+    """Pack a list of cells into an interned or blob column, whichever is smaller"""
+    distinct = dict.fromkeys(cells)
+    if len(distinct) * 2 <= len(cells):
+        values = [None if cell is None else sys.intern(cell) for cell in distinct]
+        code_of = {cell: code for code, cell in enumerate(distinct)}
+        return _InternedColumn(values, array("B" if len(values) <= 256 else "I", map(code_of.__getitem__, cells)))
+
+    encoded = [b"" if cell is None else cell.encode("utf-8") for cell in cells]
+    offsets = array("I", accumulate(map(len, encoded), initial=0))
+    nulls = frozenset(idx for idx, cell in enumerate(cells) if cell is None)
+    return _BlobColumn(b"".join(encoded), offsets, nulls)
+
+
+class ColumnStore:
+    """A loaded dataset as one compact array per column (see _compact_column)"""
+
+    def __init__(self, columns, cells):
+        self.columns = columns
+        self._fields = {col: _compact_column(column) for col, column in zip(columns, cells)}
+        self._len = len(cells[0]) if cells else 0
+        self._projections = {}
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, idx):
+        if not -self._len <= idx < self._len:
+            raise IndexError(idx)
+        return Record(self._fields, idx % self._len)
+
+    def __iter__(self):
+        fields = self._fields
+        return (Record(fields, idx) for idx in range(self._len))
+
+    def column(self, name):
+        """Cells of a column, or None when the dataset has no such column"""
+        return self._fields.get(name)
+
+    def fields(self, search_cols):
+        """Searchable text per row as a tuple of search column values"""
+        columns = [self._fields.get(col) for col in search_cols]
+        cells = [[""] * self._len if column is None else map(str, column) for column in columns]
+        return list(zip(*cells)) if cells else [()] * self._len
+
+    def documents(self, search_cols):
+        """Searchable text per row: the search columns joined by spaces"""
+        return [" ".join(row) for row in self.fields(search_cols)]
+
+    def record(self, idx, output_cols):
+        """Row idx restricted to the output columns the dataset has"""
+        key = tuple(output_cols)
+        fields = self._projections.get(key)
+        if fields is None:
+            fields = {col: self._fields[col] for col in output_cols if col in self._fields}
+            self._projections[key] = fields
+        return Record(fields, idx)
+
+
+def load_columns(filepath):
+    """Load a CSV into a ColumnStore
+
+    Short rows get None in their missing cells and blank lines are skipped,
+    as with csv.DictReader.
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        columns = next(reader, [])
+        width = len(columns)
+        rows = [row if len(row) == width else (row + [None] * width)[:width] for row in reader if row]
+    cells = [list(column) for column in zip(*rows)] if rows else [[] for _ in columns]
+    return ColumnStore(columns, cells)
+
+
+# ============ FILE OUTPUT ============
+# Process umask; os.umask() can only be read by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def file_mode(path):
+    """Mode for a file written through a temp file and renamed over path
+
+    tempfile.mkstemp() creates files 0600 and os.replace() keeps that, so
+    the temp file gets path's current mode, or the umask default for new files.
+    """
+    try:
+        return Path(path).stat().st_mode & 0o7777
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+# ============ INDEX REGISTRY ============
+# Fitted indexes are kept per process, keyed on (file path, search columns) and
+# validated against the file mtime, so repeated queries only pay for scoring.
+_INDEX_CACHE = {}
 
 
-# ============ SEARCH FUNCTIONS ============
 def _load_csv(filepath):
     """Load CSV and return list of dicts"""
     with open(filepath, 'r', encoding='utf-8') as f:
         return list(csv.DictReader(f))
 
 
-def _search_csv(filepath, search_cols, output_cols, query, max_results):
-    """Core search function using BM25"""
+def get_index(filepath, search_cols):
+    """Return the fitted index for a CSV, loading it on first use or when the file changed"""
+    filepath = Path(filepath)
+    key = (str(filepath.resolve()), tuple(search_cols))
+    mtime = filepath.stat().st_mtime_ns
+
+    entry = _INDEX_CACHE.get(key)
+    if entry is not None and entry["mtime"] == mtime:
+        return entry
+
+    # Prefer the compiled data pack (see datapack.py) when one has been built
+    with profiler.phase("pack_load", file=filepath.name):
+        from datapack import packed_index
+        entry = packed_index(filepath, search_cols, mtime)
+    if entry is not None:
+        _INDEX_CACHE[key] = entry
+        return entry
+
+    with profiler.phase("csv_load", file=filepath.name):
+        data = load_columns(filepath)
+
+    with profiler.phase("fit", file=filepath.name, docs=len(data)):
+        # Build documents from search columns, kept apart so match offsets are per column
+        bm25 = BM25(positional=True)
+        bm25.fit(data.fields(search_cols))
+
+    entry = {"mtime": mtime, "data": data, "bm25": bm25}
+    _INDEX_CACHE[key] = entry
+    return entry
+
+
+def invalidate_index(filepath=None):
+    """Drop cached indexes for one CSV file, or all of them when no path is given"""
+    if filepath is None:
+        _INDEX_CACHE.clear()
+        return
+    path = str(Path(filepath).resolve())
+    for key in [k for k in _INDEX_CACHE if k[0] == path]:
+        del _INDEX_CACHE[key]
+
+
+# ============ RESULT CACHE ============
+# Optional persistent cache (see result_cache.py); None disables it
+_RESULT_CACHE = None
+_DATASET_HASHES = {}
+_QUERY_TOKENIZER = BM25(use_numpy=False)
+# Bump when the cached [results, highlights] layout changes
+_RESULT_LAYOUT = 2
+
+
+def set_result_cache(cache):
+    """Use a ResultCache for search() / search_stack(); pass None to disable"""
+    global _RESULT_CACHE
+    _RESULT_CACHE = cache
+
+
+def get_result_cache():
+    """The configured ResultCache, or None"""
+    return _RESULT_CACHE
+
+
+def dataset_hash(filepath):
+    """Content hash of a CSV, recomputed only when its mtime or size changes"""
+    stat = Path(filepath).stat()
+    key = str(filepath)
+    cached = _DATASET_HASHES.get(key)
+    if cached is not None and cached[0] == (stat.st_mtime_ns, stat.st_size):
+        return cached[1]
+    with open(filepath, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:16]
+    _DATASET_HASHES[key] = ((stat.st_mtime_ns, stat.st_size), digest)
+    return digest
+
+
+def _cached_search_csv(filepath, search_cols, output_cols, query, max_results, engine="bm25", explain=False,
+                       tokens=None):
+    """_search_csv through the result cache; returns (results, highlights, explanation, cache status or None)
+
+    Explained searches bypass the cache: the breakdown needs the ranked rows' ids.
+    tokens passes the already tokenized query (see SearchPlan).
+    """
+    if _RESULT_CACHE is None or explain or not filepath.exists():
+        return _search_csv(filepath, search_cols, output_cols, query, max_results, engine, explain, tokens) + (None,)
+
+    from result_cache import make_key
+    if tokens is None:
+        tokens = _QUERY_TOKENIZER.tokenize(query)
+    with profiler.phase("cache_lookup", file=filepath.name) as info:
+        key = make_key([filepath.name, search_cols, output_cols, TOKENIZER_VERSION, engine, _RESULT_LAYOUT], tokens, max_results, dataset_hash(filepath))
+        cached = _RESULT_CACHE.get(key)
+        info["hit"] = cached is not None
+
+    status = "hit"
+    if cached is None:
+        cached = _search_csv(filepath, search_cols, output_cols, query, max_results, engine, tokens=tokens)[:2]
+        _RESULT_CACHE.put(key, cached)
+        status = "miss"
+
+    cache = {"status": status}
+    cache.update(_RESULT_CACHE.stats())
+    results, highlights = cached
+    return results, highlights, None, cache
+
+
+# ============ SEARCH FUNCTIONS ============
+def _search_csv(filepath, search_cols, output_cols, query, max_results, engine="bm25", explain=False, tokens=None):
+    """Core search function using BM25, or the LSA / hybrid ranker
+
+    Returns (results, highlights, explanation): the output rows, per row the
+    match spans of the query terms (see _match_spans), and with explain the
+    BM25 score breakdown (see _explain_ranking), else None.
+    """
     if not filepath.exists():
-        return []
+        return [], [], None
 
-    data = _load_csv(filepath)
+    index = get_index(filepath, search_cols)
+    bm25 = index["bm25"]
+    if tokens is None:
+        with profiler.phase("tokenize"):
+            tokens = bm25.tokenize(query)
+    if engine != "bm25":
+        from lsa import get_model
+        with profiler.phase("score", file=filepath.name, engine=engine):
+            model = get_model(filepath, search_cols)
+            if model is None:
+                ranked = bm25.score_tokens(tokens, top_k=max_results)
+            elif engine == "hybrid":
+                ranked = model.rank_hybrid(bm25, tokens, top_k=max_results)
+            else:
+                ranked = model.rank(tokens, top_k=max_results)
+            return (_collect_results(index["data"], ranked, output_cols),
+                    _collect_highlights(bm25, ranked, tokens, search_cols, output_cols), None)
+    with profiler.phase("score", file=filepath.name):
+        ranked = bm25.score_tokens(tokens, top_k=max_results)
+        if not ranked and tokens:
+            # No exact hit: retry with misspelled terms (words no dataset contains) mapped onto the vocabulary
+            tokens = bm25.fuzzy_tokens(tokens, known_terms())
+            ranked = bm25.score_tokens(tokens, top_k=max_results)
+        return (_collect_results(index["data"], ranked, output_cols),
+                _collect_highlights(bm25, ranked, tokens, search_cols, output_cols),
+                _explain_ranking(bm25, ranked, query, tokens, search_cols) if explain else None)
 
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
 
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
+def _explain_ranking(bm25, ranked, query, query_tokens, search_cols):
+    """BM25 parameters, query terms and a per-row score breakdown for the rows _collect_results() returns"""
+    rows = []
+    for idx, score in ranked:
+        if score <= 0:
+            continue
+        row = bm25.explain(query_tokens, idx)
+        rows.append({
+            "score": round(row["score"], 4),
+            "doc_length": row["doc_length"],
+            "norm": round(row["norm"], 4),
+            "terms": [{"term": term["term"], "idf": round(term["idf"], 4), "tf": term["tf"],
+                       "contribution": round(term["contribution"], 4)} for term in row["terms"]]
+        })
+    return {
+        "k1": bm25.k1,
+        "b": bm25.b,
+        "avgdl": round(bm25.avgdl, 4),
+        "docs": bm25.N,
+        "search_cols": list(search_cols),
+        "tokens": list(query_tokens),
+        "dropped": bm25.dropped_tokens(query),
+        "unknown": [token for token in dict.fromkeys(query_tokens) if token not in bm25.idf],
+        "rows": rows
+    }
 
-    # Get top results with score > 0
-    results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
 
-    return results
+def _collect_results(data, ranked, output_cols):
+    """Build output rows for ranked (idx, score) pairs with score > 0"""
+    return [_output_row(data, idx, output_cols) for idx, score in ranked if score > 0]
+
+
+def _collect_highlights(bm25, ranked, query_tokens, search_cols, output_cols):
+    """Match spans for each row _collect_results() returns"""
+    return [_match_spans(bm25, idx, query_tokens, search_cols, output_cols) for idx, score in ranked if score > 0]
+
+
+def _match_spans(bm25, idx, query_tokens, search_cols, output_cols):
+    """Character spans of the query terms in row idx, as {column: [[start, end], ...]}
+
+    Read from the positional index, so result text is never re-scanned.
+    Only output columns that are also searched can carry spans.
+    """
+    spans = defaultdict(list)
+    for token in dict.fromkeys(query_tokens):
+        for field, start, end in bm25.spans(token, idx):
+            spans[search_cols[field]].append([start, end])
+    return {col: sorted(spans[col]) for col in output_cols if col in spans}
+
+
+def _output_row(data, idx, output_cols):
+    """Row idx restricted to output_cols; stores with record() skip the per-row dict"""
+    record = getattr(data, "record", None)
+    if record is not None:
+        return record(idx, output_cols)
+    row = data[idx]
+    return {col: row.get(col, "") for col in output_cols if col in row}
+
+
+DOMAIN_KEYWORDS = {
+    "color": ["color", "palette", "hex", "#", "rgb"],
+    "chart": ["chart", "graph", "visualization", "trend", "bar", "pie", "scatter", "heatmap", "funnel"],
+    "landing": ["landing", "page", "cta", "conversion", "hero", "testimonial", "pricing", "section"],
+    "product": ["saas", "ecommerce", "e-commerce", "fintech", "healthcare", "gaming", "portfolio", "crypto", "dashboard"],
+    "prompt": ["prompt", "css", "implementation", "variable", "checklist", "tailwind"],
+    "style": ["style", "design", "ui", "minimalism", "glassmorphism", "neumorphism", "brutalism", "dark mode", "flat", "aurora"],
+    "ux": ["ux", "usability", "accessibility", "wcag", "touch", "scroll", "animation", "keyboard", "navigation", "mobile"],
+    "typography": ["font", "typography", "heading", "serif", "sans"],
+    "icons": ["icon", "icons", "lucide", "heroicons", "symbol", "glyph", "pictogram", "svg icon"],
+    "react": ["react", "next.js", "nextjs", "suspense", "memo", "usecallback", "useeffect", "rerender", "bundle", "waterfall", "barrel", "dynamic import", "rsc", "server component"],
+    "web": ["aria", "focus", "outline", "semantic", "virtualize", "autocomplete", "form", "input type", "preconnect"]
+}
+
+# Words of the keyword table and their trigram index, built on the first misspelled query
+_KEYWORD_WORDS = None
+_KEYWORD_TRIGRAMS = None
+
+
+def _keyword_fuzzy_tokens(query_tokens):
+    """Map misspelled query terms (words no dataset contains) onto the closest keyword-table words"""
+    global _KEYWORD_WORDS, _KEYWORD_TRIGRAMS
+    if _KEYWORD_TRIGRAMS is None:
+        _KEYWORD_WORDS = frozenset(word for keywords in DOMAIN_KEYWORDS.values() for kw in keywords
+                                   for word in _QUERY_TOKENIZER.tokenize(kw))
+        _KEYWORD_TRIGRAMS = TrigramIndex(_KEYWORD_WORDS)
+    known = None
+    expanded = []
+    for token in query_tokens:
+        if token not in _KEYWORD_WORDS:
+            known = known_terms() if known is None else known
+            if token not in known:
+                expanded.extend(_KEYWORD_TRIGRAMS.expand(token))
+                continue
+        expanded.append(token)
+    return expanded
 
 
 def detect_domain(query):
-    """Auto-detect the most relevant domain from query"""
-    query_lower = query.lower()
+    """Auto-detect the most relevant domain from query
 
-    domain_keywords = {
-        "color": ["color", "palette", "hex", "#", "rgb"],
-        "chart": ["chart", "graph", "visualization", "trend", "bar", "pie", "scatter", "heatmap", "funnel"],
-        "landing": ["landing", "page", "cta", "conversion", "hero", "testimonial", "pricing", "section"],
-        "product": ["saas", "ecommerce", "e-commerce", "fintech", "healthcare", "gaming", "portfolio", "crypto", "dashboard"],
-        "prompt": ["prompt", "css", "implementation", "variable", "checklist", "tailwind"],
-        "style": ["style", "design", "ui", "minimalism", "glassmorphism", "neumorphism", "brutalism", "dark mode", "flat", "aurora"],
-        "ux": ["ux", "usability", "accessibility", "wcag", "touch", "scroll", "animation", "keyboard", "navigation", "mobile"],
-        "typography": ["font", "typography", "heading", "serif", "sans"],
-        "icons": ["icon", "icons", "lucide", "heroicons", "symbol", "glyph", "pictogram", "svg icon"],
-        "react": ["react", "next.js", "nextjs", "suspense", "memo", "usecallback", "useeffect", "rerender", "bundle", "waterfall", "barrel", "dynamic import", "rsc", "server component"],
-        "web": ["aria", "focus", "outline", "semantic", "virtualize", "autocomplete", "form", "input type", "preconnect"]
-    }
+    The keyword table decides, then the same table on typo-corrected terms,
+    else "style". Routing by the unified index is left to --domain all
+    (search_all), so every process picks the same domain for a query.
+    """
+    query_lower = query.lower()
 
-    scores = {domain: sum(1 for kw in keywords if kw in query_lower) for domain, keywords in domain_keywords.items()}
+    scores = {domain: sum(1 for kw in keywords if kw in query_lower) for domain, keywords in DOMAIN_KEYWORDS.items()}
     best = max(scores, key=scores.get)
-    return best if scores[best] > 0 else "style"
+    if scores[best] > 0:
+        return best
+
+    # Misspelled keywords ("glasmorphism"): retry the table on the corrected terms
+    tokens = _QUERY_TOKENIZER.tokenize(query)
+    corrected = _keyword_fuzzy_tokens(tokens)
+    if corrected != tokens:
+        corrected_query = " ".join(corrected)
+        scores = {domain: sum(1 for kw in keywords if kw in corrected_query) for domain, keywords in DOMAIN_KEYWORDS.items()}
+        best = max(scores, key=scores.get)
+        if scores[best] > 0:
+            return best
+
+    return "style"
 
 
-def search(query, domain=None, max_results=MAX_RESULTS):
-    """Main search function with auto-domain detection"""
+def _engine_error(engine, explain=False):
+    """Error message when the requested ranker cannot run here, else None"""
+    if engine not in ENGINES:
+        return f"Unknown engine: {engine}. Available: {', '.join(ENGINES)}"
+    if engine != "bm25" and not NUMPY_AVAILABLE:
+        return f"The {engine} engine requires NumPy (pip install numpy)"
+    if engine != "bm25" and explain:
+        return "Score explanations are only available for the bm25 engine"
+    if engine != "bm25":
+        from lsa import models_error
+        return models_error()
+    return None
+
+
+def search(query, domain=None, max_results=MAX_RESULTS, engine="bm25", explain=False):
+    """Main search function with auto-domain detection
+
+    explain=True adds the BM25 score breakdown of every returned row.
+    """
     if domain is None:
         domain = detect_domain(query)
 
@@ -224,20 +1051,29 @@ def search(query, domain=None, max_results=MAX_RESULTS):
 
     if not filepath.exists():
         return {"error": f"File not found: {filepath}", "domain": domain}
+    if _engine_error(engine, explain):
+        return {"error": _engine_error(engine, explain), "domain": domain}
 
-    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
+    with profiler.phase("search", domain=domain):
+        results, highlights, explanation, cache = _cached_search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results, engine, explain)
 
-    return {
+    response = {
         "domain": domain,
         "query": query,
         "file": config["file"],
         "count": len(results),
-        "results": results
+        "results": results,
+        "highlights": highlights
     }
+    if explanation:
+        response["explain"] = explanation
+    if cache:
+        response["cache"] = cache
+    return response
 
 
-def search_stack(query, stack, max_results=MAX_RESULTS):
-    """Search stack-specific guidelines"""
+def search_stack(query, stack, max_results=MAX_RESULTS, engine="bm25", explain=False):
+    """Search stack-specific guidelines (explain as in search())"""
     if stack not in STACK_CONFIG:
         return {"error": f"Unknown stack: {stack}. Available: {', '.join(AVAILABLE_STACKS)}"}
 
@@ -245,14 +1081,314 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
 
     if not filepath.exists():
         return {"error": f"Stack file not found: {filepath}", "stack": stack}
+    if _engine_error(engine, explain):
+        return {"error": _engine_error(engine, explain), "stack": stack}
 
-    results = _search_csv(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results)
+    with profiler.phase("search", stack=stack):
+        results, highlights, explanation, cache = _cached_search_csv(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results, engine, explain)
 
-    return {
+    response = {
         "domain": "stack",
         "stack": stack,
         "query": query,
         "file": STACK_CONFIG[stack]["file"],
         "count": len(results),
+        "results": results,
+        "highlights": highlights
+    }
+    if explanation:
+        response["explain"] = explanation
+    if cache:
+        response["cache"] = cache
+    return response
+
+
+# ============ QUERY PLANNER ============
+class SearchPlan:
+    """Domain searches deduplicated and executed together
+
+    Each query is tokenized once per plan and lookups are keyed on (domain,
+    query tokens). Requests with the same key share one execution at their
+    largest max_results; the others get a prefix of it, since rankings are
+    totally ordered by (score, document order). Executions are memoized for
+    the plan's lifetime, so later stages reuse earlier lookups as well.
+    Responses are shaped like search(), without the cache counters.
+    """
+
+    def __init__(self):
+        self.requested = 0
+        self.executed = 0
+        self._tokens = {}
+        self._done = {}  # (domain, tokens) -> (max_results, results, highlights)
+
+    def tokens(self, query):
+        """Query tokens, computed once per distinct query"""
+        if query not in self._tokens:
+            self._tokens[query] = _QUERY_TOKENIZER.tokenize(query)
+        return self._tokens[query]
+
+    def run(self, requests):
+        """Execute (domain, query, max_results) requests; one search() response per request"""
+        keyed = [((domain, tuple(self.tokens(query))), domain, query, max_results)
+                 for domain, query, max_results in requests]
+        self.requested += len(keyed)
+
+        pending = {}
+        for key, domain, query, max_results in keyed:
+            done = self._done.get(key)
+            if done is None or done[0] < max_results:
+                pending[key] = max(pending.get(key, (0, query))[0], max_results), query
+
+        with profiler.phase("search", domain="plan", requested=len(keyed), executed=len(pending)):
+            for (domain, tokens), (max_results, query) in pending.items():
+                config = CSV_CONFIG[domain]
+                results, highlights, _, _ = _cached_search_csv(DATA_DIR / config["file"], config["search_cols"],
+                                                               config["output_cols"], query, max_results,
+                                                               tokens=list(tokens))
+                self._done[(domain, tokens)] = (max_results, results, highlights)
+                self.executed += 1
+
+        responses = []
+        for key, domain, query, max_results in keyed:
+            _, results, highlights = self._done[key]
+            responses.append({
+                "domain": domain,
+                "query": query,
+                "file": CSV_CONFIG[domain]["file"],
+                "count": len(results[:max_results]),
+                "results": results[:max_results],
+                "highlights": highlights[:max_results]
+            })
+        return responses
+
+    def search(self, query, domain, max_results=MAX_RESULTS):
+        """One planned lookup, like search(query, domain, max_results)"""
+        return self.run([(domain, query, max_results)])[0]
+
+    def stats(self):
+        """Lookups requested, executed, and eliminated by deduplication"""
+        return {"requested": self.requested, "executed": self.executed, "eliminated": self.requested - self.executed}
+
+
+# ============ UNIFIED INDEX ============
+# One postings map over every domain and stack. Each posting carries the
+# weight the document would get from its own source's index, so a single
+# pass yields per-source BM25 scores identical to search()/search_stack().
+_GLOBAL_INDEX = None
+
+
+def _all_sources():
+    """(source name, file, search_cols, output_cols) for every domain and stack"""
+    for domain, config in CSV_CONFIG.items():
+        yield domain, config["file"], config["search_cols"], config["output_cols"]
+    for stack, config in STACK_CONFIG.items():
+        yield f"stack:{stack}", config["file"], _STACK_COLS["search_cols"], _STACK_COLS["output_cols"]
+
+
+# Vocabulary of every source: (source mtimes, terms) once computed without a pack
+_KNOWN_TERMS = None
+
+
+def known_terms():
+    """Every term of every domain and stack (supports `in`), to tell misspellings
+    from words a single source lacks
+
+    Read from the data pack's vocabulary section when the pack is current,
+    else tokenized from the CSVs once per process. Neither fits an index, so
+    the typo fallback never builds the unified index (get_global_index()).
+    """
+    global _KNOWN_TERMS
+    from datapack import packed_vocabulary
+    vocabulary = packed_vocabulary()
+    if vocabulary is not None:
+        return vocabulary
+
+    files = [DATA_DIR / file for _, file, _, _ in _all_sources()]
+    signature = [path.stat().st_mtime_ns if path.exists() else None for path in files]
+    if _KNOWN_TERMS is None or _KNOWN_TERMS[0] != signature:
+        terms = set()
+        for (_, _, search_cols, _), path in zip(_all_sources(), files):
+            if path.exists():
+                for fields in load_columns(path).fields(search_cols):
+                    for text in fields:
+                        terms.update(_QUERY_TOKENIZER.tokenize(text))
+        _KNOWN_TERMS = (signature, frozenset(terms))
+    return _KNOWN_TERMS[1]
+
+
+def get_global_index():
+    """Return the unified index, rebuilding it when any source index was reloaded"""
+    global _GLOBAL_INDEX
+    sources = []
+    for name, file, search_cols, output_cols in _all_sources():
+        filepath = DATA_DIR / file
+        if filepath.exists():
+            sources.append({"name": name, "file": file, "search_cols": search_cols, "output_cols": output_cols,
+                            "index": get_index(filepath, search_cols)})
+
+    signature = [id(source["index"]) for source in sources]
+    if _GLOBAL_INDEX is not None and _GLOBAL_INDEX["signature"] == signature:
+        return _GLOBAL_INDEX
+
+    with profiler.phase("fit", file="*", sources=len(sources)):
+        postings = defaultdict(lambda: ([], []))
+        doc_source, doc_local = [], []
+        for position, source in enumerate(sources):
+            bm25 = source["index"]["bm25"]
+            offset = len(doc_source)
+            doc_source.extend([position] * bm25.N)
+            doc_local.extend(range(bm25.N))
+            k1_plus = bm25.k1 + 1
+            for term in bm25.postings:
+                idf = bm25.idf[term]
+                doc_ids, tfs = bm25.postings[term]
+                global_ids, weights = postings[term]
+                for idx, tf in zip(doc_ids, tfs):
+                    global_ids.append(offset + idx)
+                    weights.append(idf * (tf * k1_plus) / (tf + bm25.doc_norms[idx]))
+
+    _GLOBAL_INDEX = {
+        "signature": signature,
+        "sources": sources,
+        "postings": dict(postings),
+        "doc_source": doc_source,
+        "doc_local": doc_local,
+        "trigrams": None
+    }
+    return _GLOBAL_INDEX
+
+
+def _score_ceiling(bm25, query_tokens):
+    """Best score a document of this source could reach for the query
+
+    Terms missing from the source count at the IDF of a term seen once, so
+    sources that cover only part of the query are not favoured.
+    """
+    if bm25.N == 0:
+        return 0
+    unseen_idf = log((bm25.N - 1 + 0.5) / (1 + 0.5) + 1)
+    return sum(bm25.idf[token] if token in bm25.idf else unseen_idf for token in query_tokens) * (bm25.k1 + 1)
+
+
+def search_all(query, max_results=MAX_RESULTS, domains_only=False):
+    """Search every domain and stack in one pass
+
+    Scores are normalized per source by its score ceiling for the query, so
+    results from different domains are comparable. Also returns the inferred
+    domain distribution (share of the best normalized score per source).
+    """
+    with profiler.phase("search", domain="all"):
+        index = get_global_index()
+        with profiler.phase("tokenize"):
+            query_tokens = _QUERY_TOKENIZER.tokenize(query)
+        with profiler.phase("score", file="*"):
+            result = _search_all_scored(index, query, query_tokens, max_results, domains_only)
+            if not result["distribution"] and query_tokens:
+                # No exact hit: retry with misspelled terms mapped onto the vocabulary
+                result = _search_all_scored(index, query, _global_fuzzy_tokens(index, query_tokens), max_results, domains_only)
+            return result
+
+
+def _global_fuzzy_tokens(index, query_tokens):
+    """BM25.fuzzy_tokens() over the unified vocabulary"""
+    if index["trigrams"] is None:
+        index["trigrams"] = TrigramIndex(index["postings"])
+    expanded = []
+    for token in query_tokens:
+        expanded.extend([token] if token in index["postings"] else index["trigrams"].expand(token))
+    return expanded
+
+
+def _search_all_scored(index, query, query_tokens, max_results, domains_only):
+    """Score, normalize and rank the unified index for search_all()"""
+    sources = index["sources"]
+    doc_source = index["doc_source"]
+
+    scores = {}
+    for token in query_tokens:
+        pair = index["postings"].get(token)
+        if pair is None:
+            continue
+        for global_id, weight in zip(*pair):
+            if domains_only and sources[doc_source[global_id]]["name"].startswith("stack:"):
+                continue
+            scores[global_id] = scores.get(global_id, 0) + weight
+
+    ceilings = {}
+    best = {}
+    for global_id, score in scores.items():
+        position = doc_source[global_id]
+        if position not in ceilings:
+            ceilings[position] = _score_ceiling(sources[position]["index"]["bm25"], query_tokens)
+        score = score / ceilings[position]
+        scores[global_id] = score
+        best[position] = max(best.get(position, 0), score)
+
+    total = sum(best.values())
+    distribution = {
+        sources[position]["name"]: round(share / total, 4)
+        for position, share in sorted(best.items(), key=_rank_key)
+    }
+
+    results = []
+    for global_id, score in heapq.nsmallest(max_results, scores.items(), key=_rank_key):
+        source = sources[doc_source[global_id]]
+        local_id = index["doc_local"][global_id]
+        results.append({
+            "source": source["name"],
+            "file": source["file"],
+            "score": round(score, 4),
+            "row": _output_row(source["index"]["data"], local_id, source["output_cols"]),
+            "highlights": _match_spans(source["index"]["bm25"], local_id, query_tokens, source["search_cols"],
+                                       source["output_cols"])
+        })
+
+    return {
+        "domain": "all",
+        "query": query,
+        "count": len(results),
+        "distribution": distribution,
         "results": results
     }
+
+
+def search_many(queries, domain=None, max_results=MAX_RESULTS):
+    """Search a batch of queries, scoring each domain's share in one batched pass
+
+    Returns one result dict per query, in input order, shaped like search().
+    """
+    domains = [domain or detect_domain(query) for query in queries]
+    responses = [None] * len(queries)
+
+    groups = defaultdict(list)
+    for i, query_domain in enumerate(domains):
+        groups[query_domain].append(i)
+
+    for query_domain, positions in groups.items():
+        config = CSV_CONFIG.get(query_domain, CSV_CONFIG["style"])
+        filepath = DATA_DIR / config["file"]
+        if not filepath.exists():
+            for i in positions:
+                responses[i] = {"error": f"File not found: {filepath}", "domain": query_domain}
+            continue
+
+        index = get_index(filepath, config["search_cols"])
+        bm25 = index["bm25"]
+        rankings = bm25.score_many([queries[i] for i in positions], top_k=max_results)
+        for i, ranked in zip(positions, rankings):
+            tokens = bm25.tokenize(queries[i])
+            if not ranked:
+                # Same misspelling fallback as search()
+                tokens = bm25.fuzzy_tokens(tokens, known_terms())
+                ranked = bm25.score_tokens(tokens, top_k=max_results)
+            results = _collect_results(index["data"], ranked, config["output_cols"])
+            responses[i] = {
+                "domain": query_domain,
+                "query": queries[i],
+                "file": config["file"],
+                "count": len(results),
+                "results": results,
+                "highlights": _collect_highlights(bm25, ranked, tokens, config["search_cols"], config["output_cols"])
+            }
+
+    return responses
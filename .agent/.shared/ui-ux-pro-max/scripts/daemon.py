@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Daemon - warm search server and thin client
+
+The server keeps the imports, fitted indexes and reasoning data resident and
+answers newline-delimited JSON requests over a Unix domain socket. The
+client forwards its command line unchanged, so it accepts every search.py
+option; when no daemon is running it falls back to an in-process search.
+A request that fails inside the daemon is answered with its error, and the
+daemon keeps serving; the client never re-runs it in-process.
+
+Usage:
+    python search.py --serve [--socket /tmp/uipro.sock]     # start the daemon
+    python daemon.py "<query>" [search.py options]           # thin client
+
+Protocol (one JSON object per line):
+    {"argv": ["fintech", "--domain", "color"], "cwd": "/path"}
+        -> {"ok": true, "output": "...", "elapsed_ms": 0.8}
+    {"op": "ping"}      -> {"ok": true, "pid": 1234}
+    {"op": "shutdown"}  -> {"ok": true}
+"""
+
+import json
+import os
+import socket
+import sys
+import tempfile
+import time
+
+# Fix Windows console encoding for Unicode output
+try:
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+except AttributeError:
+    pass  # Python < 3.7
+
+UNIX_SOCKETS_AVAILABLE = hasattr(socket, "AF_UNIX")
+CONNECT_TIMEOUT = 0.5
+REQUEST_TIMEOUT = 60
+
+
+class DaemonUnavailable(OSError):
+    """No daemon is listening on the socket; the request was never sent"""
+
+
+def default_socket_path():
+    """Socket path from $UIPRO_SOCKET, else a per-user file in the temp dir"""
+    uid = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    return os.environ.get("UIPRO_SOCKET") or os.path.join(tempfile.gettempdir(), f"ui-ux-pro-max-{uid}.sock")
+
+
+# ============ SERVER ============
+def _warm_up():
+    """Import the search stack and fit every configured index once"""
+    import search as search_cli
+    from core import CSV_CONFIG, STACK_CONFIG, _STACK_COLS, DATA_DIR, get_global_index, get_index
+
+    for config in CSV_CONFIG.values():
+        if (DATA_DIR / config["file"]).exists():
+            get_index(DATA_DIR / config["file"], config["search_cols"])
+    for config in STACK_CONFIG.values():
+        if (DATA_DIR / config["file"]).exists():
+            get_index(DATA_DIR / config["file"], _STACK_COLS["search_cols"])
+    get_global_index()
+    return search_cli
+
+
+def _handle(request, search_cli, parser):
+    """Answer one decoded request"""
+    import contextlib
+    import io
+
+    op = request.get("op", "search")
+    if op == "ping":
+        return {"ok": True, "pid": os.getpid()}
+    if op == "shutdown":
+        return {"ok": True}
+
+    stderr = io.StringIO()
+    try:
+        with contextlib.redirect_stderr(stderr):
+            args = parser.parse_args(request.get("argv", []))
+    except SystemExit:
+        return {"ok": False, "error": stderr.getvalue().strip()}
+    if args.serve:
+        return {"ok": False, "error": "--serve cannot be forwarded to a running daemon"}
+    if args.batch:
+        return {"ok": False, "error": "--batch streams its results; run it without the daemon"}
+
+    # Persisted files, traces and custom datasets belong next to the caller, not the daemon
+    cwd = request.get("cwd")
+    if cwd and args.persist:
+        args.output_dir = os.path.join(cwd, args.output_dir) if args.output_dir else cwd
+    if cwd and args.profile and args.profile != "-":
+        args.profile = os.path.join(cwd, args.profile)
+    if cwd and args.file:
+        args.file = os.path.join(cwd, args.file)
+    if cwd and args.discover_pages:
+        args.discover_pages = os.path.join(cwd, args.discover_pages)
+
+    try:
+        with contextlib.redirect_stderr(stderr):
+            output = search_cli.run(args, parser, request.get("argv", []))
+    except SystemExit as e:
+        return {"ok": False, "error": stderr.getvalue().strip() or str(e.code or "")}
+    except Exception as e:
+        # One failed request (unwritable --output-dir, bad --file, ...) must not take the daemon down
+        return {"ok": False, "error": f"Error: {type(e).__name__}: {e}"}
+    return {"ok": True, "output": output, "stderr": stderr.getvalue()}
+
+
+def serve(socket_path=None):
+    """Run the daemon until interrupted or asked to shut down"""
+    if not UNIX_SOCKETS_AVAILABLE:
+        raise SystemExit("Error: Unix domain sockets are not available on this platform")
+
+    socket_path = socket_path or default_socket_path()
+    if os.path.exists(socket_path):
+        if _ping(socket_path):
+            raise SystemExit(f"Error: a daemon is already listening on {socket_path}")
+        os.unlink(socket_path)  # stale socket from a crashed daemon
+
+    started = time.perf_counter()
+    search_cli = _warm_up()
+    parser = search_cli.build_parser()
+    print(f"Indexes loaded in {(time.perf_counter() - started) * 1000:.1f} ms", flush=True)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o077)  # owner-only socket
+    try:
+        server.bind(socket_path)
+    finally:
+        os.umask(old_umask)
+    server.listen(16)
+    print(f"Listening on {socket_path}", flush=True)
+
+    try:
+        running = True
+        while running:
+            conn, _ = server.accept()
+            try:
+                running = _serve_connection(conn, search_cli, parser)
+            except OSError as e:
+                # Client went away mid-reply; keep serving the others
+                print(f"Connection error: {e}", flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def _serve_connection(conn, search_cli, parser):
+    """Answer the requests of one connection; returns False after a shutdown request"""
+    with conn, conn.makefile("rwb") as stream:
+        for line in stream:
+            started = time.perf_counter()
+            request = {}
+            try:
+                decoded = json.loads(line)
+                if not isinstance(decoded, dict):
+                    raise ValueError("expected a JSON object")
+                request = decoded
+            except ValueError as e:
+                response = {"ok": False, "error": f"Invalid request: {e}"}
+            else:
+                try:
+                    response = _handle(request, search_cli, parser)
+                except Exception as e:
+                    response = {"ok": False, "error": f"Error: {type(e).__name__}: {e}"}
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            response["elapsed_ms"] = round(elapsed_ms, 3)
+            stream.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+            stream.flush()
+            print(f"{elapsed_ms:8.2f} ms  {request.get('op') or ' '.join(request.get('argv', []))}", flush=True)
+            if request.get("op") == "shutdown":
+                return False
+    return True
+
+
+# ============ CLIENT ============
+def request(payload, socket_path=None):
+    """Send one request to the daemon
+
+    Raises DaemonUnavailable when none is listening, and OSError / ValueError
+    when the request was sent but no valid reply came back.
+    """
+    if not UNIX_SOCKETS_AVAILABLE:
+        raise DaemonUnavailable("Unix domain sockets are not available on this platform")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(CONNECT_TIMEOUT)
+        try:
+            conn.connect(socket_path or default_socket_path())
+        except OSError as e:
+            raise DaemonUnavailable(str(e)) from e
+        conn.settimeout(REQUEST_TIMEOUT)
+        with conn.makefile("rwb") as stream:
+            stream.write(json.dumps(payload).encode("utf-8") + b"\n")
+            stream.flush()
+            line = stream.readline()
+    if not line:
+        raise OSError("Daemon closed the connection")
+    return json.loads(line)
+
+
+def _ping(socket_path):
+    try:
+        return request({"op": "ping"}, socket_path).get("ok", False)
+    except (OSError, ValueError):
+        return False
+
+
+def _socket_from_argv(argv):
+    """Extract --socket PATH / --socket=PATH from a search.py command line"""
+    for i, arg in enumerate(argv):
+        if arg == "--socket" and i + 1 < len(argv):
+            return argv[i + 1]
+        if arg.startswith("--socket="):
+            return arg.split("=", 1)[1]
+    return None
+
+
+def main(argv):
+    """Thin client: ask the daemon, fall back to searching in-process"""
+    started = time.perf_counter()
+    try:
+        response = request({"argv": argv, "cwd": os.getcwd()}, _socket_from_argv(argv))
+    except DaemonUnavailable:
+        response = None
+    except (OSError, ValueError) as e:
+        # The daemon got the request: re-running it here could repeat its side effects (--persist)
+        print(f"Error: daemon request failed: {e}", file=sys.stderr)
+        return 2
+
+    if response is not None:
+        round_trip_ms = (time.perf_counter() - started) * 1000
+        if not response.get("ok"):
+            print(response.get("error", "Error: daemon request failed"), file=sys.stderr)
+            return 2
+        print(response["output"])
+        if response.get("stderr"):
+            print(response["stderr"], end="", file=sys.stderr)
+        print(f"[ui-ux-pro-max] daemon: {round_trip_ms:.2f} ms round trip "
+              f"({response.get('elapsed_ms', 0):.2f} ms in daemon)", file=sys.stderr)
+        return 0
+
+    import search as search_cli
+    parser = search_cli.build_parser()
+    args = parser.parse_args(argv)
+    output = search_cli.run(args, parser)
+    if output is not None:
+        print(output)
+    print(f"[ui-ux-pro-max] no daemon running, searched in-process: "
+          f"{(time.perf_counter() - started) * 1000:.2f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Data Pack - compiled, memory-mapped BM25 indexes
+
+All CSV_CONFIG and STACK_CONFIG sources are compiled into a single binary
+file holding, per source: the sorted vocabulary, IDF table, postings
+(doc ids, term frequencies, precomputed weights), match positions, document
+norms and the output columns, plus the union vocabulary of all sources
+(core.known_terms()). core.get_index() opens it with mmap and reads straight from
+the mapping; the pack is rebuilt automatically when a source CSV changes.
+
+Usage:
+    python search.py --build-pack
+    python datapack.py [--output <pack file>]
+
+Layout:
+    magic (8s) | version (u32) | header length (u32) | JSON header | padding
+    body: 8-byte aligned arrays, offsets in the header are relative to body
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+from core import BM25, DATA_DIR, NUMPY_AVAILABLE, TOKENIZER_VERSION, _all_sources, _load_csv, file_mode, load_numpy
+
+# ============ CONFIGURATION ============
+PACK_FILE = DATA_DIR / "ui-ux-pro-max.pack"
+PACK_MAGIC = b"UIPMPACK"
+PACK_VERSION = 3
+_PREAMBLE = struct.Struct("<8sII")
+
+# Opened pack for this process (None until first use, False when unavailable)
+_PACK = None
+
+
+# ============ BUILD ============
+class _BodyWriter:
+    """Accumulates 8-byte aligned arrays and blobs for the pack body"""
+
+    def __init__(self):
+        self.body = bytearray()
+
+    def add(self, data):
+        """Append raw bytes, returning [offset, nbytes] relative to the body"""
+        self.body.extend(b"\0" * (-len(self.body) % 8))
+        offset = len(self.body)
+        self.body.extend(data)
+        return [offset, len(data)]
+
+
+def _add_vocab(writer, terms):
+    """Append a sorted term list as (term_offsets, term_blob) locations"""
+    term_offsets = array("I", [0])
+    term_blob = bytearray()
+    for term in terms:
+        term_blob.extend(term.encode("utf-8"))
+        term_offsets.append(len(term_blob))
+    return writer.add(term_offsets.tobytes()), writer.add(bytes(term_blob))
+
+
+def _compile_source(writer, filepath, search_cols, output_cols):
+    """Fit one CSV and append its arrays to the body; returns its header entry and terms"""
+    data = _load_csv(filepath)
+    bm25 = BM25(use_numpy=False, positional=True)
+    bm25.fit([str(row.get(col, "")) for col in search_cols] for row in data)
+
+    terms = sorted(bm25.postings, key=lambda term: term.encode("utf-8"))
+    idf = array("d")
+    post_ptr = array("I", [0])
+    doc_ids, tfs, weights = array("I"), array("I"), array("d")
+    # Per posting: range of (field, start, end) triples in positions
+    pos_ptr, positions = array("I", [0]), array("I")
+    k1_plus = bm25.k1 + 1
+    for term in terms:
+        term_idf = bm25.idf[term]
+        idf.append(term_idf)
+        term_docs, term_tfs = bm25.postings[term]
+        term_ptr, term_positions = bm25.positions[term]
+        for j, (idx, tf) in enumerate(zip(term_docs, term_tfs)):
+            doc_ids.append(idx)
+            tfs.append(tf)
+            # Same expression as BM25.score_tokens so packed scores are identical
+            weights.append(term_idf * (tf * k1_plus) / (tf + bm25.doc_norms[idx]))
+            positions.extend(term_positions[term_ptr[j]:term_ptr[j + 1]])
+            pos_ptr.append(len(positions))
+        post_ptr.append(len(doc_ids))
+
+    columns = [col for col in output_cols if data and col in data[0]]
+    cell_offsets = array("I", [0])
+    cell_nulls = array("B")
+    cell_blob = bytearray()
+    for row in data:
+        for col in columns:
+            # Short CSV rows leave trailing columns as None; keep that distinction
+            value = row.get(col)
+            cell_nulls.append(value is None)
+            cell_blob.extend(str(value or "").encode("utf-8"))
+            cell_offsets.append(len(cell_blob))
+
+    term_offsets, term_blob = _add_vocab(writer, terms)
+    entry = {
+        "search_cols": list(search_cols),
+        "columns": columns,
+        "n_docs": bm25.N,
+        "n_terms": len(terms),
+        "avgdl": bm25.avgdl,
+        "arrays": {
+            "term_offsets": term_offsets,
+            "term_blob": term_blob,
+            "idf": writer.add(idf.tobytes()),
+            "post_ptr": writer.add(post_ptr.tobytes()),
+            "doc_ids": writer.add(doc_ids.tobytes()),
+            "tfs": writer.add(tfs.tobytes()),
+            "weights": writer.add(weights.tobytes()),
+            "pos_ptr": writer.add(pos_ptr.tobytes()),
+            "positions": writer.add(positions.tobytes()),
+            "doc_lengths": writer.add(array("I", bm25.doc_lengths).tobytes()),
+            "doc_norms": writer.add(array("d", bm25.doc_norms).tobytes()),
+            "cell_offsets": writer.add(cell_offsets.tobytes()),
+            "cell_nulls": writer.add(cell_nulls.tobytes()),
+            "cell_blob": writer.add(bytes(cell_blob))
+        }
+    }
+    return entry, terms
+
+
+def build_pack(pack_path=PACK_FILE):
+    """Compile every configured CSV into one pack file (written atomically)"""
+    global _PACK
+    pack_path = Path(pack_path)
+    writer = _BodyWriter()
+    header = {
+        "byteorder": sys.byteorder,
+        "tokenizer": TOKENIZER_VERSION,
+        "k1": BM25().k1,
+        "b": BM25().b,
+        "sources": {}
+    }
+
+    vocabulary = set()
+    for name, file, search_cols, output_cols in _all_sources():
+        filepath = DATA_DIR / file
+        if not filepath.exists():
+            continue
+        entry, terms = _compile_source(writer, filepath, search_cols, output_cols)
+        entry["file"] = file
+        entry["mtime"] = filepath.stat().st_mtime_ns
+        header["sources"][name] = entry
+        vocabulary.update(terms)
+    header["vocabulary"] = _add_vocab(writer, sorted(vocabulary, key=lambda term: term.encode("utf-8")))
+
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    preamble = _PREAMBLE.pack(PACK_MAGIC, PACK_VERSION, len(header_bytes))
+    padding = b"\0" * (-(len(preamble) + len(header_bytes)) % 8)
+
+    import tempfile  # only builds write files; keeps it off the read path
+    mode = file_mode(pack_path)
+    fd, tmp_path = tempfile.mkstemp(dir=pack_path.parent, prefix=".pack-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(preamble)
+            f.write(header_bytes)
+            f.write(padding)
+            f.write(writer.body)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, pack_path)
+    except OSError:
+        os.unlink(tmp_path)
+        raise
+
+    _PACK = None
+    return {
+        "pack": str(pack_path),
+        "sources": len(header["sources"]),
+        "bytes": pack_path.stat().st_size
+    }
+
+
+# ============ READ ============
+class _PackVocab:
+    """Sorted vocabulary read from the mapping; lookups are binary searches"""
+
+    def __init__(self, offsets, blob):
+        self._offsets = offsets
+        self._blob = blob
+        self._len = len(offsets) - 1
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, i):
+        return bytes(self._blob[self._offsets[i]:self._offsets[i + 1]])
+
+    def find(self, term):
+        """Return the term id, or None when the term is not in the vocabulary"""
+        key = term.encode("utf-8")
+        i = bisect_left(self, key)
+        if i < self._len and self[i] == key:
+            return i
+        return None
+
+    def __contains__(self, term):
+        return self.find(term) is not None
+
+
+class _PackIdf:
+    """term -> IDF mapping over the packed vocabulary"""
+
+    def __init__(self, vocab, idf):
+        self._vocab = vocab
+        self._idf = idf
+
+    def __contains__(self, term):
+        return self._vocab.find(term) is not None
+
+    def __getitem__(self, term):
+        i = self._vocab.find(term)
+        if i is None:
+            raise KeyError(term)
+        return self._idf[i]
+
+    def __len__(self):
+        return len(self._vocab)
+
+
+class _PackPostings:
+    """term -> (doc ids, term frequencies) as zero-copy memoryview slices"""
+
+    def __init__(self, vocab, post_ptr, doc_ids, tfs):
+        self._vocab = vocab
+        self._post_ptr = post_ptr
+        self._doc_ids = doc_ids
+        self._tfs = tfs
+
+    def __contains__(self, term):
+        return self._vocab.find(term) is not None
+
+    def __getitem__(self, term):
+        i = self._vocab.find(term)
+        if i is None:
+            raise KeyError(term)
+        lo, hi = self._post_ptr[i], self._post_ptr[i + 1]
+        return self._doc_ids[lo:hi], self._tfs[lo:hi]
+
+    def __iter__(self):
+        for i in range(len(self._vocab)):
+            yield self._vocab[i].decode("utf-8")
+
+    def get(self, term, default=None):
+        """Term id lookup, used as the column map of the NumPy weight matrix"""
+        i = self._vocab.find(term)
+        return default if i is None else i
+
+    def __len__(self):
+        return len(self._vocab)
+
+
+class _PackPositions:
+    """term -> (per-posting pointers, position triples) over the mapping"""
+
+    def __init__(self, vocab, post_ptr, pos_ptr, positions):
+        self._vocab = vocab
+        self._post_ptr = post_ptr
+        self._pos_ptr = pos_ptr
+        self._positions = positions
+
+    def __getitem__(self, term):
+        i = self._vocab.find(term)
+        if i is None:
+            raise KeyError(term)
+        return self._pos_ptr[self._post_ptr[i]:self._post_ptr[i + 1] + 1], self._positions
+
+
+class _PackRows:
+    """Row sequence decoding output columns from the mapping on access"""
+
+    def __init__(self, columns, offsets, nulls, blob):
+        self._columns = columns
+        self._positions = {col: j for j, col in enumerate(columns)}
+        self._offsets = offsets
+        self._nulls = nulls
+        self._blob = blob
+        self._len = (len(offsets) - 1) // len(columns) if columns else 0
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, idx):
+        if not 0 <= idx < self._len:
+            raise IndexError(idx)
+        base = idx * len(self._columns)
+        offsets = self._offsets
+        return {
+            col: None if self._nulls[base + j] else str(self._blob[offsets[base + j]:offsets[base + j + 1]], "utf-8")
+            for j, col in enumerate(self._columns)
+        }
+
+    def record(self, idx, output_cols):
+        """Row idx restricted to output_cols, decoding only those cells"""
+        if not 0 <= idx < self._len:
+            raise IndexError(idx)
+        base = idx * len(self._columns)
+        offsets = self._offsets
+        record = {}
+        for col in output_cols:
+            if col in self._positions:
+                cell = base + self._positions[col]
+                record[col] = None if self._nulls[cell] else str(self._blob[offsets[cell]:offsets[cell + 1]], "utf-8")
+        return record
+
+
+class PackedBM25(BM25):
+    """BM25 index whose tables live in the memory-mapped pack"""
+
+    def __init__(self, pack, entry):
+        super().__init__(k1=pack.header["k1"], b=pack.header["b"], use_numpy=False)
+        arrays = entry["arrays"]
+        vocab = _PackVocab(pack.section(arrays["term_offsets"], "I"), pack.section(arrays["term_blob"]))
+        self.N = entry["n_docs"]
+        self.avgdl = entry["avgdl"]
+        self.doc_lengths = pack.section(arrays["doc_lengths"], "I")
+        self.doc_norms = pack.section(arrays["doc_norms"], "d")
+        self.idf = _PackIdf(vocab, pack.section(arrays["idf"], "d"))
+        self.postings = _PackPostings(vocab, pack.section(arrays["post_ptr"], "I"),
+                                      pack.section(arrays["doc_ids"], "I"), pack.section(arrays["tfs"], "I"))
+        self.positional = True
+        self.positions = _PackPositions(vocab, pack.section(arrays["post_ptr"], "I"),
+                                        pack.section(arrays["pos_ptr"], "I"), pack.section(arrays["positions"], "I"))
+        self.use_numpy = NUMPY_AVAILABLE
+        self._pack = pack
+        self._arrays = arrays
+
+    def _build_matrix(self):
+        """Weight matrix as zero-copy views of the packed postings (on first score_many)"""
+        np = load_numpy()
+        return {
+            "columns": self.postings,
+            "col_ptr": self._pack.np_section(self._arrays["post_ptr"], np.uint32).astype(np.int64),
+            "doc_ids": self._pack.np_section(self._arrays["doc_ids"], np.uint32),
+            "weights": self._pack.np_section(self._arrays["weights"], np.float64)
+        }
+
+    def fit(self, documents):
+        raise TypeError("PackedBM25 is read-only; rebuild the pack instead")
+
+
+class DataPack:
+    """An opened pack file"""
+
+    def __init__(self, pack_path):
+        with open(pack_path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.version, header_len = _PREAMBLE.unpack_from(self._mm, 0)
+        if magic != PACK_MAGIC:
+            raise ValueError(f"Unsupported pack file: {pack_path}")
+        start = _PREAMBLE.size
+        self.header = json.loads(bytes(self._mm[start:start + header_len]).decode("utf-8"))
+        if self.header["byteorder"] != sys.byteorder:
+            raise ValueError(f"Pack built for {self.header['byteorder']}-endian: {pack_path}")
+
+        self._body_offset = start + header_len + (-(start + header_len) % 8)
+        self._view = memoryview(self._mm)
+        data_dir = DATA_DIR.resolve()  # once, not per source: resolving is a realpath walk
+        self._by_file = {
+            (str(data_dir / entry["file"]), tuple(entry["search_cols"])): name
+            for name, entry in self.header["sources"].items()
+        }
+
+    def section(self, location, fmt=None):
+        """Zero-copy memoryview of a body section, optionally cast to an array format"""
+        offset, nbytes = location
+        start = self._body_offset + offset
+        part = self._view[start:start + nbytes]
+        return part.cast(fmt) if fmt else part
+
+    def np_section(self, location, dtype):
+        """Zero-copy NumPy array over a body section"""
+        offset, nbytes = location
+        np = load_numpy()
+        return np.frombuffer(self._mm, dtype=dtype, count=nbytes // np.dtype(dtype).itemsize,
+                             offset=self._body_offset + offset)
+
+    def source_for(self, filepath, search_cols):
+        """Name of the compiled source for a CSV + search columns, if any"""
+        return self._by_file.get((str(Path(filepath).resolve()), tuple(search_cols)))
+
+    def is_stale(self):
+        """True when the pack's layout or tokenizer is outdated
+
+        Source CSV mtimes are checked one source at a time, on first use
+        (packed_index), so opening the pack does not stat every CSV.
+        """
+        return self.version != PACK_VERSION or self.header.get("tokenizer") != TOKENIZER_VERSION
+
+    def vocabulary(self):
+        """Union vocabulary of all compiled sources"""
+        term_offsets, term_blob = self.header["vocabulary"]
+        return _PackVocab(self.section(term_offsets, "I"), self.section(term_blob))
+
+    def load(self, name):
+        """Index entry (as stored by core.get_index) for a compiled source"""
+        entry = self.header["sources"][name]
+        arrays = entry["arrays"]
+        rows = _PackRows(entry["columns"], self.section(arrays["cell_offsets"], "I"),
+                         self.section(arrays["cell_nulls"], "B"), self.section(arrays["cell_blob"]))
+        return {
+            "mtime": entry["mtime"],
+            "data": rows,
+            "bm25": PackedBM25(self, entry)
+        }
+
+
+def _open_pack(pack_path=PACK_FILE):
+    """Open the process-wide pack, rebuilding it first when a source CSV changed"""
+    global _PACK
+    if _PACK is not None:
+        return _PACK or None
+    if not Path(pack_path).exists():
+        _PACK = False
+        return None
+    try:
+        pack = DataPack(pack_path)
+        if pack.is_stale():
+            build_pack(pack_path)
+            pack = DataPack(pack_path)
+    except (OSError, ValueError):
+        pack = None
+    _PACK = pack or False
+    return pack
+
+
+def packed_index(filepath, search_cols, mtime):
+    """Index entry from the pack for a CSV, or None to fall back to parsing it"""
+    global _PACK
+    pack = _open_pack()
+    if pack is None:
+        return None
+    name = pack.source_for(filepath, search_cols)
+    if name is None:
+        return None
+    if pack.header["sources"][name]["mtime"] != mtime:
+        # Source edited while this process was running: rebuild and reopen
+        _PACK = None
+        try:
+            build_pack()
+        except OSError:
+            return None
+        pack = _open_pack()
+        if pack is None:
+            return None
+    return pack.load(name)
+
+
+def packed_vocabulary():
+    """Union vocabulary from the pack, or None when there is no pack or a source CSV changed since it was built"""
+    pack = _open_pack()
+    if pack is None:
+        return None
+    for entry in pack.header["sources"].values():
+        filepath = DATA_DIR / entry["file"]
+        if not filepath.exists() or filepath.stat().st_mtime_ns != entry["mtime"]:
+            return None
+    return pack.vocabulary()
+
+
+# ============ CLI SUPPORT ============
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build UI Pro Max data pack")
+    parser.add_argument("--output", "-o", type=str, default=str(PACK_FILE), help="Pack file path")
+
+    args = parser.parse_args()
+
+    summary = build_pack(args.output)
+    print(f"Built {summary['pack']}: {summary['sources']} sources, {summary['bytes']} bytes")
@@ -11,14 +11,21 @@ Usage:
     # With persistence (Master + Overrides pattern)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True, page="dashboard")
+
+    # Batch page overrides: one master, every page of the app
+    result = generate_design_system("SaaS dashboard", "My Project", persist=True, pages=discover_pages())
 """
 
-import csv
+import hashlib
 import json
 import os
+import re
+import tempfile
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from core import search, DATA_DIR
+from core import search_many, load_columns, ColumnStore, SearchPlan, DATA_DIR, file_mode
+import profiler
 
 
 # ============ CONFIGURATION ============
@@ -32,6 +39,100 @@ SEARCH_CONFIG = {
     "typography": {"max_results": 2}
 }
 
+# Searches behind each page override file
+PAGE_SEARCH_CONFIG = {
+    "style": {"max_results": 1},
+    "ux": {"max_results": 3},
+    "landing": {"max_results": 1}
+}
+
+# Page components scanned by discover_pages(), relative to the project root
+PAGES_DIR = "frontend/src/pages"
+PAGE_EXTENSIONS = (".tsx", ".jsx", ".ts", ".js")
+
+# Content hashes of the persisted files, per project folder
+MANIFEST_FILE = ".manifest.json"
+MANIFEST_VERSION = 1
+# The generation timestamp is left out of content hashes, or every run would be a change
+_TIMESTAMP_LINE = re.compile(r"^(> )?\*\*Generated:\*\* .*$", re.MULTILINE)
+
+
+# ============ REASONING INDEX ============
+class ReasoningIndex:
+    """
+    Prebuilt lookups over the reasoning rules, built once per load.
+
+    Resolves a category in the same three stages as a scan of the rule file:
+    exact UI_Category, then partial (either string contains the other), then
+    any UI_Category keyword inside the category. The first rule in file order
+    wins within a stage, so results match the scans while the cost depends
+    on the category's length, not on the number of rules.
+    """
+
+    def __init__(self, rules):
+        self.categories = []
+        self.decision_rules = []
+        self._exact = {}     # UI_Category -> first rule
+        self._keywords = {}  # UI_Category keyword -> first rule
+        self._trigrams = defaultdict(list)
+        self._resolved = {}
+        for i, rule in enumerate(rules):
+            ui_cat = (rule.get("UI_Category") or "").lower()
+            self.categories.append(ui_cat)
+            self._exact.setdefault(ui_cat, i)
+            for keyword in ui_cat.replace("/", " ").replace("-", " ").split():
+                self._keywords.setdefault(keyword, i)
+            for gram in {ui_cat[j:j + 3] for j in range(len(ui_cat) - 2)}:
+                self._trigrams[gram].append(i)
+            try:
+                self.decision_rules.append(json.loads(rule.get("Decision_Rules") or "{}"))
+            except json.JSONDecodeError:
+                self.decision_rules.append({})
+        self._exact_lengths = sorted({len(key) for key in self._exact})
+        self._keyword_lengths = sorted({len(key) for key in self._keywords})
+
+    def find(self, category: str):
+        """Index of the rule for a category, or None."""
+        key = category.lower()
+        if key not in self._resolved:
+            self._resolved[key] = self._resolve(key)
+        return self._resolved[key]
+
+    def _resolve(self, category: str):
+        exact = self._exact.get(category)
+        if exact is not None:
+            return exact
+        partial = [i for i in (self._first_substring(category, self._exact, self._exact_lengths),
+                                self._first_containing(category)) if i is not None]
+        if partial:
+            return min(partial)
+        return self._first_substring(category, self._keywords, self._keyword_lengths)
+
+    @staticmethod
+    def _first_substring(text: str, table: dict, lengths: list):
+        """Lowest rule index among the table keys that occur in text."""
+        best = None
+        for n in lengths:
+            if n > len(text):
+                break
+            for j in range(len(text) - n + 1):
+                i = table.get(text[j:j + n])
+                if i is not None and (best is None or i < best):
+                    best = i
+        return best
+
+    def _first_containing(self, text: str):
+        """Lowest rule index whose UI_Category contains text."""
+        if len(text) < 3:
+            # Too short for a trigram: scan
+            return next((i for i, ui_cat in enumerate(self.categories) if text in ui_cat), None)
+        postings = [self._trigrams.get(text[j:j + 3], ()) for j in range(len(text) - 2)]
+        # Candidates come in file order, from the rarest trigram
+        for i in min(postings, key=len):
+            if text in self.categories[i]:
+                return i
+        return None
+
 
 # ============ DESIGN SYSTEM GENERATOR ============
 class DesignSystemGenerator:
@@ -39,55 +140,41 @@ class DesignSystemGenerator:
 
     def __init__(self):
         self.reasoning_data = self._load_reasoning()
+        self.reasoning_index = ReasoningIndex(self.reasoning_data)
+        self.plan_stats = None  # SearchPlan.stats() of the last generate()
 
-    def _load_reasoning(self) -> list:
+    def _load_reasoning(self) -> ColumnStore:
         """Load reasoning rules from CSV."""
         filepath = DATA_DIR / REASONING_FILE
         if not filepath.exists():
             return []
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return list(csv.DictReader(f))
+        with profiler.phase("csv_load", file=REASONING_FILE):
+            return load_columns(filepath)
 
-    def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
-        """Execute searches across multiple domains."""
-        results = {}
+    def _multi_domain_search(self, query: str, style_priority: list = None, plan: SearchPlan = None) -> dict:
+        """Execute searches across multiple domains as one plan (duplicate lookups run once)."""
+        requests = []
         for domain, config in SEARCH_CONFIG.items():
             if domain == "style" and style_priority:
                 # For style, also search with priority keywords
                 priority_query = " ".join(style_priority[:2]) if style_priority else query
                 combined_query = f"{query} {priority_query}"
-                results[domain] = search(combined_query, domain, config["max_results"])
+                requests.append((domain, combined_query, config["max_results"]))
             else:
-                results[domain] = search(query, domain, config["max_results"])
-        return results
+                requests.append((domain, query, config["max_results"]))
+        responses = (plan or SearchPlan()).run(requests)
+        return {domain: response for (domain, _, _), response in zip(requests, responses)}
 
     def _find_reasoning_rule(self, category: str) -> dict:
-        """Find matching reasoning rule for a category."""
-        category_lower = category.lower()
-
-        # Try exact match first
-        for rule in self.reasoning_data:
-            if rule.get("UI_Category", "").lower() == category_lower:
-                return rule
-
-        # Try partial match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            if ui_cat in category_lower or category_lower in ui_cat:
-                return rule
-
-        # Try keyword match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            keywords = ui_cat.replace("/", " ").replace("-", " ").split()
-            if any(kw in category_lower for kw in keywords):
-                return rule
-
-        return {}
+        """Find matching reasoning rule for a category (exact, then partial, then keyword match)."""
+        idx = self.reasoning_index.find(category)
+        return {} if idx is None else self.reasoning_data[idx]
 
     def _apply_reasoning(self, category: str, search_results: dict) -> dict:
         """Apply reasoning rules to search results."""
-        rule = self._find_reasoning_rule(category)
+        with profiler.phase("reasoning_lookup", category=category):
+            idx = self.reasoning_index.find(category)
+            rule = {} if idx is None else self.reasoning_data[idx]
 
         if not rule:
             return {
@@ -101,12 +188,10 @@ class DesignSystemGenerator:
                 "severity": "MEDIUM"
             }
 
-        # Parse decision rules JSON
-        decision_rules = {}
-        try:
-            decision_rules = json.loads(rule.get("Decision_Rules", "{}"))
-        except json.JSONDecodeError:
-            pass
+        # Decision rules JSON is parsed once, when the index is built
+        decision_rules = self.reasoning_index.decision_rules[idx]
+        if isinstance(decision_rules, dict):
+            decision_rules = dict(decision_rules)
 
         return {
             "pattern": rule.get("Recommended_Pattern", ""),
@@ -162,8 +247,10 @@ class DesignSystemGenerator:
 
     def generate(self, query: str, project_name: str = None) -> dict:
         """Generate complete design system recommendation."""
+        plan = SearchPlan()
+
         # Step 1: First search product to get category
-        product_result = search(query, "product", 1)
+        product_result = plan.search(query, "product", 1)
         product_results = product_result.get("results", [])
         category = "General"
         if product_results:
@@ -173,9 +260,10 @@ class DesignSystemGenerator:
         reasoning = self._apply_reasoning(category, {})
         style_priority = reasoning.get("style_priority", [])
 
-        # Step 3: Multi-domain search with style priority hints
-        search_results = self._multi_domain_search(query, style_priority)
-        search_results["product"] = product_result  # Reuse product search
+        # Step 3: Multi-domain search with style priority hints (the product lookup is reused from step 1)
+        search_results = self._multi_domain_search(query, style_priority, plan)
+        search_results["product"] = product_result
+        self.plan_stats = plan.stats()
 
         # Step 4: Select best matches from each domain using priority
         style_results = self._extract_results(search_results.get("style", {}))
@@ -460,7 +548,8 @@ def format_markdown(design_system: dict) -> str:
 
 # ============ MAIN ENTRY POINT ============
 def generate_design_system(query: str, project_name: str = None, output_format: str = "ascii", 
-                           persist: bool = False, page: str = None, output_dir: str = None) -> str:
+                           persist: bool = False, page: str = None, output_dir: str = None,
+                           pages: list = None, persist_report: dict = None) -> str:
     """
     Main entry point for design system generation.
 
@@ -471,24 +560,35 @@ def generate_design_system(query: str, project_name: str = None, output_format:
         persist: If True, save design system to design-system/ folder
         page: Optional page name for page-specific override file
         output_dir: Optional output directory (defaults to current working directory)
+        pages: Optional list of page names to write override files for in one batch
+        persist_report: Optional dict, filled with the persist_design_system() result
 
     Returns:
         Formatted design system string
     """
-    generator = DesignSystemGenerator()
-    design_system = generator.generate(query, project_name)
+    with profiler.phase("generate") as info:
+        generator = DesignSystemGenerator()
+        design_system = generator.generate(query, project_name)
+        info["searches"] = generator.plan_stats
     
     # Persist to files if requested
     if persist:
-        persist_design_system(design_system, page, output_dir, query)
+        with profiler.phase("persist", page=page, pages=len(pages or [])) as info:
+            result = persist_design_system(design_system, page, output_dir, query, pages)
+            info["written"] = len(result["written"])
+            info["unchanged"] = len(result["unchanged"])
+        if persist_report is not None:
+            persist_report.update(result)
 
-    if output_format == "markdown":
-        return format_markdown(design_system)
-    return format_ascii_box(design_system)
+    with profiler.phase("format", format=output_format):
+        if output_format == "markdown":
+            return format_markdown(design_system)
+        return format_ascii_box(design_system)
 
 
 # ============ PERSISTENCE FUNCTIONS ============
-def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None) -> dict:
+def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None,
+                          pages: list = None) -> dict:
     """
     Persist design system to design-system/<project>/ folder using Master + Overrides pattern.
     
@@ -497,9 +597,16 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
         page: Optional page name for page-specific override file
         output_dir: Optional output directory (defaults to current working directory)
         page_query: Optional query string for intelligent page override generation
+        pages: Optional list of page names; their override searches run as one
+               batch per domain, and MASTER.md is written once for all of them
     
+    Files whose content (ignoring the generation timestamp) is unchanged are
+    left alone, so their mtimes do not trigger file watchers; changed files
+    are replaced atomically. Content hashes are kept in .manifest.json.
+
     Returns:
-        dict with created file paths and status
+        dict with status, created file paths (every file of the run) and the
+        written / unchanged subsets
     """
     base_dir = Path(output_dir) if output_dir else Path.cwd()
     
@@ -516,29 +623,118 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
     design_system_dir.mkdir(parents=True, exist_ok=True)
     pages_dir.mkdir(parents=True, exist_ok=True)
     
+    writer = _ManifestWriter(design_system_dir)
     master_file = design_system_dir / "MASTER.md"
     
     # Generate and write MASTER.md
     master_content = format_master_md(design_system)
-    with open(master_file, 'w', encoding='utf-8') as f:
-        f.write(master_content)
+    writer.write(master_file, master_content)
     created_files.append(str(master_file))
     
     # If page is specified, create page override file with intelligent content
-    if page:
+    if page and not pages:
         page_file = pages_dir / f"{page.lower().replace(' ', '-')}.md"
         page_content = format_page_override_md(design_system, page, page_query)
-        with open(page_file, 'w', encoding='utf-8') as f:
-            f.write(page_content)
+        writer.write(page_file, page_content)
         created_files.append(str(page_file))
     
+    # Batch mode: every page override from one set of batched searches
+    if pages:
+        page_names = ([page] if page else []) + list(pages)
+        for name, page_content in page_overrides(design_system, page_names, page_query).items():
+            page_file = pages_dir / f"{name.lower().replace(' ', '-')}.md"
+            writer.write(page_file, page_content)
+            created_files.append(str(page_file))
+    
+    writer.save()
     return {
         "status": "success",
         "design_system_dir": str(design_system_dir),
-        "created_files": created_files
+        "created_files": created_files,
+        "written": writer.written,
+        "unchanged": writer.unchanged
     }
 
 
+def _content_hash(content: str) -> str:
+    """SHA-256 of a generated file, without its generation timestamp."""
+    return hashlib.sha256(_TIMESTAMP_LINE.sub("", content).encode("utf-8")).hexdigest()
+
+
+def _write_atomic(path: Path, content: str):
+    """Write through a temp file in the same folder and rename it over path."""
+    mode = file_mode(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except OSError:
+        os.unlink(tmp_path)
+        raise
+
+
+class _ManifestWriter:
+    """Writes the files of one project folder, skipping those whose content hash is unchanged.
+
+    A manifest entry is trusted while the file's size and mtime still match it;
+    otherwise (file edited by hand, no manifest yet) the file on disk is hashed.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.path = root / MANIFEST_FILE
+        self.files = {}
+        try:
+            manifest = json.loads(self.path.read_text(encoding="utf-8"))
+            if manifest.get("version") == MANIFEST_VERSION:
+                self.files = manifest["files"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        self.changed = False
+        self.written = []
+        self.unchanged = []
+
+    def _disk_hash(self, path: Path, entry: dict):
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        if entry and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            return entry["hash"]
+        try:
+            return _content_hash(path.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def write(self, path: Path, content: str) -> bool:
+        """Write content to path unless it already holds it; True when the file was written."""
+        key = path.relative_to(self.root).as_posix()
+        entry = self.files.get(key)
+        digest = _content_hash(content)
+        written = self._disk_hash(path, entry) != digest
+        if written:
+            _write_atomic(path, content)
+            self.written.append(str(path))
+        else:
+            self.unchanged.append(str(path))
+
+        stat = path.stat()
+        new_entry = {"hash": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if new_entry != entry:
+            self.files[key] = new_entry
+            self.changed = True
+        return written
+
+    def save(self):
+        """Store the manifest when any entry changed."""
+        if self.changed:
+            manifest = {"version": MANIFEST_VERSION, "files": dict(sorted(self.files.items()))}
+            _write_atomic(self.path, json.dumps(manifest, indent=1) + "\n")
+            self.changed = False
+
+
 def format_master_md(design_system: dict) -> str:
     """Format design system as MASTER.md with hierarchical override logic."""
     project = design_system.get("project_name", "PROJECT")
@@ -802,14 +998,14 @@ def format_master_md(design_system: dict) -> str:
     return "\n".join(lines)
 
 
-def format_page_override_md(design_system: dict, page_name: str, page_query: str = None) -> str:
+def format_page_override_md(design_system: dict, page_name: str, page_query: str = None, searches: dict = None) -> str:
     """Format a page-specific override file with intelligent AI-generated content."""
     project = design_system.get("project_name", "PROJECT")
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     page_title = page_name.replace("-", " ").replace("_", " ").title()
     
     # Detect page type and generate intelligent overrides
-    page_overrides = _generate_intelligent_overrides(page_name, page_query, design_system)
+    page_overrides = _generate_intelligent_overrides(page_name, page_query, design_system, searches)
     
     lines = []
     
@@ -911,23 +1107,55 @@ def format_page_override_md(design_system: dict, page_name: str, page_query: str
     return "\n".join(lines)
 
 
-def _generate_intelligent_overrides(page_name: str, page_query: str, design_system: dict) -> dict:
+def _page_context(page_name: str, page_query: str = None) -> str:
+    """Search context of a page override: page name plus the project query."""
+    return f"{page_name.lower()} {(page_query or '').lower()}"
+
+
+def _batch_page_searches(contexts: list) -> list:
+    """PAGE_SEARCH_CONFIG searches for many page contexts, one batched pass per domain.
+
+    Returns one {domain: search response} dict per context; identical contexts
+    share their responses.
+    """
+    unique = list(dict.fromkeys(contexts))
+    by_domain = {
+        domain: dict(zip(unique, search_many(unique, domain, config["max_results"])))
+        for domain, config in PAGE_SEARCH_CONFIG.items()
+    }
+    return [{domain: responses[context] for domain, responses in by_domain.items()} for context in contexts]
+
+
+def page_overrides(design_system: dict, pages: list, page_query: str = None) -> dict:
+    """Override markdown for many pages of one design system, keyed by page name.
+
+    Duplicate names are dropped; the searches of all pages run as one batch per domain.
+    """
+    page_names = list(dict.fromkeys(pages))
+    batch = _batch_page_searches([_page_context(name, page_query) for name in page_names])
+    return {
+        name: format_page_override_md(design_system, name, page_query, searches)
+        for name, searches in zip(page_names, batch)
+    }
+
+
+def _generate_intelligent_overrides(page_name: str, page_query: str, design_system: dict, searches: dict = None) -> dict:
     """
     Generate intelligent overrides based on page type using layered search.
     
     Uses the existing search infrastructure to find relevant style, UX, and layout
-    data instead of hardcoded page types.
+    data instead of hardcoded page types. searches takes precomputed
+    PAGE_SEARCH_CONFIG responses (see _batch_page_searches).
     """
-    from core import search
-    
-    page_lower = page_name.lower()
-    query_lower = (page_query or "").lower()
-    combined_context = f"{page_lower} {query_lower}"
+    combined_context = _page_context(page_name, page_query)
     
-    # Search across multiple domains for page-specific guidance
-    style_search = search(combined_context, "style", max_results=1)
-    ux_search = search(combined_context, "ux", max_results=3)
-    landing_search = search(combined_context, "landing", max_results=1)
+    # Search across multiple domains for page-specific guidance, tokenizing the context once
+    if searches is None:
+        requests = [(domain, combined_context, config["max_results"]) for domain, config in PAGE_SEARCH_CONFIG.items()]
+        searches = dict(zip(PAGE_SEARCH_CONFIG, SearchPlan().run(requests)))
+    style_search = searches["style"]
+    ux_search = searches["ux"]
+    landing_search = searches["landing"]
     
     # Extract results from search response
     style_results = style_search.get("results", [])
@@ -1017,6 +1245,27 @@ def _generate_intelligent_overrides(page_name: str, page_query: str, design_syst
     }
 
 
+def discover_pages(pages_dir: str = PAGES_DIR) -> list:
+    """
+    Page names from the page components under pages_dir.
+
+    Every *Page.tsx/.jsx/.ts/.js file counts, in any subfolder; CrmPipelinePage.tsx
+    becomes "crm-pipeline". When two folders hold the same page name, later ones
+    are prefixed with their folder ("tech-settings").
+    """
+    root = Path(pages_dir)
+    files = sorted(path for path in root.rglob("*Page.*") if path.suffix in PAGE_EXTENSIONS and path.stem.endswith("Page"))
+    pages = []
+    for path in files:
+        name = re.sub(r"(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])", "-", path.stem[:-len("Page")]).lower()
+        if not name:
+            continue
+        if name in pages:
+            name = f"{path.parent.name.lower()}-{name}"
+        pages.append(name)
+    return pages
+
+
 def _detect_page_type(context: str, style_results: list) -> str:
     """Detect page type from context and search results."""
     context_lower = context.lower()
@@ -1055,13 +1304,23 @@ def _detect_page_type(context: str, style_results: list) -> str:
 # ============ CLI SUPPORT ============
 if __name__ == "__main__":
     import argparse
+    import sys
 
     parser = argparse.ArgumentParser(description="Generate Design System")
     parser.add_argument("query", help="Search query (e.g., 'SaaS dashboard')")
     parser.add_argument("--project-name", "-p", type=str, default=None, help="Project name")
     parser.add_argument("--format", "-f", choices=["ascii", "markdown"], default="ascii", help="Output format")
+    parser.add_argument("--profile", nargs="?", const="-", default=None, metavar="TRACE",
+                        help="Record per-phase wall time and allocations; write the trace to TRACE (default: stderr)")
+    parser.add_argument("--profile-format", choices=profiler.FORMATS, default="json", help="Trace format (json or chrome)")
 
     args = parser.parse_args()
 
-    result = generate_design_system(args.query, args.project_name, args.format)
+    if args.profile:
+        profiler.enable()
+    try:
+        result = generate_design_system(args.query, args.project_name, args.format)
+    finally:
+        if args.profile:
+            profiler.write_trace(profiler.disable(), args.profile, args.profile_format, sys.argv[1:])
     print(result)
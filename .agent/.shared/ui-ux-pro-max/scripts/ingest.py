@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Ingest - streaming BM25 indexes over large CSV catalogs
+
+Builds a BM25 index from a CSV one record at a time, for custom datasets
+too large to load as a list of dicts (product/service catalog exports,
+equipment model lists exported from the calibration spreadsheet). Only the
+postings and a compact table of record byte offsets stay in memory; result
+rows are read back from the file by offset when they are rendered.
+
+Usage:
+    python search.py "<query>" --file catalog.csv [--search-cols "Name,Description"]
+
+    from ingest import search_file
+    result = search_file("catalog.csv", "balança rodoviária", ["Modelo", "Descrição"])
+
+Excel exports are handled: a UTF-8 BOM is skipped, records that are not valid
+UTF-8 (Excel's "CSV" export on Windows writes cp1252) are decoded as cp1252,
+and the delimiter (, ; tab |) is detected from the header line.
+"""
+
+import csv
+from array import array
+from pathlib import Path
+
+import profiler
+from core import BM25, MAX_RESULTS, _collect_results
+
+# ============ CONFIGURATION ============
+ENCODING = "utf-8-sig"
+FALLBACK_ENCODING = "cp1252"
+DELIMITERS = [",", ";", "\t", "|"]
+
+# Streaming indexes, keyed on (file path, search columns) and validated against the file mtime
+_STREAM_CACHE = {}
+
+
+# ============ RECORD READER ============
+def _read_record(f):
+    """Raw bytes of the next CSV record, following quoted fields across line breaks"""
+    record = f.readline()
+    if not record:
+        return None
+    while record.count(b'"') % 2 == 1:
+        line = f.readline()
+        if not line:
+            break
+        record += line
+    return record
+
+
+def _decode(raw):
+    """Text of one raw record: UTF-8, or cp1252 when the bytes are not valid UTF-8"""
+    try:
+        return raw.decode(ENCODING)
+    except UnicodeDecodeError:
+        return raw.decode(FALLBACK_ENCODING, errors="replace")
+
+
+def _parse_record(raw, delimiter):
+    """Fields of one raw record"""
+    text = _decode(raw)
+    return next(csv.reader([text], delimiter=delimiter), [])
+
+
+def _detect_delimiter(header):
+    return max(DELIMITERS, key=header.count)
+
+
+def iter_records(filepath, delimiter=None):
+    """Yield the header fields, then (byte offset, fields) for every data record"""
+    with open(filepath, 'rb') as f:
+        raw = _read_record(f)
+        if raw is None:
+            return
+        header_text = _decode(raw)
+        delimiter = delimiter or _detect_delimiter(header_text)
+        yield delimiter, _parse_record(raw, delimiter)
+        while True:
+            offset = f.tell()
+            raw = _read_record(f)
+            if raw is None:
+                return
+            if raw.strip():
+                yield offset, _parse_record(raw, delimiter)
+
+
+class CsvRows:
+    """Read-only row sequence backed by record offsets into a CSV file
+
+    Indexing returns the row as a dict, like csv.DictReader would, read from
+    disk on demand; only the offsets (8 bytes per row) are held in memory.
+    """
+
+    def __init__(self, filepath, header, offsets, delimiter):
+        self.filepath = Path(filepath)
+        self.header = header
+        self.offsets = offsets
+        self.delimiter = delimiter
+        self._file = None
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, idx):
+        if self._file is None:
+            self._file = open(self.filepath, 'rb')
+        self._file.seek(self.offsets[idx])
+        fields = _parse_record(_read_record(self._file), self.delimiter)
+        row = dict(zip(self.header, fields))
+        # Short records get None for missing columns, as with csv.DictReader
+        for col in self.header[len(fields):]:
+            row[col] = None
+        return row
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# ============ STREAMING INDEX ============
+def _compact(bm25):
+    """Swap the fitted index's Python lists for typed arrays"""
+    bm25.doc_lengths = array('I', bm25.doc_lengths)
+    bm25.doc_norms = array('d', bm25.doc_norms)
+    bm25.postings = {term: (array('I', doc_ids), array('I', tfs)) for term, (doc_ids, tfs) in bm25.postings.items()}
+
+
+def fit_stream(filepath, search_cols=None, delimiter=None):
+    """Index a CSV in one streaming pass; returns an index entry like core.get_index()
+
+    search_cols defaults to every column. Raises ValueError for unknown columns.
+    """
+    filepath = Path(filepath)
+    mtime = filepath.stat().st_mtime_ns
+    records = iter_records(filepath, delimiter)
+    try:
+        delimiter, header = next(records)
+    except StopIteration:
+        header = []
+    search_cols = list(search_cols or header)
+    missing = [col for col in search_cols if col not in header]
+    if missing:
+        raise ValueError(f"Unknown column(s) in {filepath.name}: {', '.join(missing)}. Available: {', '.join(header)}")
+    positions = [header.index(col) for col in search_cols]
+
+    offsets = array('Q')
+
+    def documents():
+        for offset, fields in records:
+            offsets.append(offset)
+            yield " ".join(fields[i] for i in positions if i < len(fields))
+
+    with profiler.phase("fit", file=filepath.name, streaming=True):
+        # The numpy batch matrix would double the postings footprint
+        bm25 = BM25(use_numpy=False)
+        bm25.fit(documents())
+        _compact(bm25)
+
+    return {"mtime": mtime, "data": CsvRows(filepath, header, offsets, delimiter), "bm25": bm25,
+            "search_cols": search_cols}
+
+
+def stream_index(filepath, search_cols=None, delimiter=None):
+    """Cached streaming index for a CSV, rebuilt when the file changes"""
+    filepath = Path(filepath)
+    key = (str(filepath.resolve()), tuple(search_cols or ()))
+    entry = _STREAM_CACHE.get(key)
+    if entry is not None and entry["mtime"] == filepath.stat().st_mtime_ns:
+        return entry
+    if entry is not None:
+        entry["data"].close()
+    entry = fit_stream(filepath, search_cols, delimiter)
+    _STREAM_CACHE[key] = entry
+    return entry
+
+
+def search_file(filepath, query, search_cols=None, output_cols=None, max_results=MAX_RESULTS):
+    """Search a custom CSV dataset; result shaped like core.search()"""
+    filepath = Path(filepath)
+    if not filepath.exists():
+        return {"error": f"File not found: {filepath}", "domain": "file"}
+
+    try:
+        with profiler.phase("search", file=filepath.name):
+            index = stream_index(filepath, search_cols)
+            bm25 = index["bm25"]
+            with profiler.phase("tokenize"):
+                tokens = bm25.tokenize(query)
+            with profiler.phase("score", file=filepath.name):
+                ranked = bm25.score_tokens(tokens, top_k=max_results)
+                results = _collect_results(index["data"], ranked, output_cols or index["data"].header)
+    except ValueError as e:
+        return {"error": str(e), "domain": "file"}
+
+    return {
+        "domain": "file",
+        "query": query,
+        "file": filepath.name,
+        "count": len(results),
+        "results": results
+    }
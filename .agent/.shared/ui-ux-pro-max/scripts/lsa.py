@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max LSA - latent semantic ranking as a second engine next to BM25
+
+BM25 only matches exact tokens. Latent semantic analysis reduces each
+source's TF-IDF matrix with a truncated SVD, so documents and queries meet
+in a small concept space and "clean corporate look" can reach Minimalism
+without sharing a word. The reduction is computed offline (--build-lsa) and
+stored next to the data; a query is then one sparse fold-in and a small dense dot
+product, CPU-only and without network access. Requires NumPy.
+
+Usage:
+    python search.py "<query>" --domain style --engine lsa|hybrid
+    python search.py --build-lsa
+    python lsa.py [--output <model file>]
+
+Engines:
+    bm25    exact-token BM25 (default)
+    lsa     cosine similarity in the LSA space
+    hybrid  HYBRID_WEIGHT * BM25 (normalized to the best hit) + the rest * LSA similarity
+"""
+
+import json
+import os
+import tempfile
+from collections import Counter
+from math import log
+from pathlib import Path
+
+from core import BM25, DATA_DIR, NUMPY_AVAILABLE, TOKENIZER_VERSION, _all_sources, file_mode, load_columns
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+# ============ CONFIGURATION ============
+MODEL_FILE = DATA_DIR / "ui-ux-pro-max.lsa.npz"
+MODEL_VERSION = 1
+LSA_DIMS = 64           # upper bound on concepts per source
+LSA_DOCS_PER_DIM = 4    # keep about one concept per 4 documents, or nothing is merged
+LSA_MIN_SIMILARITY = 0.1
+HYBRID_WEIGHT = 0.5
+
+# Loaded models for this process: ((model file, mtime), stored header, models), None until first use
+_MODELS = None
+
+
+# ============ BUILD ============
+def _fit_source(filepath, search_cols, tokenizer):
+    """TF-IDF matrix of one CSV reduced by SVD to about one concept per LSA_DOCS_PER_DIM documents"""
+    documents = load_columns(filepath).documents(search_cols)
+    counts = [Counter(tokenizer.tokenize(doc)) for doc in documents]
+    vocab = sorted({term for doc_counts in counts for term in doc_counts})
+    term_ids = {term: i for i, term in enumerate(vocab)}
+
+    n_docs = len(documents)
+    df = Counter(term for doc_counts in counts for term in doc_counts)
+    idf = np.array([log((1 + n_docs) / (1 + df[term])) + 1 for term in vocab], dtype=np.float64)
+
+    matrix = np.zeros((n_docs, len(vocab)), dtype=np.float64)
+    for row, doc_counts in enumerate(counts):
+        for term, tf in doc_counts.items():
+            matrix[row, term_ids[term]] = (1 + log(tf)) * idf[term_ids[term]]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.where(norms == 0, 1, norms)
+
+    u, s, vt = np.linalg.svd(matrix, full_matrices=False)
+    dims = min(LSA_DIMS, max(2, n_docs // LSA_DOCS_PER_DIM), int(np.count_nonzero(s > 1e-10)))
+
+    # Document rows project to A V = U S; queries fold in as q V
+    doc_vectors = u[:, :dims] * s[:dims]
+    doc_norms = np.linalg.norm(doc_vectors, axis=1, keepdims=True)
+    doc_vectors /= np.where(doc_norms == 0, 1, doc_norms)
+    return {
+        "vocab": np.array(vocab, dtype=str),
+        "idf": idf,
+        "terms": vt[:dims].T.astype(np.float32),
+        "docs": doc_vectors.astype(np.float32)
+    }
+
+
+def build_models(model_path=MODEL_FILE):
+    """Fit every configured CSV and store the LSA models in one .npz file (written atomically)"""
+    global _MODELS
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("The LSA engine requires NumPy (pip install numpy)")
+
+    model_path = Path(model_path)
+    tokenizer = BM25(use_numpy=False)
+    header = {"version": MODEL_VERSION, "tokenizer": TOKENIZER_VERSION, "dims": [LSA_DIMS, LSA_DOCS_PER_DIM],
+              "sources": {}}
+    arrays = {}
+    for position, (name, file, search_cols, _) in enumerate(_all_sources()):
+        filepath = DATA_DIR / file
+        if not filepath.exists():
+            continue
+        key = f"s{position}"
+        for array_name, values in _fit_source(filepath, search_cols, tokenizer).items():
+            arrays[f"{key}_{array_name}"] = values
+        header["sources"][name] = {"key": key, "file": file, "search_cols": list(search_cols),
+                                   "mtime": filepath.stat().st_mtime_ns}
+
+    mode = file_mode(model_path)
+    fd, tmp_path = tempfile.mkstemp(dir=model_path.parent, prefix=".lsa-", suffix=".npz")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, header=np.array(json.dumps(header)), **arrays)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, model_path)
+    except OSError:
+        os.unlink(tmp_path)
+        raise
+
+    _MODELS = None
+    return {
+        "model": str(model_path),
+        "sources": len(header["sources"]),
+        "bytes": model_path.stat().st_size
+    }
+
+
+# ============ MODEL ============
+class LsaModel:
+    """LSA vectors of one source: term and document concept matrices"""
+
+    def __init__(self, vocab, idf, terms, docs):
+        self.term_ids = {term: i for i, term in enumerate(vocab.tolist())}
+        self.idf = idf
+        self.terms = terms
+        self.docs = docs
+
+    def similarities(self, query_tokens):
+        """Cosine similarity of every document to the query, or None when no term is known"""
+        counts = Counter(token for token in query_tokens if token in self.term_ids)
+        if not counts:
+            return None
+        ids = [self.term_ids[token] for token in counts]
+        weights = np.array([1 + log(tf) for tf in counts.values()]) * self.idf[ids]
+        query = weights @ self.terms[ids]
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return None
+        return self.docs @ (query / norm).astype(np.float32)
+
+    def rank(self, query_tokens, top_k=None):
+        """(doc id, similarity) pairs above LSA_MIN_SIMILARITY, best first"""
+        sims = self.similarities(query_tokens)
+        if sims is None:
+            return []
+        return _top(sims, np.flatnonzero(sims >= LSA_MIN_SIMILARITY), top_k)
+
+    def rank_hybrid(self, bm25, query_tokens, top_k=None):
+        """Blend of BM25 (scaled to the best hit) and LSA similarity, best first"""
+        sims = self.similarities(query_tokens)
+        scores = np.zeros(len(self.docs), dtype=np.float64)
+        matched = np.zeros(len(self.docs), dtype=bool)
+        if sims is not None:
+            scores += (1 - HYBRID_WEIGHT) * np.clip(sims, 0, None)
+            matched |= sims >= LSA_MIN_SIMILARITY
+        ranked = bm25.score_tokens(query_tokens)
+        if ranked:
+            ids = np.array([idx for idx, _ in ranked])
+            scores[ids] += HYBRID_WEIGHT * np.array([score for _, score in ranked]) / ranked[0][1]
+            matched[ids] = True
+        return _top(scores, np.flatnonzero(matched), top_k)
+
+
+def _top(scores, candidates, top_k):
+    """Highest scores first, ties broken by document order"""
+    order = candidates[np.argsort(-scores[candidates], kind="stable")]
+    if top_k is not None:
+        order = order[:top_k]
+    return [(int(idx), float(scores[idx])) for idx in order]
+
+
+def _is_stale(header):
+    if header.get("version") != MODEL_VERSION or header.get("tokenizer") != TOKENIZER_VERSION:
+        return True
+    if header.get("dims") != [LSA_DIMS, LSA_DOCS_PER_DIM]:
+        return True
+    for entry in header["sources"].values():
+        filepath = DATA_DIR / entry["file"]
+        if not filepath.exists() or filepath.stat().st_mtime_ns != entry["mtime"]:
+            return True
+    return False
+
+
+def _load_models(model_path=MODEL_FILE):
+    """All stored models by (resolved CSV path, search columns), or None when the file is missing or stale
+
+    Queries never write to the data directory: the models are only built by
+    build_models() (search.py --build-lsa). The source CSV mtimes are
+    checked on every call, so a long-lived process (daemon, batch workers)
+    stops using models whose doc ids no longer match the rows.
+    """
+    global _MODELS
+    model_path = Path(model_path)
+    try:
+        mtime = model_path.stat().st_mtime_ns
+    except OSError:
+        _MODELS = None
+        return None
+    if _MODELS is not None and _MODELS[0] == (model_path, mtime) and not _is_stale(_MODELS[1]):
+        return _MODELS[2]
+    _MODELS = None
+    with np.load(model_path, allow_pickle=False) as stored:
+        header = json.loads(str(stored["header"]))
+        if _is_stale(header):
+            return None
+        models = {}
+        for entry in header["sources"].values():
+            key = entry["key"]
+            model = LsaModel(stored[f"{key}_vocab"], stored[f"{key}_idf"],
+                             stored[f"{key}_terms"], stored[f"{key}_docs"])
+            filepath = str((DATA_DIR / entry["file"]).resolve())
+            models[(filepath, tuple(entry["search_cols"]))] = model
+    _MODELS = ((model_path, mtime), header, models)
+    return models
+
+
+def models_error():
+    """Error message when the stored models cannot be used, else None"""
+    if not NUMPY_AVAILABLE:
+        return "The LSA engine requires NumPy (pip install numpy)"
+    if _load_models() is None:
+        return ("The LSA models are missing or out of date (a CSV changed since they were built); "
+                "build them with: python search.py --build-lsa")
+    return None
+
+
+def get_model(filepath, search_cols):
+    """LSA model for a CSV + search columns, or None when it is not a modelled source
+
+    Raises RuntimeError when the models cannot be used (see models_error()).
+    """
+    models = _load_models() if NUMPY_AVAILABLE else None
+    if models is None:
+        raise RuntimeError(models_error())
+    return models.get((str(Path(filepath).resolve()), tuple(search_cols)))
+
+
+# ============ CLI SUPPORT ============
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build UI Pro Max LSA models")
+    parser.add_argument("--output", "-o", type=str, default=str(MODEL_FILE), help="Model file path")
+
+    args = parser.parse_args()
+
+    summary = build_models(args.output)
+    print(f"Built {summary['model']}: {summary['sources']} sources, {summary['bytes']} bytes")
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Profiler - phase-level wall time and allocations
+
+Code marks its phases with `with phase("fit"):`; this costs nothing unless a
+profiler is enabled. Each phase records wall time and, through tracemalloc,
+the memory it retained and its allocation peak. Phases nest; the summary
+reports total and self time per phase name.
+
+Phases: csv_load, pack_load, tokenize, fit, cache_lookup, score, search,
+        reasoning_lookup, generate, format, persist
+
+Usage:
+    python search.py "<query>" --design-system --profile                # JSON trace on stderr
+    python search.py "<query>" --profile trace.json --profile-format chrome
+    # Open Chrome traces in chrome://tracing or https://ui.perfetto.dev
+
+Allocation tracing slows the profiled run down; compare phase times within a
+trace rather than against unprofiled runs.
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# The running profiler, or None; checked by phase() on every call
+ACTIVE = None
+
+FORMATS = ["json", "chrome"]
+
+
+class _NullPhase:
+    """Shared no-op context used when profiling is off"""
+
+    def __enter__(self):
+        # Fresh args dict, so callers can annotate the phase unconditionally
+        return {}
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class Profiler:
+    """Collects nested phase events for one request"""
+
+    def __init__(self, trace_allocations=True):
+        self.trace_allocations = trace_allocations
+        self.events = []
+        self.totals = {}  # accumulated phases: name -> [seconds, calls]
+        self._stack = []
+        self._origin = None
+        self._owns_tracemalloc = False
+
+    def start(self):
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        self._origin = time.perf_counter()
+        return self
+
+    def stop(self):
+        self.elapsed = time.perf_counter() - self._origin
+        if self.trace_allocations:
+            self.peak_bytes = tracemalloc.get_traced_memory()[1]
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def _memory(self):
+        if not self.trace_allocations:
+            return 0, 0
+        return tracemalloc.get_traced_memory()
+
+    @contextmanager
+    def phase(self, name, **args):
+        # Peaks are tracked per frame: the tracemalloc peak is reset on entry
+        # and folded back into the parent on exit.
+        current, peak = self._memory()
+        if self._stack:
+            self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+        if self.trace_allocations and hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        frame = {"name": name, "args": args, "mem": current, "peak": current, "children": 0.0,
+                 "start": time.perf_counter()}
+        self._stack.append(frame)
+        try:
+            yield frame["args"]
+        finally:
+            duration = time.perf_counter() - frame["start"]
+            current, peak = self._memory()
+            frame["peak"] = max(frame["peak"], peak)
+            self._stack.pop()
+            if self._stack:
+                parent = self._stack[-1]
+                parent["peak"] = max(parent["peak"], frame["peak"])
+                parent["children"] += duration
+            event = {
+                "name": name,
+                "start_ms": round((frame["start"] - self._origin) * 1000, 3),
+                "duration_ms": round(duration * 1000, 3),
+                "self_ms": round((duration - frame["children"]) * 1000, 3),
+                "depth": len(self._stack)
+            }
+            if self.trace_allocations:
+                event["alloc_kb"] = round((current - frame["mem"]) / 1024, 1)
+                event["peak_kb"] = round((frame["peak"] - frame["mem"]) / 1024, 1)
+            if frame["args"]:
+                event["args"] = frame["args"]
+            self.events.append(event)
+
+    def accumulate(self, name, func):
+        """Wrap a hot function so its calls add up to one phase instead of one event each"""
+        totals = self.totals.setdefault(name, [0.0, 0])
+        stack = self._stack
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            started = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - started
+                totals[0] += elapsed
+                totals[1] += 1
+                if stack:
+                    stack[-1]["children"] += elapsed
+
+        return timed
+
+    def summary(self):
+        """Per phase name: calls, total and self time, retained allocations"""
+        summary = {}
+        for event in self.events:
+            entry = summary.setdefault(event["name"], {"calls": 0, "total_ms": 0.0, "self_ms": 0.0})
+            entry["calls"] += 1
+            entry["total_ms"] += event["duration_ms"]
+            entry["self_ms"] += event["self_ms"]
+            if "alloc_kb" in event:
+                entry["alloc_kb"] = entry.get("alloc_kb", 0.0) + event["alloc_kb"]
+                entry["peak_kb"] = max(entry.get("peak_kb", 0.0), event["peak_kb"])
+        for name, (seconds, calls) in self.totals.items():
+            entry = summary.setdefault(name, {"calls": 0, "total_ms": 0.0, "self_ms": 0.0})
+            entry["calls"] += calls
+            entry["total_ms"] += seconds * 1000
+            entry["self_ms"] += seconds * 1000
+        for entry in summary.values():
+            for key in ("total_ms", "self_ms", "alloc_kb"):
+                if key in entry:
+                    entry[key] = round(entry[key], 3)
+        return dict(sorted(summary.items(), key=lambda item: -item[1]["self_ms"]))
+
+    def report(self, command=None):
+        """Structured JSON trace"""
+        report = {
+            "command": command,
+            "total_ms": round(self.elapsed * 1000, 3),
+            "summary": self.summary(),
+            "events": sorted(self.events, key=lambda event: event["start_ms"])
+        }
+        if self.trace_allocations:
+            report["peak_alloc_kb"] = round(self.peak_bytes / 1024, 1)
+        return report
+
+    def chrome_trace(self, command=None):
+        """Chrome trace-event format (complete events, microseconds)"""
+        pid = os.getpid()
+        events = []
+        for event in sorted(self.events, key=lambda event: event["start_ms"]):
+            args = dict(event.get("args", {}))
+            for key in ("self_ms", "alloc_kb", "peak_kb"):
+                if key in event:
+                    args[key] = event[key]
+            events.append({
+                "name": event["name"],
+                "cat": "phase",
+                "ph": "X",
+                "ts": round(event["start_ms"] * 1000, 1),
+                "dur": round(event["duration_ms"] * 1000, 1),
+                "pid": pid,
+                "tid": 0,
+                "args": args
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms",
+                "otherData": {"command": command, "summary": self.summary()}}
+
+
+# ============ MODULE API ============
+def phase(name, **args):
+    """Context manager timing one phase of the active profiler, or a no-op"""
+    if ACTIVE is None:
+        return _NULL_PHASE
+    return ACTIVE.phase(name, **args)
+
+
+def enable(trace_allocations=True):
+    """Start a profiler and make it the active one"""
+    global ACTIVE
+    ACTIVE = Profiler(trace_allocations).start()
+    return ACTIVE
+
+
+def disable():
+    """Stop and return the active profiler"""
+    global ACTIVE
+    profiler, ACTIVE = ACTIVE, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+
+def write_trace(profiler, destination, trace_format="json", command=None):
+    """Write a finished profile to a file path, or to stderr for '-'"""
+    if trace_format == "chrome":
+        trace = profiler.chrome_trace(command)
+    else:
+        trace = profiler.report(command)
+    text = json.dumps(trace, indent=2, ensure_ascii=False)
+    if destination in (None, "-"):
+        print(text, file=sys.stderr)
+    else:
+        with open(destination, 'w', encoding='utf-8') as f:
+            f.write(text)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Result Cache - persistent search results across sessions
+
+Results are stored in a small SQLite file keyed by (source, normalized query
+tokens, max_results, dataset content hash). Editing a CSV changes its hash,
+so stale entries are never served and simply age out. The file is capped in
+size with least-recently-used eviction.
+
+Usage:
+    from core import set_result_cache
+    from result_cache import ResultCache
+    set_result_cache(ResultCache())   # search() / search_stack() now use it
+
+Location: $UIPRO_CACHE_DIR, else $XDG_CACHE_HOME/ui-ux-pro-max, else ~/.cache/ui-ux-pro-max
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+# ============ CONFIGURATION ============
+CACHE_FILE = "results.sqlite"
+MAX_BYTES = 16 * 1024 * 1024
+EVICT_TO = 0.9  # evict down to this fraction of MAX_BYTES
+
+
+def default_cache_dir():
+    """Cache directory from the environment, falling back to ~/.cache"""
+    if os.environ.get("UIPRO_CACHE_DIR"):
+        return Path(os.environ["UIPRO_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "ui-ux-pro-max"
+
+
+def make_key(source, tokens, max_results, dataset_hash):
+    """Cache key; token order is normalized, duplicates are kept (they weigh in BM25)"""
+    raw = json.dumps([source, sorted(tokens), max_results, dataset_hash], ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """SQLite-backed LRU cache of search result lists"""
+
+    def __init__(self, cache_dir=None, max_bytes=MAX_BYTES):
+        self.path = Path(cache_dir or default_cache_dir()) / CACHE_FILE
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._db = None
+
+    def _connect(self):
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.path), timeout=2)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("CREATE TABLE IF NOT EXISTS results ("
+                       "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+            db.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            db.commit()
+            self._db = db
+        return self._db
+
+    def _count(self, db, name):
+        db.execute("INSERT INTO stats (name, value) VALUES (?, 1) "
+                   "ON CONFLICT(name) DO UPDATE SET value = value + 1", (name,))
+
+    def get(self, key):
+        """Cached results for key, or None; cache errors count as a miss"""
+        try:
+            db = self._connect()
+            row = db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                self._count(db, "misses")
+                db.commit()
+                return None
+            db.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+            self._count(db, "hits")
+            db.commit()
+            return json.loads(row[0])
+        except (sqlite3.Error, OSError, ValueError):
+            self.misses += 1
+            return None
+
+    def put(self, key, results):
+        """Store results, evicting least recently used entries over the size cap"""
+        # Result rows may be mappings other than dict (core.Record)
+        value = json.dumps(results, ensure_ascii=False, default=dict)
+        try:
+            db = self._connect()
+            db.execute("INSERT OR REPLACE INTO results (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                       (key, value, len(value), time.time()))
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - int(self.max_bytes * EVICT_TO)
+                victims, freed = [], 0
+                for victim, size in db.execute("SELECT key, size FROM results ORDER BY last_used"):
+                    if freed >= excess:
+                        break
+                    victims.append((victim,))
+                    freed += size
+                db.executemany("DELETE FROM results WHERE key = ?", victims)
+            db.commit()
+        except (sqlite3.Error, OSError):
+            pass
+
+    def stats(self):
+        """Hit/miss counters for this process and cumulative for the cache file"""
+        totals = {"hits": 0, "misses": 0}
+        entries = 0
+        try:
+            db = self._connect()
+            totals.update(dict(db.execute("SELECT name, value FROM stats")))
+            entries = db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        except (sqlite3.Error, OSError):
+            pass
+        return {
+            "session_hits": self.hits,
+            "session_misses": self.misses,
+            "total_hits": totals["hits"],
+            "total_misses": totals["misses"],
+            "entries": entries
+        }
+
+    def clear(self):
+        """Remove every cached result and reset the counters"""
+        try:
+            db = self._connect()
+            db.execute("DELETE FROM results")
+            db.execute("DELETE FROM stats")
+            db.commit()
+        except (sqlite3.Error, OSError):
+            pass
+        self.hits = self.misses = 0
@@ -5,18 +5,116 @@ UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
 Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
        python search.py "<query>" --design-system [-p "Project Name"]
        python search.py "<query>" --design-system --persist [-p "Project Name"] [--page "dashboard"]
+       python search.py "<query>" --design-system --persist --pages "dashboard,settings" | --discover-pages
+       python search.py "<query>" --file catalog.csv [--search-cols "Name,Description"]
+       python search.py "<query>" --domain style --engine lsa|hybrid
+       python search.py --batch requests.jsonl [--workers 4] [--ordered]
+       python search.py --build-pack
+       python search.py --build-lsa
 
 Domains: style, prompt, color, chart, landing, product, ux, typography
+         all (every domain and stack in one pass, with the inferred domain distribution)
 Stacks: html-tailwind, react, nextjs
 
+Custom datasets:
+  --file        Search any CSV (e.g. a product catalog export) through a streaming index
+                that keeps only postings and row offsets in memory (see ingest.py)
+  --search-cols Comma-separated columns to index (default: all)
+
 Persistence (Master + Overrides pattern):
   --persist    Save design system to design-system/MASTER.md
   --page       Also create a page-specific override file in design-system/pages/
+  --pages      Comma-separated pages: all overrides from one master and batched searches
+  --discover-pages [DIR]  Same, for every *Page.tsx under DIR (default: frontend/src/pages)
+  Only files whose content changed are rewritten (atomically); the generation
+  timestamp does not count as a change. Hashes live in .manifest.json.
+
+Batch generation (see batch.py):
+  --batch FILE    One design system per {"query", "project_name", "pages"} JSONL line
+                  ('-' for stdin), generated across a process pool that shares the
+                  preloaded indexes; results stream as JSONL while they finish
+  --workers N     Pool size (default: CPU count)
+  --ordered       Write results in input order
+  --batch-output  Write the results to a file instead of stdout
+  With --persist the files of every request are written (under --output-dir)
+
+Ranking engines:
+  --engine bm25    Exact-token BM25 (default)
+  --engine lsa     Latent semantic similarity: matches related words without shared tokens
+  --engine hybrid  Blend of both
+  --build-lsa      Precompute the LSA models into data/ui-ux-pro-max.lsa.npz (NumPy;
+                   required by lsa/hybrid, re-run it after editing a CSV)
+
+Data pack:
+  --build-pack Compile all datasets into data/ui-ux-pro-max.pack (memory-mapped,
+               rebuilt automatically when a CSV changes)
+
+Score explanations:
+  --explain    Per returned row: IDF, TF, length normalization and contribution of
+               each query term, plus the words dropped by the tokenizer (bm25 only)
+
+Output:
+  Long field values are cut to a window around their best match; --json adds
+  "highlights", per result the [start, end] spans of query terms by column
+
+Result cache:
+  Results are cached across sessions in ~/.cache/ui-ux-pro-max/results.sqlite
+  ($UIPRO_CACHE_DIR to relocate); --no-cache bypasses it. --json shows hit/miss counters.
+
+Profiling:
+  --profile [TRACE]        Record wall time and allocations per phase (CSV load,
+                           tokenization, fit, scoring, reasoning lookup, formatting,
+                           persistence) as a JSON trace, to TRACE or stderr
+  --profile-format chrome  Emit Chrome trace events (chrome://tracing, Perfetto)
+
+Warm daemon:
+  --serve      Keep indexes resident and answer requests over a Unix domain socket;
+               query it with: python daemon.py "<query>" [same options as search.py]
 """
 
 import argparse
-from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack
-from design_system import generate_design_system, persist_design_system
+import sys
+import time
+
+import profiler
+from core import (CSV_CONFIG, AVAILABLE_STACKS, ENGINES, MAX_RESULTS, search, search_all, search_stack,
+                  get_result_cache, set_result_cache, json_default)
+from design_system import PAGES_DIR, discover_pages, generate_design_system, persist_design_system
+
+SNIPPET_CHARS = 300  # longer field values are cut to a window of this size
+SNIPPET_LEAD = 60    # context kept before the first match in the window
+
+
+def _window_start(spans, length):
+    """Start of the SNIPPET_CHARS window holding the most match spans (earliest on ties)"""
+    best, best_count, j = 0, 0, 0
+    for i, (start, _) in enumerate(spans):
+        j = max(j, i)
+        while j < len(spans) and spans[j][1] <= start + SNIPPET_CHARS:
+            j += 1
+        if j - i > best_count:
+            best, best_count = i, j - i
+    if best_count == 0:
+        return 0
+    first, last = spans[best][0], spans[best + best_count - 1][1]
+    lead = min(SNIPPET_LEAD, SNIPPET_CHARS - (last - first))
+    return max(0, min(first - lead, length - SNIPPET_CHARS))
+
+
+def _snippet(value, spans=None):
+    """Field value cut to SNIPPET_CHARS, windowed around its best-matching span"""
+    value_str = str(value)
+    if len(value_str) <= SNIPPET_CHARS:
+        return value_str
+    start = _window_start(spans, len(value_str)) if spans else 0
+    if start:
+        # Begin on a word boundary, without skipping the first match
+        first = min(span_start for span_start, _ in spans if span_start >= start)
+        space = value_str.find(" ", start, first)
+        if space != -1:
+            start = space + 1
+    end = start + SNIPPET_CHARS
+    return ("..." if start else "") + value_str[start:end] + ("..." if end < len(value_str) else "")
 
 
 def format_output(result):
@@ -24,6 +122,9 @@ def format_output(result):
     if "error" in result:
         return f"Error: {result['error']}"
 
+    if result.get("domain") == "all":
+        return _format_all_output(result)
+
     output = []
     if result.get("stack"):
         output.append(f"## UI Pro Max Stack Guidelines")
@@ -32,26 +133,73 @@ def format_output(result):
         output.append(f"## UI Pro Max Search Results")
         output.append(f"**Domain:** {result['domain']} | **Query:** {result['query']}")
     output.append(f"**Source:** {result['file']} | **Found:** {result['count']} results\n")
+    explanation = result.get("explain")
+    if explanation:
+        output.extend(_format_explain_header(explanation))
 
-    for i, row in enumerate(result['results'], 1):
+    highlights = result.get("highlights") or [{}] * len(result['results'])
+    for i, (row, spans) in enumerate(zip(result['results'], highlights), 1):
         output.append(f"### Result {i}")
         for key, value in row.items():
-            value_str = str(value)
-            if len(value_str) > 300:
-                value_str = value_str[:300] + "..."
-            output.append(f"- **{key}:** {value_str}")
+            output.append(f"- **{key}:** {_snippet(value, spans.get(key))}")
+        if explanation:
+            output.extend(_format_explain_row(explanation["rows"][i - 1]))
         output.append("")
 
     return "\n".join(output)
 
 
-if __name__ == "__main__":
+def _format_explain_header(explanation):
+    """Ranking parameters and query terms of an explained search"""
+    output = [f"**BM25:** k1 {explanation['k1']}, b {explanation['b']}, avgdl {explanation['avgdl']}, "
+              f"{explanation['docs']} docs | **Search columns:** {', '.join(explanation['search_cols'])}"]
+    terms = f"**Terms:** {', '.join(explanation['tokens']) or 'none'}"
+    if explanation["dropped"]:
+        terms += f" | **Dropped (too short or stopword):** {', '.join(explanation['dropped'])}"
+    if explanation["unknown"]:
+        terms += f" | **Not in index:** {', '.join(explanation['unknown'])}"
+    output.append(terms + "\n")
+    return output
+
+
+def _format_explain_row(row):
+    """Score breakdown of one result"""
+    output = [f"- **Score:** {row['score']} (length {row['doc_length']}, norm {row['norm']})"]
+    for term in row["terms"]:
+        output.append(f"  - {term['term']}: idf {term['idf']} x tf {term['tf']} -> {term['contribution']}")
+    return output
+
+
+def _format_all_output(result):
+    """Format cross-domain results with their source and normalized score"""
+    output = [f"## UI Pro Max Search Results (all domains)"]
+    output.append(f"**Query:** {result['query']} | **Found:** {result['count']} results")
+    distribution = ", ".join(f"{name} {share:.0%}" for name, share in list(result["distribution"].items())[:5])
+    output.append(f"**Domains:** {distribution or 'no match'}\n")
+
+    for i, hit in enumerate(result['results'], 1):
+        output.append(f"### Result {i} ({hit['source']}, score {hit['score']:.2f})")
+        spans = hit.get("highlights", {})
+        for key, value in hit['row'].items():
+            output.append(f"- **{key}:** {_snippet(value, spans.get(key))}")
+        output.append("")
+
+    return "\n".join(output)
+
+
+def build_parser():
+    """Command-line parser shared by the CLI and the search daemon"""
     parser = argparse.ArgumentParser(description="UI Pro Max Search")
-    parser.add_argument("query", help="Search query")
-    parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()), help="Search domain")
+    parser.add_argument("query", nargs="?", help="Search query")
+    parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()) + ["all"], help="Search domain ('all' searches every domain and stack at once)")
     parser.add_argument("--stack", "-s", choices=AVAILABLE_STACKS, help="Stack-specific search (html-tailwind, react, nextjs)")
     parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS, help="Max results (default: 3)")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--engine", "-e", choices=ENGINES, default="bm25", help="Ranker for domain and stack searches (default: bm25)")
+    parser.add_argument("--explain", action="store_true", help="Show the BM25 score breakdown of every result (domain and stack searches)")
+    # Custom datasets
+    parser.add_argument("--file", type=str, default=None, help="Search a custom CSV dataset instead of the bundled ones")
+    parser.add_argument("--search-cols", type=str, default=None, help="Comma-separated columns of --file to index (default: all)")
     # Design system generation
     parser.add_argument("--design-system", "-ds", action="store_true", help="Generate complete design system recommendation")
     parser.add_argument("--project-name", "-p", type=str, default=None, help="Project name for design system output")
@@ -59,48 +207,172 @@ if __name__ == "__main__":
     # Persistence (Master + Overrides pattern)
     parser.add_argument("--persist", action="store_true", help="Save design system to design-system/MASTER.md (creates hierarchical structure)")
     parser.add_argument("--page", type=str, default=None, help="Create page-specific override file in design-system/pages/")
+    parser.add_argument("--pages", type=str, default=None, help="Comma-separated pages to create override files for in one batch")
+    parser.add_argument("--discover-pages", nargs="?", const=PAGES_DIR, default=None, metavar="DIR",
+                        help=f"Create override files for every page component under DIR (default: {PAGES_DIR})")
     parser.add_argument("--output-dir", "-o", type=str, default=None, help="Output directory for persisted files (default: current directory)")
+    # Batch generation
+    parser.add_argument("--batch", type=str, default=None, metavar="FILE",
+                        help="Generate design systems for every JSONL request line of FILE ('-' for stdin)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for --batch (default: CPU count)")
+    parser.add_argument("--ordered", action="store_true", help="Write --batch results in input order")
+    parser.add_argument("--batch-output", type=str, default=None, metavar="FILE",
+                        help="Write --batch results to FILE instead of stdout")
+    # Data pack
+    parser.add_argument("--build-pack", action="store_true", help="Compile all datasets into a memory-mapped pack file")
+    parser.add_argument("--build-lsa", action="store_true", help="Precompute the LSA models used by --engine lsa/hybrid")
+    # Warm daemon
+    parser.add_argument("--serve", action="store_true", help="Run as a warm search daemon on a Unix domain socket")
+    parser.add_argument("--socket", type=str, default=None, help="Daemon socket path (default: $UIPRO_SOCKET or a per-user temp file)")
+    # Result cache
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the persistent result cache")
+    # Profiling
+    parser.add_argument("--profile", nargs="?", const="-", default=None, metavar="TRACE",
+                        help="Record per-phase wall time and allocations; write the trace to TRACE (default: stderr)")
+    parser.add_argument("--profile-format", choices=profiler.FORMATS, default="json", help="Trace format (json or chrome)")
+    return parser
 
-    args = parser.parse_args()
+
+def run(args, parser=None, argv=None):
+    """Execute a parsed command and return its output text"""
+    if not args.profile:
+        return _run(args, parser)
+
+    profiler.enable()
+    try:
+        return _run(args, parser)
+    finally:
+        profiler.write_trace(profiler.disable(), args.profile, args.profile_format,
+                             sys.argv[1:] if argv is None else argv)
+
+
+def _run(args, parser):
+    if args.build_pack:
+        from datapack import build_pack
+        summary = build_pack()
+        return f"Built {summary['pack']}: {summary['sources']} sources, {summary['bytes']} bytes"
+
+    if args.build_lsa:
+        from lsa import build_models
+        summary = build_models()
+        return f"Built {summary['model']}: {summary['sources']} sources, {summary['bytes']} bytes"
+
+    if args.batch:
+        return _run_batch(args)
+
+    if args.query is None:
+        (parser or build_parser()).error("the following arguments are required: query")
+    if args.engine != "bm25" and (args.design_system or args.file or args.domain == "all"):
+        (parser or build_parser()).error("--engine applies to --domain and --stack searches only")
+    if args.explain and (args.design_system or args.file or args.domain == "all" or args.engine != "bm25"):
+        (parser or build_parser()).error("--explain applies to bm25 --domain and --stack searches only")
+
+    if args.no_cache:
+        set_result_cache(None)
+    elif get_result_cache() is None:
+        from result_cache import ResultCache
+        set_result_cache(ResultCache())
+
+    pages = None
+    if args.pages or args.discover_pages:
+        if not (args.design_system and args.persist):
+            (parser or build_parser()).error("--pages and --discover-pages require --design-system --persist")
+        pages = [page.strip() for page in args.pages.split(",") if page.strip()] if args.pages else []
+        if args.discover_pages:
+            pages += discover_pages(args.discover_pages)
+        if not pages:
+            return f"No pages found{' under ' + args.discover_pages if args.discover_pages else ''}"
 
     # Design system takes priority
     if args.design_system:
-        result = generate_design_system(
-            args.query, 
-            args.project_name, 
+        started = time.perf_counter()
+        persisted = {}
+        output = [generate_design_system(
+            args.query,
+            args.project_name,
             args.format,
             persist=args.persist,
             page=args.page,
-            output_dir=args.output_dir
-        )
-        print(result)
-        
-        # Print persistence confirmation
+            output_dir=args.output_dir,
+            pages=pages,
+            persist_report=persisted
+        )]
+        elapsed = time.perf_counter() - started
+
+        # Persistence confirmation
         if args.persist:
             project_slug = args.project_name.lower().replace(' ', '-') if args.project_name else "default"
-            print("\n" + "=" * 60)
-            print(f"✅ Design system persisted to design-system/{project_slug}/")
-            print(f"   📄 design-system/{project_slug}/MASTER.md (Global Source of Truth)")
-            if args.page:
+            output.append("\n" + "=" * 60)
+            output.append(f"✅ Design system persisted to design-system/{project_slug}/")
+            output.append(f"   📄 design-system/{project_slug}/MASTER.md (Global Source of Truth)")
+            if pages:
+                count = len(set(([args.page] if args.page else []) + pages))
+                output.append(f"   📄 design-system/{project_slug}/pages/*.md ({count} Page Overrides, "
+                              f"{elapsed:.2f}s, {count / elapsed:.1f} pages/s)")
+            elif args.page:
                 page_filename = args.page.lower().replace(' ', '-')
-                print(f"   📄 design-system/{project_slug}/pages/{page_filename}.md (Page Overrides)")
-            print("")
-            print(f"📖 Usage: When building a page, check design-system/{project_slug}/pages/[page].md first.")
-            print(f"   If exists, its rules override MASTER.md. Otherwise, use MASTER.md.")
-            print("=" * 60)
+                output.append(f"   📄 design-system/{project_slug}/pages/{page_filename}.md (Page Overrides)")
+            output.append(f"   {len(persisted['written'])} written, {len(persisted['unchanged'])} unchanged "
+                          f"(content hashes in design-system/{project_slug}/.manifest.json)")
+            output.append("")
+            output.append(f"📖 Usage: When building a page, check design-system/{project_slug}/pages/[page].md first.")
+            output.append(f"   If exists, its rules override MASTER.md. Otherwise, use MASTER.md.")
+            output.append("=" * 60)
+        return "\n".join(output)
+
+    # Custom dataset search
+    if args.file:
+        from ingest import search_file
+        search_cols = [col.strip() for col in args.search_cols.split(",")] if args.search_cols else None
+        result = search_file(args.file, args.query, search_cols, max_results=args.max_results)
     # Stack search
     elif args.stack:
-        result = search_stack(args.query, args.stack, args.max_results)
-        if args.json:
-            import json
-            print(json.dumps(result, indent=2, ensure_ascii=False))
-        else:
-            print(format_output(result))
+        result = search_stack(args.query, args.stack, args.max_results, args.engine, args.explain)
+    # Cross-domain search
+    elif args.domain == "all":
+        result = search_all(args.query, args.max_results)
     # Domain search
     else:
-        result = search(args.query, args.domain, args.max_results)
+        result = search(args.query, args.domain, args.max_results, args.engine, args.explain)
+
+    with profiler.phase("format"):
         if args.json:
             import json
-            print(json.dumps(result, indent=2, ensure_ascii=False))
-        else:
-            print(format_output(result))
+            return json.dumps(result, indent=2, ensure_ascii=False, default=json_default)
+        return format_output(result)
+
+
+def _run_batch(args):
+    """Stream --batch results; the summary goes to stderr when the results go to stdout"""
+    from batch import run_batch
+
+    source = sys.stdin if args.batch == "-" else open(args.batch, "r", encoding="utf-8")
+    out = open(args.batch_output, "w", encoding="utf-8") if args.batch_output else sys.stdout
+    try:
+        summary = run_batch(source, out, args.workers, args.ordered, args.persist, args.output_dir,
+                            cache=not args.no_cache)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+
+    message = (f"{summary['requests']} requests ({summary['errors']} failed) with {summary['workers']} workers "
+               f"in {summary['seconds']:.2f}s, {summary['per_second']:.1f} requests/s")
+    if out is sys.stdout:
+        print(message, file=sys.stderr)
+        return None
+    return message
+
+
+if __name__ == "__main__":
+    parser = build_parser()
+    args = parser.parse_args()
+
+    if args.serve:
+        from daemon import serve
+        serve(args.socket)
+    else:
+        output = run(args, parser)
+        if output is not None:
+            print(output)
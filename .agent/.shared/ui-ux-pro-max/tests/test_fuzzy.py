@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Regression tests for the misspelling fallback of the search engine
+
+Run from the repository root:
+    python -m pytest .agent/.shared/ui-ux-pro-max/tests
+    python -m unittest discover .agent/.shared/ui-ux-pro-max/tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from core import BM25, TrigramIndex, known_terms, search  # noqa: E402
+from design_system import generate_design_system  # noqa: E402
+
+# Real words of 3-4 letters, each one edit away from some dataset term
+SHORT_WORDS = ["lab", "spa", "gym", "pet", "car", "tea", "bar", "art", "shop", "farm", "golf", "bank"]
+
+
+class ShortWordTests(unittest.TestCase):
+    def test_short_words_are_not_expanded(self):
+        index = TrigramIndex(["law", "spam", "gem", "pen", "card", "team", "bag", "arts", "ship", "form", "gold", "band"])
+        for word in SHORT_WORDS:
+            self.assertEqual(index.expand(word), [], word)
+
+    def test_short_words_are_left_alone(self):
+        bm25 = BM25(use_numpy=False)
+        bm25.fit(["law firm", "legal services"])
+        corrected = bm25.fuzzy_tokens(["lab", "equipment"], known_terms())
+        self.assertNotIn("law", corrected)
+
+    def test_misspellings_are_still_corrected(self):
+        bm25 = BM25(use_numpy=False)
+        bm25.fit(["glassmorphism frosted glass", "brutalism raw"])
+        self.assertEqual(bm25.fuzzy_tokens(["glasmorphism"]), ["glassmorphism"])
+
+    def test_calibration_lab_is_not_a_law_firm(self):
+        output = generate_design_system("calibration lab equipment", "Lab")
+        self.assertNotIn("Trust & Authority", output)
+        self.assertNotIn("EB Garamond", output)
+
+    def test_lab_query_finds_no_law_rows(self):
+        result = search("lab", "product", 3)
+        self.assertFalse(any("law" in str(row).lower() for row in result["results"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
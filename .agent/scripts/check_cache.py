@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Check Result Cache - Antigravity Kit
+=====================================
+
+Replays the result of a validation script when nothing it reads has changed.
+Used by checklist.py and verify_all.py (disable with --no-cache).
+
+A result is keyed by the SHA-256 of:
+    - the check script itself
+    - its command-line arguments
+    - the content hashes of the project files the check reads (CHECK_INPUTS)
+    - for the lint and test runners, the installed toolchain (toolchain_signature)
+
+Checks given a URL (Lighthouse, Playwright) test a live server and are never
+cached, nor are timeouts and crashes. Entries expire after CACHE_TTL, since
+some scanners also consult state outside the tree (npm audit advisories,
+installed linters and test tools).
+
+File content hashes come from the run's file manifest (file_manifest.py),
+which is kept in the cache directory as well.
+
+Location: --cache-dir, else $ANTIGRAVITY_CACHE_DIR, else
+$XDG_CACHE_HOME/antigravity-kit/checks, else ~/.cache/antigravity-kit/checks
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from file_manifest import content_hashes, file_mode, hash_file
+
+CACHE_TTL = 24 * 60 * 60  # seconds
+
+# Suffixes each script reads, by script file name. Scripts not listed here
+# (and those mapped to None) depend on every file: the lint and test runners
+# invoke project tooling whose configuration can live anywhere in the tree.
+CHECK_INPUTS = {
+    "security_scan.py": {'.js', '.ts', '.jsx', '.tsx', '.py', '.go', '.java', '.rb', '.php',
+                         '.json', '.yaml', '.yml', '.toml', '.env', '.local', '.development', '.lock',
+                         '.mjs', '.conf', '.txt'},  # next.config.mjs, nginx.conf, requirements.txt
+    "lint_runner.py": None,
+    "test_runner.py": None,
+    "type_coverage.py": {'.ts', '.tsx', '.py'},
+    "schema_validator.py": {'.prisma', '.ts'},
+    "ux_audit.py": {'.tsx', '.jsx', '.html', '.vue', '.svelte', '.css'},
+    "accessibility_checker.py": {'.html', '.jsx', '.tsx'},
+    "seo_checker.py": {'.html', '.htm', '.jsx', '.tsx'},
+    "geo_checker.py": {'.html', '.htm', '.jsx', '.tsx'},
+    "mobile_audit.py": {'.tsx', '.ts', '.jsx', '.js', '.dart'},
+    "i18n_checker.py": {'.json', '.po', '.tsx', '.jsx', '.ts', '.js', '.vue', '.py'},
+}
+
+# Scripts that run the project's installed tools, which the manifest does not
+# see (node_modules is never listed, global tools live outside the tree)
+TOOLCHAIN_CHECKS = {"lint_runner.py", "test_runner.py"}
+
+# Rewritten by npm, yarn 1, yarn berry and pnpm on every install or upgrade
+NODE_INSTALL_STATE = ["node_modules/.package-lock.json", "node_modules/.yarn-integrity",
+                      "node_modules/.yarn-state.yml", "node_modules/.modules.yaml"]
+
+# Commands the runners resolve from PATH; package managers replace them on upgrade
+TOOL_COMMANDS = ["node", "npm", "npx", "python", "ruff", "mypy", "pytest"]
+
+
+def default_cache_dir() -> Path:
+    """Cache directory from the environment, falling back to ~/.cache"""
+    if os.environ.get("ANTIGRAVITY_CACHE_DIR"):
+        return Path(os.environ["ANTIGRAVITY_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "antigravity-kit" / "checks"
+
+
+def toolchain_signature(project_path: Path) -> Optional[str]:
+    """
+    Hash of the installed toolchain, or None when it cannot be tracked
+
+    Covers the node_modules install state and the PATH executables of
+    TOOL_COMMANDS (path, size, mtime). A node_modules without any known
+    install state file gives None: its upgrades would go unnoticed.
+    """
+    digest = hashlib.sha256()
+    node_modules = Path(project_path) / "node_modules"
+    if node_modules.is_dir():
+        states = [Path(project_path) / name for name in NODE_INSTALL_STATE
+                  if (Path(project_path) / name).is_file()]
+        if not states:
+            return None
+        for state in states:
+            digest.update(f"{state.name}\0{hash_file(state)}\n".encode())
+    for tool in TOOL_COMMANDS:
+        location = shutil.which(tool)
+        if location:
+            stat = os.stat(location)
+            digest.update(f"{tool}\0{location}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def manifest_path(project_path: Path, cache_dir: Optional[str] = None) -> Path:
+    """Where the file manifest of a project is kept between runs"""
+    root = str(Path(project_path).resolve())
+    name = f"manifest-{hashlib.sha256(root.encode()).hexdigest()[:16]}.json"
+    return (Path(cache_dir) if cache_dir else default_cache_dir()) / name
+
+
+class CheckCache:
+    """Content-addressed store of check results for one project"""
+
+    def __init__(self, manifest: dict, cache_dir: Optional[str] = None):
+        self.dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.files = content_hashes(manifest)  # relative path -> content hash
+        self.root = Path(manifest["root"])
+        self._toolchain = False  # computed on first use; None when untrackable
+
+    def key(self, script_path: Path, cmd: List[str]) -> Optional[str]:
+        """Cache key of one script invocation, or None when its result must not be cached"""
+        suffixes = CHECK_INPUTS.get(script_path.name)
+        digest = hashlib.sha256()
+        if script_path.name in TOOLCHAIN_CHECKS:
+            if self._toolchain is False:
+                self._toolchain = toolchain_signature(self.root)
+            if self._toolchain is None:
+                return None
+            digest.update(self._toolchain.encode())
+        digest.update(hash_file(script_path).encode())
+        digest.update(json.dumps(cmd[2:]).encode())  # arguments; the interpreter and script path do not matter
+        for path, content_hash in self.files.items():
+            if suffixes is None or Path(path).suffix.lower() in suffixes:
+                digest.update(f"{path}\0{content_hash}\n".encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Stored result for key, or None when missing, unreadable or expired"""
+        try:
+            entry = json.loads((self.dir / f"{key}.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or time.time() - entry.get("created", 0) > CACHE_TTL:
+            return None
+        return entry
+
+    def put(self, key: str, result: dict):
+        """Store the outcome of a completed run; cache errors are ignored"""
+        entry = {
+            "created": time.time(),
+            "passed": result["passed"],
+            "output": result.get("output", ""),
+            "error": result.get("error", ""),
+            "duration": result.get("duration", 0),
+        }
+        try:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            path = self.dir / f"{key}.json"
+            mode = file_mode(path)
+            fd, tmp_path = tempfile.mkstemp(dir=self.dir, prefix=".check-", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
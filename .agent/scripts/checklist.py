@@ -9,6 +9,15 @@ Use this for incremental validation during development.
 Usage:
     python scripts/checklist.py .                    # Run core checks
     python scripts/checklist.py . --url <URL>        # Include performance checks
+    python scripts/checklist.py . --no-cache         # Re-run checks with unchanged inputs too
+    python scripts/checklist.py . --subprocess       # Run every check in its own process
+
+Check results are cached by the content of each check's inputs (see
+check_cache.py); unaffected checks are replayed instead of re-executed.
+
+Pure-Python checks (IN_PROCESS_CHECKS) are imported and their run()
+called in this interpreter; checks that drive external CLIs keep their
+own process.
 
 Priority Order:
     P0: Security Scan (vulnerabilities, secrets)
@@ -20,11 +29,19 @@ Priority Order:
     P6: Performance (lighthouse - requires URL)
 """
 
+import json
 import sys
+import threading
+import traceback
 import subprocess
 import argparse
+import importlib.util
 from pathlib import Path
 from typing import List, Tuple, Optional
+from datetime import datetime
+
+from check_cache import CheckCache, manifest_path
+from file_manifest import build_manifest, share_manifest
 
 # ANSI colors for terminal output
 class Colors:
@@ -69,57 +86,153 @@ PERFORMANCE_CHECKS = [
     ("Playwright E2E", ".agent/skills/webapp-testing/scripts/playwright_runner.py", False),
 ]
 
+# Checks that only read files and expose run(project_path) -> dict with a "passed"
+# key; run in-process, sharing the already loaded file manifest. Lint, tests,
+# lighthouse and playwright drive external CLIs (npm, ruff, pytest, ...) and stay
+# in a subprocess.
+IN_PROCESS_CHECKS = {"Security Scan", "Schema Validation", "UX Audit", "SEO Check"}
+
+CHECK_TIMEOUT = 300  # seconds per check, in-process or not
+
 def check_script_exists(script_path: Path) -> bool:
     """Check if script file exists"""
     return script_path.exists() and script_path.is_file()
 
-def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None) -> dict:
+def prepare_manifest(project_path: Path, cache_dir: Optional[str], share: bool) -> dict:
+    """Walk the project once; with share, scanners read the file list from it instead of walking"""
+    start_time = datetime.now()
+    location = manifest_path(project_path, cache_dir)
+    manifest = build_manifest(project_path, location)
+    duration = (datetime.now() - start_time).total_seconds()
+    if share:
+        share_manifest(location)
+    print(f"Manifest: {len(manifest['files'])} files, {manifest['hashed']} hashed ({duration:.1f}s)"
+          f"{'' if share else ' - not shared with scanners'}")
+    return manifest
+
+def run_in_process(script_path: Path, project_path: str, timeout: float = CHECK_TIMEOUT) -> dict:
+    """
+    Import a check script as a fresh module and call its run(project_path)
+
+    Returns {"report": <run()'s dict>}, or {"error": <traceback>} when the
+    import or run() raised. run() executes on a daemon thread; when it has
+    not finished after timeout seconds, subprocess.TimeoutExpired is raised
+    as subprocess.run would. The thread cannot be killed, so the caller runs
+    the remaining checks in subprocesses.
     """
-    Run a validation script and capture results
+    module_name = f"_check_{script_path.stem}"
+    saved_path = list(sys.path)
+    sys.path.insert(0, str(script_path.parent))
+    try:
+        spec = importlib.util.spec_from_file_location(module_name, script_path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    except Exception:
+        return {"error": traceback.format_exc()}
+    finally:
+        sys.path[:] = saved_path
+        sys.modules.pop(module_name, None)
+
+    outcome = {}
+
+    def call_run():
+        try:
+            outcome["report"] = module.run(project_path)
+        except Exception:
+            outcome["error"] = traceback.format_exc()
+
+    worker = threading.Thread(target=call_run, name=module_name, daemon=True)
+    worker.start()
+    worker.join(timeout)
+    if worker.is_alive():
+        raise subprocess.TimeoutExpired([sys.executable, str(script_path), project_path], timeout)
+    return outcome
+
+def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None,
+               cache: Optional[CheckCache] = None, in_process: bool = False) -> dict:
+    """
+    Run a validation script and capture results, or replay its cached result
+    when the script and the files it reads are unchanged; with in_process the
+    script's run() is called in this interpreter (run_in_process) instead of
+    running it in a subprocess
     
     Returns:
-        dict with keys: name, passed, output, skipped
+        dict with keys: name, passed, output, skipped, duration, mode (and cached, saved on a replay;
+        report for an in-process run; timed_out after a timeout)
     """
     if not check_script_exists(script_path):
         print_warning(f"{name}: Script not found, skipping")
         return {"name": name, "passed": True, "output": "", "skipped": True}
     
-    print_step(f"Running: {name}")
-    
     # Build command
     cmd = ["python", str(script_path), project_path]
-    if url and ("lighthouse" in script_path.name.lower() or "playwright" in script_path.name.lower()):
+    uses_url = url and ("lighthouse" in script_path.name.lower() or "playwright" in script_path.name.lower())
+    if uses_url:
         cmd.append(url)
     
+    # Replay a cached result (checks against a live URL are never cached)
+    key = cache.key(script_path, cmd) if cache and not uses_url else None
+    cached = cache.get(key) if key else None
+    if cached:
+        if cached["passed"]:
+            print_success(f"{name}: PASSED (cached, saved {cached['duration']:.1f}s)")
+        else:
+            print_error(f"{name}: FAILED (cached, saved {cached['duration']:.1f}s)")
+        return {"name": name, "passed": cached["passed"], "output": cached["output"], "error": cached["error"],
+                "skipped": False, "cached": True, "saved": cached["duration"], "duration": 0}
+    
+    mode = "in-process" if in_process else "subprocess"
+    print_step(f"Running: {name}" + (" (in-process)" if in_process else ""))
+    start_time = datetime.now()
+    
     # Run script
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
+        report = None
+        if in_process:
+            outcome = run_in_process(script_path, project_path)
+            report = outcome.get("report")
+            returncode = 0 if isinstance(report, dict) and report.get("passed") else 1
+            stdout = json.dumps(report, indent=2, default=str) if report is not None else ""
+            stderr = outcome.get("error", "")
+        else:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=CHECK_TIMEOUT
+            )
+            returncode, stdout, stderr = result.returncode, result.stdout, result.stderr
         
-        passed = result.returncode == 0
+        duration = (datetime.now() - start_time).total_seconds()
+        passed = returncode == 0
         
         if passed:
             print_success(f"{name}: PASSED")
         else:
             print_error(f"{name}: FAILED")
-            if result.stderr:
-                print(f"  Error: {result.stderr[:200]}")
+            if stderr:
+                print(f"  Error: {stderr[:200]}")
         
-        return {
+        outcome = {
             "name": name,
             "passed": passed,
-            "output": result.stdout,
-            "error": result.stderr,
-            "skipped": False
+            "output": stdout,
+            "error": stderr,
+            "skipped": False,
+            "duration": duration,
+            "mode": mode
         }
+        if report is not None:
+            outcome["report"] = report
+        if key:
+            cache.put(key, outcome)
+        return outcome
     
     except subprocess.TimeoutExpired:
         print_error(f"{name}: TIMEOUT (>5 minutes)")
-        return {"name": name, "passed": False, "output": "", "error": "Timeout", "skipped": False}
+        return {"name": name, "passed": False, "output": "", "error": "Timeout", "skipped": False,
+                "timed_out": True}
     
     except Exception as e:
         print_error(f"{name}: ERROR - {str(e)}")
@@ -137,6 +250,12 @@ def print_summary(results: List[dict]):
     print(f"{Colors.GREEN}✅ Passed: {passed_count}{Colors.ENDC}")
     print(f"{Colors.RED}❌ Failed: {failed_count}{Colors.ENDC}")
     print(f"{Colors.YELLOW}⏭️  Skipped: {skipped_count}{Colors.ENDC}")
+    cached = [r for r in results if r.get("cached")]
+    executed = [r for r in results if not r.get("skipped") and not r.get("cached")]
+    in_process = [r for r in executed if r.get("mode") == "in-process"]
+    print(f"⚡ Cached: {len(cached)} (saved {sum(r['saved'] for r in cached):.1f}s), "
+          f"Executed: {len(executed)} ({sum(r.get('duration', 0) for r in executed):.1f}s, "
+          f"{len(in_process)} in-process)")
     print()
     
     # Detailed results
@@ -148,7 +267,7 @@ def print_summary(results: List[dict]):
         else:
             status = f"{Colors.RED}❌{Colors.ENDC}"
         
-        print(f"{status} {r['name']}")
+        print(f"{status} {r['name']}{' (cached)' if r.get('cached') else ''}")
     
     print()
     
@@ -172,6 +291,10 @@ Examples:
     parser.add_argument("project", help="Project path to validate")
     parser.add_argument("--url", help="URL for performance checks (lighthouse, playwright)")
     parser.add_argument("--skip-performance", action="store_true", help="Skip performance checks even if URL provided")
+    parser.add_argument("--no-cache", action="store_true", help="Run every check, ignoring cached results")
+    parser.add_argument("--cache-dir", help="Check result cache location (default: ~/.cache/antigravity-kit/checks)")
+    parser.add_argument("--no-manifest", action="store_true", help="Let every scanner walk the tree itself")
+    parser.add_argument("--subprocess", action="store_true", help="Run every check in its own Python process")
     
     args = parser.parse_args()
     
@@ -186,13 +309,24 @@ Examples:
     print(f"URL: {args.url if args.url else 'Not provided (performance checks skipped)'}")
     
     results = []
+    # The manifest serves the result cache and the scanners; skip the walk when neither wants it
+    manifest = None
+    if not (args.no_cache and args.no_manifest):
+        manifest = prepare_manifest(project_path, args.cache_dir, not args.no_manifest)
+    cache = None if args.no_cache else CheckCache(manifest, args.cache_dir)
     
     # Run core checks
     print_header("📋 CORE CHECKS")
+    use_subprocess = args.subprocess
     for name, script_path, required in CORE_CHECKS:
         script = project_path / script_path
-        result = run_script(name, script, str(project_path))
+        in_process = name in IN_PROCESS_CHECKS and not use_subprocess
+        result = run_script(name, script, str(project_path), cache=cache, in_process=in_process)
         results.append(result)
+        if in_process and result.get("timed_out"):
+            # Its thread is still running in this interpreter; keep the other checks away from it
+            print_warning("Running the remaining checks in subprocesses")
+            use_subprocess = True
         
         # If required check fails, stop
         if required and not result["passed"] and not result.get("skipped"):
@@ -205,7 +339,7 @@ Examples:
         print_header("⚡ PERFORMANCE CHECKS")
         for name, script_path, required in PERFORMANCE_CHECKS:
             script = project_path / script_path
-            result = run_script(name, script, str(project_path), args.url)
+            result = run_script(name, script, str(project_path), args.url, cache)
             results.append(result)
     
     # Print summary
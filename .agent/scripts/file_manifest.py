@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+File Manifest - Antigravity Kit
+================================
+
+One walk of the project tree, shared by every skill scanner of a run.
+
+checklist.py and verify_all.py build the manifest before the first check and
+pass its location to each scanner in $AGENT_FILE_MANIFEST. A scanner imports
+this module by path (.agent/scripts, next to .agent/skills) and asks
+manifest_files() for the files it reads (by suffix, minus its own skip
+directories) instead of walking the tree; without a manifest it walks as before.
+
+Each entry holds: path (relative, POSIX), size, mtime_ns, sha256, language.
+Hashes of the previous manifest are reused for files whose size and mtime
+are unchanged, so a re-run only reads the files that were edited.
+
+Usage:
+    python scripts/file_manifest.py . --output manifest.json
+    AGENT_FILE_MANIFEST=manifest.json python .agent/skills/<skill>/scripts/<scanner>.py .
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+MANIFEST_ENV = "AGENT_FILE_MANIFEST"
+MANIFEST_VERSION = 1
+
+# Directories no scanner reads; never listed. Everything else (build output, vendor/,
+# virtualenvs) is left to each scanner's own skip_dirs, as some of them scan it
+SKIP_DIRS = {'.git', 'node_modules'}
+
+# Process umask, for giving atomically written files (mkstemp creates them 0600) the usual mode
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+LANGUAGES = {
+    '.py': 'python', '.php': 'php', '.ts': 'typescript', '.tsx': 'typescript', '.js': 'javascript',
+    '.jsx': 'javascript', '.mjs': 'javascript', '.cjs': 'javascript', '.vue': 'vue', '.svelte': 'svelte',
+    '.html': 'html', '.htm': 'html', '.css': 'css', '.scss': 'css', '.json': 'json', '.yaml': 'yaml',
+    '.yml': 'yaml', '.toml': 'toml', '.md': 'markdown', '.sql': 'sql', '.sh': 'shell', '.ps1': 'powershell',
+    '.go': 'go', '.java': 'java', '.rb': 'ruby', '.dart': 'dart', '.prisma': 'prisma', '.po': 'gettext',
+}
+
+# Manifests loaded in this process, by file path
+_LOADED = {}
+
+
+def detect_language(path: str) -> Optional[str]:
+    """Language of a file from its suffix, or None when unknown"""
+    return LANGUAGES.get(os.path.splitext(path)[1].lower())
+
+
+def file_mode(path: Path) -> int:
+    """Permission bits for (re)writing path: its current mode, else what the umask allows"""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_manifest(project_path: Path, output: Path) -> dict:
+    """Walk the project once and write the manifest to output (atomically)"""
+    root = Path(project_path).resolve()
+    output = Path(output)
+
+    previous = {}
+    try:
+        old = json.loads(output.read_text(encoding="utf-8"))
+        if old.get("version") == MANIFEST_VERSION and old.get("root") == str(root):
+            previous = {entry["path"]: entry for entry in old["files"]}
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    files = []
+    hashed = 0
+    for dirpath, dirs, names in os.walk(root):
+        # Directory order, not sorted: scanners that cap their file count then see the files a walk would
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for name in names:
+            path = Path(dirpath) / name
+            rel = path.relative_to(root).as_posix()
+            try:
+                stat = path.stat()
+                old = previous.get(rel)
+                if old and old["size"] == stat.st_size and old["mtime_ns"] == stat.st_mtime_ns:
+                    sha256 = old["sha256"]
+                else:
+                    sha256 = hash_file(path)
+                    hashed += 1
+            except OSError:
+                continue
+            files.append({"path": rel, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                          "sha256": sha256, "language": detect_language(name)})
+
+    manifest = {"version": MANIFEST_VERSION, "root": str(root), "skip_dirs": sorted(SKIP_DIRS),
+                "hashed": hashed, "files": files}
+    output.parent.mkdir(parents=True, exist_ok=True)
+    mode = file_mode(output)
+    fd, tmp_path = tempfile.mkstemp(dir=output.parent, prefix=".manifest-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, output)
+    except OSError:
+        os.unlink(tmp_path)
+        raise
+    _LOADED[str(output)] = manifest
+    return manifest
+
+
+def share_manifest(location: Path):
+    """Hand a manifest to the scanners this process runs from now on"""
+    os.environ[MANIFEST_ENV] = str(location)
+
+
+def load_manifest(project_path) -> Optional[dict]:
+    """The manifest named by $AGENT_FILE_MANIFEST, or None when unset, unreadable or for another project"""
+    location = os.environ.get(MANIFEST_ENV)
+    if not location:
+        return None
+    if location not in _LOADED:
+        try:
+            manifest = json.loads(Path(location).read_text(encoding="utf-8"))
+            _LOADED[location] = manifest if manifest.get("version") == MANIFEST_VERSION else None
+        except (OSError, ValueError, AttributeError):
+            _LOADED[location] = None
+    manifest = _LOADED[location]
+    if manifest is None or manifest.get("root") != str(Path(project_path).resolve()):
+        return None
+    return manifest
+
+
+def manifest_files(project_path, suffixes: Optional[Iterable[str]] = None,
+                   skip_dirs: Iterable[str] = ()) -> Optional[List[Path]]:
+    """
+    Files of the manifest with one of suffixes (any when None), outside skip_dirs
+
+    Returns absolute paths under project_path, or None when no manifest
+    applies; the caller then walks the tree itself.
+    """
+    manifest = load_manifest(project_path)
+    if manifest is None:
+        return None
+    suffixes = {s.lower() for s in suffixes} if suffixes is not None else None
+    skip_dirs = set(skip_dirs)
+    root = Path(project_path)
+    files = []
+    for entry in manifest["files"]:
+        rel = entry["path"]
+        if suffixes is not None and os.path.splitext(rel)[1].lower() not in suffixes:
+            continue
+        if skip_dirs and not skip_dirs.isdisjoint(rel.split("/")[:-1]):
+            continue
+        files.append(root / rel)
+    return files
+
+
+def content_hashes(manifest: dict) -> Dict[str, str]:
+    """Relative path -> sha256 of every manifest entry"""
+    return {entry["path"]: entry["sha256"] for entry in manifest["files"]}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the shared file manifest for the skill scanners")
+    parser.add_argument("project", help="Project path")
+    parser.add_argument("--output", "-o", required=True, help="Manifest file to write")
+    args = parser.parse_args()
+
+    result = build_manifest(Path(args.project), Path(args.output))
+    print(f"{len(result['files'])} files, {result['hashed']} hashed -> {args.output}")
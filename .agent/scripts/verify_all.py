@@ -8,6 +8,15 @@ Use this before deployment or major releases.
 
 Usage:
     python scripts/verify_all.py . --url <URL>
+    python scripts/verify_all.py . --url <URL> --workers 4
+
+Independent checks run concurrently (see DEPENDENCIES). Checks that execute
+project code or load the URL wait for the required gates (Security Scan,
+Lint Check); when a gate fails, its dependents are cancelled.
+
+Results are cached by the content of each check's inputs (see check_cache.py):
+a re-run after an unrelated edit replays the unaffected checks instead of
+executing them. Use --no-cache to run everything, --cache-dir to relocate it.
 
 Includes ALL checks:
     ✅ Security Scan (OWASP, secrets, dependencies)
@@ -22,13 +31,19 @@ Includes ALL checks:
     ✅ Mobile Audit (if applicable)
 """
 
+import os
 import sys
 import subprocess
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 from typing import List, Dict, Optional
 from datetime import datetime
 
+from check_cache import CheckCache, manifest_path
+from file_manifest import build_manifest, share_manifest
+
 # ANSI colors
 class Colors:
     HEADER = '\033[95m'
@@ -40,22 +55,29 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
+# Checks finish on worker threads; one line of output at a time
+_print_lock = threading.Lock()
+
 def print_header(text: str):
     print(f"\n{Colors.BOLD}{Colors.CYAN}{'='*70}{Colors.ENDC}")
     print(f"{Colors.BOLD}{Colors.CYAN}{text.center(70)}{Colors.ENDC}")
     print(f"{Colors.BOLD}{Colors.CYAN}{'='*70}{Colors.ENDC}\n")
 
 def print_step(text: str):
-    print(f"{Colors.BOLD}{Colors.BLUE}🔄 {text}{Colors.ENDC}")
+    with _print_lock:
+        print(f"{Colors.BOLD}{Colors.BLUE}🔄 {text}{Colors.ENDC}")
 
 def print_success(text: str):
-    print(f"{Colors.GREEN}✅ {text}{Colors.ENDC}")
+    with _print_lock:
+        print(f"{Colors.GREEN}✅ {text}{Colors.ENDC}")
 
 def print_warning(text: str):
-    print(f"{Colors.YELLOW}⚠️  {text}{Colors.ENDC}")
+    with _print_lock:
+        print(f"{Colors.YELLOW}⚠️  {text}{Colors.ENDC}")
 
 def print_error(text: str):
-    print(f"{Colors.RED}❌ {text}{Colors.ENDC}")
+    with _print_lock:
+        print(f"{Colors.RED}❌ {text}{Colors.ENDC}")
 
 # Complete verification suite
 VERIFICATION_SUITE = [
@@ -147,20 +169,56 @@ VERIFICATION_SUITE = [
     },
 ]
 
-def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None) -> dict:
-    """Run validation script"""
+# Checks that must wait for others. Everything else only reads the tree and
+# runs as soon as a worker is free. The test suite, performance and E2E checks
+# execute project code or load the deployed app, so they wait for the required
+# gates; E2E also waits for Lighthouse so the two do not load the URL at once.
+DEPENDENCIES = {
+    "Test Suite": ["Security Scan", "Lint Check"],
+    "Lighthouse Audit": ["Security Scan", "Lint Check"],
+    "Bundle Analysis": ["Lint Check"],
+    "Playwright E2E": ["Test Suite", "Lighthouse Audit"],
+}
+
+def prepare_manifest(project_path: Path, cache_dir: Optional[str], share: bool) -> dict:
+    """Walk the project once; with share, scanners read the file list from it instead of walking"""
+    start_time = datetime.now()
+    location = manifest_path(project_path, cache_dir)
+    manifest = build_manifest(project_path, location)
+    duration = (datetime.now() - start_time).total_seconds()
+    if share:
+        share_manifest(location)
+    print(f"Manifest: {len(manifest['files'])} files, {manifest['hashed']} hashed ({duration:.1f}s)"
+          f"{'' if share else ' - not shared with scanners'}")
+    return manifest
+
+def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None,
+               cache: Optional[CheckCache] = None) -> dict:
+    """Run validation script, or replay its cached result when its inputs are unchanged"""
     if not script_path.exists():
         print_warning(f"{name}: Script not found, skipping")
         return {"name": name, "passed": True, "skipped": True, "duration": 0}
     
-    print_step(f"Running: {name}")
-    start_time = datetime.now()
-    
     # Build command
     cmd = ["python", str(script_path), project_path]
-    if url and ("lighthouse" in script_path.name.lower() or "playwright" in script_path.name.lower()):
+    uses_url = url and ("lighthouse" in script_path.name.lower() or "playwright" in script_path.name.lower())
+    if uses_url:
         cmd.append(url)
     
+    # Replay a cached result (checks against a live URL are never cached)
+    key = cache.key(script_path, cmd) if cache and not uses_url else None
+    cached = cache.get(key) if key else None
+    if cached:
+        if cached["passed"]:
+            print_success(f"{name}: PASSED (cached, saved {cached['duration']:.1f}s)")
+        else:
+            print_error(f"{name}: FAILED (cached, saved {cached['duration']:.1f}s)")
+        return {"name": name, "passed": cached["passed"], "output": cached["output"], "error": cached["error"],
+                "skipped": False, "cached": True, "saved": cached["duration"], "duration": 0}
+    
+    print_step(f"Running: {name}")
+    start_time = datetime.now()
+    
     # Run
     try:
         result = subprocess.run(
@@ -178,9 +236,10 @@ def run_script(name: str, script_path: Path, project_path: str, url: Optional[st
         else:
             print_error(f"{name}: FAILED ({duration:.1f}s)")
             if result.stderr:
-                print(f"  {result.stderr[:300]}")
+                with _print_lock:
+                    print(f"  {result.stderr[:300]}")
         
-        return {
+        outcome = {
             "name": name,
             "passed": passed,
             "output": result.stdout,
@@ -188,6 +247,9 @@ def run_script(name: str, script_path: Path, project_path: str, url: Optional[st
             "skipped": False,
             "duration": duration
         }
+        if key:
+            cache.put(key, outcome)
+        return outcome
     
     except subprocess.TimeoutExpired:
         duration = (datetime.now() - start_time).total_seconds()
@@ -199,6 +261,91 @@ def run_script(name: str, script_path: Path, project_path: str, url: Optional[st
         print_error(f"{name}: ERROR - {str(e)}")
         return {"name": name, "passed": False, "skipped": False, "duration": duration, "error": str(e)}
 
+def run_suite(checks: List[dict], project_path: Path, url: Optional[str], workers: int,
+              stop_on_fail: bool = False, cache: Optional[CheckCache] = None) -> List[dict]:
+    """
+    Run checks as a dependency graph on a pool of workers
+
+    A check starts once all of its dependencies (DEPENDENCIES, limited to the
+    checks in this run) have finished. It is cancelled instead when one of them
+    is a required check that failed, or was itself cancelled. With stop_on_fail,
+    a failed required check cancels every check that has not started yet.
+
+    Returns results in suite order, each with start/finish offsets in seconds.
+    """
+    suite_start = datetime.now()
+    names = {check["name"] for check in checks}
+    deps = {check["name"]: [d for d in DEPENDENCIES.get(check["name"], []) if d in names] for check in checks}
+    required = {check["name"]: check["required"] for check in checks}
+    results = {}
+    pending = list(checks)
+    running = {}
+    stopped = None
+
+    def execute(check):
+        start = (datetime.now() - suite_start).total_seconds()
+        result = run_script(check["name"], project_path / check["script"], str(project_path), url, cache)
+        result["start"] = start
+        result["finish"] = (datetime.now() - suite_start).total_seconds()
+        return result
+
+    def cancel(check, reason):
+        print_warning(f"{check['name']}: CANCELLED ({reason})")
+        results[check["name"]] = {"name": check["name"], "category": check["category"], "passed": False,
+                                  "skipped": False, "cancelled": True, "duration": 0, "error": f"Cancelled: {reason}"}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            # Start, in suite order, checks whose dependencies are resolved. Only as
+            # many as there are workers are submitted, so none waits in the pool's
+            # queue where --stop-on-fail could no longer cancel it.
+            for check in list(pending):
+                if stopped:
+                    cancel(check, f"{stopped} failed, --stop-on-fail")
+                    pending.remove(check)
+                    continue
+                if len(running) >= workers or any(d not in results for d in deps[check["name"]]):
+                    continue
+                pending.remove(check)
+                blockers = [d for d in deps[check["name"]]
+                            if results[d].get("cancelled") or (required[d] and not results[d]["passed"])]
+                if blockers:
+                    cancel(check, f"{', '.join(blockers)} did not pass")
+                    continue
+                running[pool.submit(execute, check)] = check
+
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                check = running.pop(future)
+                result = future.result()
+                result["category"] = check["category"]
+                results[check["name"]] = result
+                if stop_on_fail and required[check["name"]] and not result["passed"] and not result.get("skipped"):
+                    print_error(f"CRITICAL: {check['name']} failed. Cancelling remaining checks.")
+                    stopped = stopped or check["name"]
+
+    return [results[check["name"]] for check in checks]
+
+def critical_path(results: List[dict]) -> tuple:
+    """
+    Longest chain of dependent checks by duration: (seconds, [names])
+
+    This is the wall time the suite needs with unlimited workers.
+    """
+    by_name = {r["name"]: r for r in results if not r.get("cancelled")}
+    best = {}
+
+    def longest(name):
+        if name not in best:
+            chains = [longest(d) for d in DEPENDENCIES.get(name, []) if d in by_name]
+            seconds, chain = max(chains, key=lambda c: c[0], default=(0.0, []))
+            best[name] = (seconds + by_name[name].get("duration", 0), chain + [name])
+        return best[name]
+
+    return max((longest(name) for name in by_name), key=lambda c: c[0], default=(0.0, []))
+
 def print_final_report(results: List[dict], start_time: datetime):
     """Print comprehensive final report"""
     total_duration = (datetime.now() - start_time).total_seconds()
@@ -208,14 +355,24 @@ def print_final_report(results: List[dict], start_time: datetime):
     # Statistics
     total = len(results)
     passed = sum(1 for r in results if r["passed"] and not r.get("skipped"))
-    failed = sum(1 for r in results if not r["passed"] and not r.get("skipped"))
+    failed = sum(1 for r in results if not r["passed"] and not r.get("skipped") and not r.get("cancelled"))
+    cancelled = sum(1 for r in results if r.get("cancelled"))
     skipped = sum(1 for r in results if r.get("skipped"))
+    serial = sum(r.get("duration", 0) for r in results)
+    path_seconds, path = critical_path(results)
     
     print(f"Total Duration: {total_duration:.1f}s")
+    print(f"Serial-Equivalent: {serial:.1f}s ({serial / total_duration if total_duration else 1:.1f}x speedup)")
+    print(f"Critical Path: {path_seconds:.1f}s ({' → '.join(path) if path else 'none'})")
     print(f"Total Checks: {total}")
     print(f"{Colors.GREEN}✅ Passed: {passed}{Colors.ENDC}")
     print(f"{Colors.RED}❌ Failed: {failed}{Colors.ENDC}")
+    if cancelled:
+        print(f"{Colors.YELLOW}🚫 Cancelled: {cancelled}{Colors.ENDC}")
     print(f"{Colors.YELLOW}⏭️  Skipped: {skipped}{Colors.ENDC}")
+    cached = [r for r in results if r.get("cached")]
+    executed = sum(1 for r in results if not r.get("skipped") and not r.get("cancelled") and not r.get("cached"))
+    print(f"⚡ Cached: {len(cached)} (saved {sum(r['saved'] for r in cached):.1f}s), Executed: {executed}")
     print()
     
     # Category breakdown
@@ -230,12 +387,21 @@ def print_final_report(results: List[dict], start_time: datetime):
         # Print result
         if r.get("skipped"):
             status = f"{Colors.YELLOW}⏭️ {Colors.ENDC}"
+        elif r.get("cancelled"):
+            status = f"{Colors.YELLOW}🚫{Colors.ENDC}"
         elif r["passed"]:
             status = f"{Colors.GREEN}✅{Colors.ENDC}"
         else:
             status = f"{Colors.RED}❌{Colors.ENDC}"
         
-        duration_str = f"({r.get('duration', 0):.1f}s)" if not r.get("skipped") else ""
+        if r.get("cancelled"):
+            duration_str = f"({r['error']})"
+        elif r.get("skipped"):
+            duration_str = ""
+        elif r.get("cached"):
+            duration_str = f"(cached, saved {r['saved']:.1f}s)"
+        else:
+            duration_str = f"({r.get('duration', 0):.1f}s, started +{r.get('start', 0):.1f}s)"
         print(f"  {status} {r['name']} {duration_str}")
     
     print()
@@ -244,7 +410,7 @@ def print_final_report(results: List[dict], start_time: datetime):
     if failed > 0:
         print(f"{Colors.BOLD}{Colors.RED}❌ FAILED CHECKS:{Colors.ENDC}")
         for r in results:
-            if not r["passed"] and not r.get("skipped"):
+            if not r["passed"] and not r.get("skipped") and not r.get("cancelled"):
                 print(f"\n{Colors.RED}✗ {r['name']}{Colors.ENDC}")
                 if r.get("error"):
                     error_preview = r["error"][:200]
@@ -252,8 +418,8 @@ def print_final_report(results: List[dict], start_time: datetime):
         print()
     
     # Final verdict
-    if failed > 0:
-        print_error(f"VERIFICATION FAILED - {failed} check(s) need attention")
+    if failed > 0 or cancelled > 0:
+        print_error(f"VERIFICATION FAILED - {failed} check(s) need attention, {cancelled} cancelled")
         print(f"\n{Colors.YELLOW}💡 Tip: Fix critical (security, lint) issues first{Colors.ENDC}")
         return False
     else:
@@ -268,12 +434,18 @@ def main():
 Examples:
   python scripts/verify_all.py . --url http://localhost:3000
   python scripts/verify_all.py . --url https://staging.example.com --no-e2e
+  python scripts/verify_all.py . --url http://localhost:3000 --workers 1   # one check at a time
         """
     )
     parser.add_argument("project", help="Project path to validate")
     parser.add_argument("--url", required=True, help="URL for performance & E2E checks")
     parser.add_argument("--no-e2e", action="store_true", help="Skip E2E tests")
-    parser.add_argument("--stop-on-fail", action="store_true", help="Stop on first failure")
+    parser.add_argument("--stop-on-fail", action="store_true", help="Cancel remaining checks when a required check fails")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1),
+                        help="Checks to run at once (default: min(4, CPU count))")
+    parser.add_argument("--no-cache", action="store_true", help="Run every check, ignoring cached results")
+    parser.add_argument("--cache-dir", help="Check result cache location (default: ~/.cache/antigravity-kit/checks)")
+    parser.add_argument("--no-manifest", action="store_true", help="Let every scanner walk the tree itself")
     
     args = parser.parse_args()
     
@@ -288,10 +460,12 @@ Examples:
     print(f"URL: {args.url}")
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
+    print(f"Workers: {max(1, args.workers)}")
+    
     start_time = datetime.now()
-    results = []
+    checks = []
     
-    # Run all verification categories
+    # Collect all verification categories
     for suite in VERIFICATION_SUITE:
         category = suite["category"]
         requires_url = suite.get("requires_url", False)
@@ -304,19 +478,16 @@ Examples:
         if args.no_e2e and category == "E2E Testing":
             continue
         
-        print_header(f"📋 {category.upper()}")
-        
         for name, script_path, required in suite["checks"]:
-            script = project_path / script_path
-            result = run_script(name, script, str(project_path), args.url)
-            result["category"] = category
-            results.append(result)
-            
-            # Stop on critical failure if flag set
-            if args.stop_on_fail and required and not result["passed"] and not result.get("skipped"):
-                print_error(f"CRITICAL: {name} failed. Stopping verification.")
-                print_final_report(results, start_time)
-                sys.exit(1)
+            checks.append({"name": name, "script": script_path, "required": required, "category": category})
+    
+    print_header("📋 RUNNING CHECKS")
+    # The manifest serves the result cache and the scanners; skip the walk when neither wants it
+    manifest = None
+    if not (args.no_cache and args.no_manifest):
+        manifest = prepare_manifest(project_path, args.cache_dir, not args.no_manifest)
+    cache = None if args.no_cache else CheckCache(manifest, args.cache_dir)
+    results = run_suite(checks, project_path, args.url, max(1, args.workers), args.stop_on_fail, cache)
     
     # Print final report
     all_passed = print_final_report(results, start_time)
@@ -19,6 +19,9 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts"))
+from file_manifest import manifest_files
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -30,13 +33,22 @@ def find_schema_files(project_path: Path) -> list:
     """Find database schema files."""
     schemas = []
     
+    listed = manifest_files(project_path, ['.prisma', '.ts'])
+    
     # Prisma schema
-    prisma_files = list(project_path.glob('**/prisma/schema.prisma'))
+    if listed is None:
+        prisma_files = list(project_path.glob('**/prisma/schema.prisma'))
+    else:
+        prisma_files = [f for f in listed if f.name == 'schema.prisma' and f.parent.name == 'prisma']
     schemas.extend([('prisma', f) for f in prisma_files])
     
     # Drizzle schema files
-    drizzle_files = list(project_path.glob('**/drizzle/*.ts'))
-    drizzle_files.extend(project_path.glob('**/schema/*.ts'))
+    if listed is None:
+        drizzle_files = list(project_path.glob('**/drizzle/*.ts'))
+        drizzle_files.extend(project_path.glob('**/schema/*.ts'))
+    else:
+        drizzle_files = [f for f in listed if f.suffix == '.ts' and f.parent.name == 'drizzle']
+        drizzle_files.extend(f for f in listed if f.suffix == '.ts' and f.parent.name == 'schema')
     for f in drizzle_files:
         if 'schema' in f.name.lower() or 'table' in f.name.lower():
             schemas.append(('drizzle', f))
@@ -91,38 +103,26 @@ def validate_prisma_schema(file_path: Path) -> list:
     return issues
 
 
-def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
-    
-    print(f"\n{'='*60}")
-    print(f"[SCHEMA VALIDATOR] Database Schema Validation")
-    print(f"{'='*60}")
-    print(f"Project: {project_path}")
-    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("-"*60)
-    
-    # Find schema files
+def run(project_path) -> dict:
+    """Validation summary (as main() prints it) plus the schemas checked, the structured entry point used by checklist.py"""
+    project_path = Path(project_path).resolve()
     schemas = find_schema_files(project_path)
-    print(f"Found {len(schemas)} schema files")
     
     if not schemas:
-        output = {
+        return {
             "script": "schema_validator",
             "project": str(project_path),
             "schemas_checked": 0,
             "issues_found": 0,
             "passed": True,
-            "message": "No schema files found"
+            "message": "No schema files found",
+            "schemas": []
         }
-        print(json.dumps(output, indent=2))
-        sys.exit(0)
     
     # Validate each schema
     all_issues = []
     
     for schema_type, file_path in schemas:
-        print(f"\nValidating: {file_path.name} ({schema_type})")
-        
         if schema_type == 'prisma':
             issues = validate_prisma_schema(file_path)
         else:
@@ -135,11 +135,48 @@ def main():
                 "issues": issues
             })
     
+    total_issues = sum(len(item["issues"]) for item in all_issues)
+    # Schema issues are warnings, not failures
+    passed = True
+    
+    return {
+        "script": "schema_validator",
+        "project": str(project_path),
+        "schemas_checked": len(schemas),
+        "issues_found": total_issues,
+        "passed": passed,
+        "issues": all_issues,
+        "schemas": [{"file": file_path.name, "type": schema_type} for schema_type, file_path in schemas]
+    }
+
+
+def main():
+    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+    
+    print(f"\n{'='*60}")
+    print(f"[SCHEMA VALIDATOR] Database Schema Validation")
+    print(f"{'='*60}")
+    print(f"Project: {project_path}")
+    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("-"*60)
+    
+    output = run(project_path)
+    schemas = output.pop("schemas")
+    print(f"Found {len(schemas)} schema files")
+    
+    if not schemas:
+        print(json.dumps(output, indent=2))
+        sys.exit(0)
+    
+    for schema in schemas:
+        print(f"\nValidating: {schema['file']} ({schema['type']})")
+    
     # Summary
     print("\n" + "="*60)
     print("SCHEMA ISSUES")
     print("="*60)
     
+    all_issues = output["issues"]
     if all_issues:
         for item in all_issues:
             print(f"\n{item['file']} ({item['type']}):")
@@ -150,19 +187,6 @@ def main():
     else:
         print("No schema issues found!")
     
-    total_issues = sum(len(item["issues"]) for item in all_issues)
-    # Schema issues are warnings, not failures
-    passed = True
-    
-    output = {
-        "script": "schema_validator",
-        "project": str(project_path),
-        "schemas_checked": len(schemas),
-        "issues_found": total_issues,
-        "passed": passed,
-        "issues": all_issues
-    }
-    
     print("\n" + json.dumps(output, indent=2))
     
     sys.exit(0)
@@ -20,6 +20,9 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts"))
+from file_manifest import manifest_files
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -34,6 +37,10 @@ def find_html_files(project_path: Path) -> list:
     
     files = []
     for pattern in patterns:
+        listed = manifest_files(project_path, [pattern[4:]], skip_dirs)
+        if listed is not None:
+            files.extend(listed)
+            continue
         for f in project_path.glob(pattern):
             if not any(skip in f.parts for skip in skip_dirs):
                 files.append(f)
@@ -95,6 +95,9 @@ import re
 import json
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts"))
+from file_manifest import manifest_files
+
 class UXAuditor:
     def __init__(self):
         self.issues = []
@@ -673,11 +676,15 @@ class UXAuditor:
 
     def audit_directory(self, directory: str) -> None:
         extensions = {'.tsx', '.jsx', '.html', '.vue', '.svelte', '.css'}
-        for root, dirs, files in os.walk(directory):
-            dirs[:] = [d for d in dirs if d not in {'node_modules', '.git', 'dist', 'build', '.next'}]
-            for file in files:
-                if Path(file).suffix in extensions:
-                    self.audit_file(os.path.join(root, file))
+        skip_dirs = {'node_modules', '.git', 'dist', 'build', '.next'}
+        files = manifest_files(directory, extensions, skip_dirs)
+        if files is None:
+            files = []
+            for root, dirs, names in os.walk(directory):
+                dirs[:] = [d for d in dirs if d not in skip_dirs]
+                files.extend(Path(root) / name for name in names if Path(name).suffix in extensions)
+        for file in files:
+            self.audit_file(str(file))
 
     def get_report(self):
         return {
@@ -688,17 +695,23 @@ class UXAuditor:
             "compliant": len(self.issues) == 0
         }
 
+def run(path: str) -> dict:
+    """Audit report of a file or directory plus "passed", the structured entry point used by checklist.py"""
+    auditor = UXAuditor()
+    if os.path.isfile(path): auditor.audit_file(path)
+    else: auditor.audit_directory(path)
+    
+    report = auditor.get_report()
+    report['passed'] = report['compliant']
+    return report
+
 def main():
     if len(sys.argv) < 2: sys.exit(1)
     
     path = sys.argv[1]
     is_json = "--json" in sys.argv
     
-    auditor = UXAuditor()
-    if os.path.isfile(path): auditor.audit_file(path)
-    else: auditor.audit_directory(path)
-    
-    report = auditor.get_report()
+    report = run(path)
     
     if is_json:
         print(json.dumps(report))
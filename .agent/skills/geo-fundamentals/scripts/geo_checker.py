@@ -21,6 +21,9 @@ import re
 import json
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts"))
+from file_manifest import manifest_files
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -84,7 +87,8 @@ def find_web_pages(project_path: Path) -> list:
     
     files = []
     for pattern in patterns:
-        for f in project_path.glob(pattern):
+        listed = manifest_files(project_path, [pattern[4:]], SKIP_DIRS)
+        for f in project_path.glob(pattern) if listed is None else listed:
             # Skip excluded directories
             if any(skip in f.parts for skip in SKIP_DIRS):
                 continue
@@ -8,6 +8,9 @@ import re
 import json
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts"))
+from file_manifest import manifest_files
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -62,8 +65,17 @@ def find_locale_files(project_path: Path) -> list:
     ]
     
     files = []
-    for pattern in patterns:
-        files.extend(project_path.glob(pattern))
+    listed = manifest_files(project_path, ['.json', '.po'])
+    if listed is not None:
+        # Same selection as the patterns, from the shared manifest
+        for f in listed:
+            dirs = f.relative_to(project_path).parts[:-1]
+            if f.suffix == '.po' or f.parent.name == 'messages' or \
+                    {'locales', 'translations', 'lang', 'i18n'} & set(dirs):
+                files.append(f)
+    else:
+        for pattern in patterns:
+            files.extend(project_path.glob(pattern))
     
     return [f for f in files if 'node_modules' not in str(f)]
 
@@ -142,7 +154,8 @@ def check_hardcoded_strings(project_path: Path) -> dict:
     
     code_files = []
     for ext in extensions:
-        code_files.extend(project_path.rglob(f"*{ext}"))
+        listed = manifest_files(project_path, [ext])
+        code_files.extend(project_path.rglob(f"*{ext}") if listed is None else listed)
     
     code_files = [f for f in code_files if not any(x in str(f) for x in 
                   ['node_modules', '.git', 'dist', 'build', '__pycache__', 'venv', 'test', 'spec'])]
@@ -8,6 +8,9 @@ import re
 import subprocess
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts"))
+from file_manifest import manifest_files
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -21,7 +24,11 @@ def check_typescript_coverage(project_path: Path) -> dict:
     passed = []
     stats = {'any_count': 0, 'untyped_functions': 0, 'total_functions': 0}
     
-    ts_files = list(project_path.rglob("*.ts")) + list(project_path.rglob("*.tsx"))
+    ts_files = manifest_files(project_path, ['.ts'])
+    if ts_files is None:
+        ts_files = list(project_path.rglob("*.ts")) + list(project_path.rglob("*.tsx"))
+    else:
+        ts_files += manifest_files(project_path, ['.tsx'])
     ts_files = [f for f in ts_files if 'node_modules' not in str(f) and '.d.ts' not in str(f)]
     
     if not ts_files:
@@ -77,7 +84,9 @@ def check_python_coverage(project_path: Path) -> dict:
     passed = []
     stats = {'untyped_functions': 0, 'typed_functions': 0, 'any_count': 0}
     
-    py_files = list(project_path.rglob("*.py"))
+    py_files = manifest_files(project_path, ['.py'])
+    if py_files is None:
+        py_files = list(project_path.rglob("*.py"))
     py_files = [f for f in py_files if not any(x in str(f) for x in ['venv', '__pycache__', '.git', 'node_modules'])]
     
     if not py_files:
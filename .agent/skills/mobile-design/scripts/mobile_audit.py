@@ -71,6 +71,9 @@ import re
 import json
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts"))
+from file_manifest import manifest_files
+
 class MobileAuditor:
     def __init__(self):
         self.issues = []
@@ -612,11 +615,15 @@ class MobileAuditor:
 
     def audit_directory(self, directory: str) -> None:
         extensions = {'.tsx', '.ts', '.jsx', '.js', '.dart'}
-        for root, dirs, files in os.walk(directory):
-            dirs[:] = [d for d in dirs if d not in {'node_modules', '.git', 'dist', 'build', '.next', 'ios', 'android', 'build', '.idea'}]
-            for file in files:
-                if Path(file).suffix in extensions:
-                    self.audit_file(os.path.join(root, file))
+        skip_dirs = {'node_modules', '.git', 'dist', 'build', '.next', 'ios', 'android', 'build', '.idea'}
+        files = manifest_files(directory, extensions, skip_dirs)
+        if files is None:
+            files = []
+            for root, dirs, names in os.walk(directory):
+                dirs[:] = [d for d in dirs if d not in skip_dirs]
+                files.extend(Path(root) / name for name in names if Path(name).suffix in extensions)
+        for file in files:
+            self.audit_file(str(file))
 
     def get_report(self):
         return {
@@ -23,6 +23,9 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts"))
+from file_manifest import manifest_files
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -81,7 +84,8 @@ def find_pages(project_path: Path) -> list:
     
     files = []
     for pattern in patterns:
-        for f in project_path.glob(pattern):
+        listed = manifest_files(project_path, [pattern[4:]], SKIP_DIRS)
+        for f in project_path.glob(pattern) if listed is None else listed:
             # Skip excluded directories
             if any(skip in f.parts for skip in SKIP_DIRS):
                 continue
@@ -145,6 +149,35 @@ def check_page(file_path: Path) -> dict:
     }
 
 
+def run(project_path) -> dict:
+    """SEO summary (as main() prints it) plus the per-file issues, the structured entry point used by checklist.py"""
+    project_path = Path(project_path).resolve()
+    pages = find_pages(project_path)
+    
+    if not pages:
+        return {"script": "seo_checker", "files_checked": 0, "passed": True, "files": []}
+    
+    # Check each page
+    all_issues = []
+    for f in pages:
+        result = check_page(f)
+        if result["issues"]:
+            all_issues.append(result)
+    
+    total_issues = sum(len(item["issues"]) for item in all_issues)
+    passed = total_issues == 0
+    
+    return {
+        "script": "seo_checker",
+        "project": str(project_path),
+        "files_checked": len(pages),
+        "files_with_issues": len(all_issues),
+        "issues_found": total_issues,
+        "passed": passed,
+        "files": all_issues
+    }
+
+
 def main():
     project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
     
@@ -155,24 +188,16 @@ def main():
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("-"*60)
     
-    # Find pages
-    pages = find_pages(project_path)
+    output = run(project_path)
+    all_issues = output.pop("files")
     
-    if not pages:
+    if not output["files_checked"]:
         print("\n[!] No page files found.")
         print("    Looking for: HTML, JSX, TSX in pages/app/routes directories")
-        output = {"script": "seo_checker", "files_checked": 0, "passed": True}
         print("\n" + json.dumps(output, indent=2))
         sys.exit(0)
     
-    print(f"Found {len(pages)} page files to analyze\n")
-    
-    # Check each page
-    all_issues = []
-    for f in pages:
-        result = check_page(f)
-        if result["issues"]:
-            all_issues.append(result)
+    print(f"Found {output['files_checked']} page files to analyze\n")
     
     # Summary
     print("=" * 60)
@@ -198,21 +223,9 @@ def main():
     else:
         print("\n[OK] No SEO issues found!")
     
-    total_issues = sum(len(item["issues"]) for item in all_issues)
-    passed = total_issues == 0
-    
-    output = {
-        "script": "seo_checker",
-        "project": str(project_path),
-        "files_checked": len(pages),
-        "files_with_issues": len(all_issues),
-        "issues_found": total_issues,
-        "passed": passed
-    }
-    
     print("\n" + json.dumps(output, indent=2))
     
-    sys.exit(0 if passed else 1)
+    sys.exit(0 if output["passed"] else 1)
 
 
 if __name__ == "__main__":
@@ -21,6 +21,10 @@ import argparse
 from pathlib import Path
 from typing import Dict, List, Any
 from datetime import datetime
+from functools import lru_cache
+
+sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts"))
+from file_manifest import manifest_files
 
 # Fix Windows console encoding for Unicode output
 try:
@@ -94,6 +98,17 @@ CONFIG_EXTENSIONS = {'.json', '.yaml', '.yml', '.toml', '.env', '.env.local', '.
 #  SCANNING FUNCTIONS
 # ============================================================================
 
+@lru_cache(maxsize=None)
+def project_files(project_path: str) -> tuple:
+    """Every file outside SKIP_DIRS: from the shared manifest, else one walk shared by all scans"""
+    files = manifest_files(project_path, skip_dirs=SKIP_DIRS)
+    if files is None:
+        files = []
+        for root, dirs, names in os.walk(project_path):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            files.extend(Path(root) / name for name in names)
+    return tuple(files)
+
 def scan_dependencies(project_path: str) -> Dict[str, Any]:
     """
     Validate supply chain security (OWASP A03).
@@ -191,34 +206,30 @@ def scan_secrets(project_path: str) -> Dict[str, Any]:
         "by_severity": {"critical": 0, "high": 0, "medium": 0}
     }
     
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+    for filepath in project_files(project_path):
+        ext = filepath.suffix.lower()
+        if ext not in CODE_EXTENSIONS and ext not in CONFIG_EXTENSIONS:
+            continue
+            
+        results["scanned_files"] += 1
         
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS and ext not in CONFIG_EXTENSIONS:
-                continue
+        try:
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
                 
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, secret_type, severity in SECRET_PATTERNS:
-                        matches = re.findall(pattern, content, re.IGNORECASE)
-                        if matches:
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "type": secret_type,
-                                "severity": severity,
-                                "count": len(matches)
-                            })
-                            results["by_severity"][severity] += len(matches)
-                            
-            except Exception:
-                pass
+                for pattern, secret_type, severity in SECRET_PATTERNS:
+                    matches = re.findall(pattern, content, re.IGNORECASE)
+                    if matches:
+                        results["findings"].append({
+                            "file": str(filepath.relative_to(project_path)),
+                            "type": secret_type,
+                            "severity": severity,
+                            "count": len(matches)
+                        })
+                        results["by_severity"][severity] += len(matches)
+                        
+        except Exception:
+            pass
     
     if results["by_severity"]["critical"] > 0:
         results["status"] = "[!!] CRITICAL: Secrets exposed!"
@@ -246,36 +257,32 @@ def scan_code_patterns(project_path: str) -> Dict[str, Any]:
         "by_category": {}
     }
     
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+    for filepath in project_files(project_path):
+        ext = filepath.suffix.lower()
+        if ext not in CODE_EXTENSIONS:
+            continue
+            
+        results["scanned_files"] += 1
         
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS:
-                continue
+        try:
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                lines = f.readlines()
                 
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    
-                    for line_num, line in enumerate(lines, 1):
-                        for pattern, name, severity, category in DANGEROUS_PATTERNS:
-                            if re.search(pattern, line, re.IGNORECASE):
-                                results["findings"].append({
-                                    "file": str(filepath.relative_to(project_path)),
-                                    "line": line_num,
-                                    "pattern": name,
-                                    "severity": severity,
-                                    "category": category,
-                                    "snippet": line.strip()[:80]
-                                })
-                                results["by_category"][category] = results["by_category"].get(category, 0) + 1
-                                
-            except Exception:
-                pass
+                for line_num, line in enumerate(lines, 1):
+                    for pattern, name, severity, category in DANGEROUS_PATTERNS:
+                        if re.search(pattern, line, re.IGNORECASE):
+                            results["findings"].append({
+                                "file": str(filepath.relative_to(project_path)),
+                                "line": line_num,
+                                "pattern": name,
+                                "severity": severity,
+                                "category": category,
+                                "snippet": line.strip()[:80]
+                            })
+                            results["by_category"][category] = results["by_category"].get(category, 0) + 1
+                            
+        except Exception:
+            pass
     
     critical_count = sum(1 for f in results["findings"] if f["severity"] == "critical")
     high_count = sum(1 for f in results["findings"] if f["severity"] == "high")
@@ -315,30 +322,26 @@ def scan_configuration(project_path: str) -> Dict[str, Any]:
         (r'allowCredentials.*true.*origin.*\*', "Dangerous CORS combo", "critical"),
     ]
     
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+    for filepath in project_files(project_path):
+        ext = filepath.suffix.lower()
+        if ext not in CONFIG_EXTENSIONS and filepath.name not in ['next.config.js', 'webpack.config.js', '.eslintrc.js']:
+            continue
+            
         
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CONFIG_EXTENSIONS and file not in ['next.config.js', 'webpack.config.js', '.eslintrc.js']:
-                continue
+        try:
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
                 
-            filepath = Path(root) / file
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, issue, severity in config_issues:
-                        if re.search(pattern, content, re.IGNORECASE):
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "issue": issue,
-                                "severity": severity
-                            })
-                            
-            except Exception:
-                pass
+                for pattern, issue, severity in config_issues:
+                    if re.search(pattern, content, re.IGNORECASE):
+                        results["findings"].append({
+                            "file": str(filepath.relative_to(project_path)),
+                            "issue": issue,
+                            "severity": severity
+                        })
+                        
+        except Exception:
+            pass
     
     # Check for security header configurations
     header_files = ["next.config.js", "next.config.mjs", "middleware.ts", "nginx.conf"]
@@ -418,6 +421,19 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
     return report
 
 
+def run(project_path: str) -> Dict[str, Any]:
+    """Full scan report plus "passed", the structured entry point used by checklist.py
+
+    Findings are reported, not enforced: like main(), the check only fails
+    when the project directory does not exist.
+    """
+    if not os.path.isdir(project_path):
+        return {"passed": False, "error": f"Directory not found: {project_path}"}
+    report = run_full_scan(project_path)
+    report["passed"] = True
+    return report
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Validate security principles from vulnerability-scanner skill"